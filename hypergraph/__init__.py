@@ -1,8 +1,12 @@
 __import__('pkg_resources').declare_namespace(__name__)
 
+import attribute
 import connectivity
 import core
+import frozen
 import matrix
 import orientation
+import overlay
 import path
 import search
+import view
@@ -0,0 +1,449 @@
+"""\
+Hypergraph - columnar attribute storage.
+
+@author: Aaron Mavrinac
+@organization: University of Windsor
+@contact: mavrin1@uwindsor.ca
+@license: LGPL-3
+"""
+
+from itertools import imap, izip
+
+import numpy
+
+from .overlay import fork, settle
+
+_FREE = object()
+
+
+class AttributeTable(object):
+    """\
+    Table of named numeric attributes of a set of keys (edges or vertices).
+    Each key is assigned an integer identifier which is stable for as long as
+    the key is in the table (identifiers of removed keys are reused), and each
+    attribute is stored as a NumPy array indexed by identifier, so that an
+    attribute of every key can be read as one contiguous array.
+
+    A table forked with L{fork} shares its keys, identifiers and columns with
+    the original, recording its own changes as overlays and per-column deltas
+    until they grow large enough to be worth copying the columns for.
+    """
+    def __init__(self):
+        """\
+        Constructor.
+        """
+        self._ids = {}
+        self._keys = []
+        self._free = []
+        self._columns = {}
+        self._defaults = {}
+        self._deltas = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def __iter__(self):
+        if not self._free:
+            return iter(self._keys)
+        return (key for key in self._keys if key is not _FREE)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_keys'] = [None if key is _FREE else key for key in self._keys]
+        if self._deltas is not None:
+            state['_columns'] = self._copy_columns()
+            state['_deltas'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_deltas', None)
+        for i in self._free:
+            self._keys[i] = _FREE
+
+    def copy(self):
+        """\
+        Return a copy of this table.
+
+        @rtype: L{AttributeTable}
+        """
+        table = object.__new__(type(self))
+        table._ids = dict(self._ids)
+        table._keys = list(self._keys)
+        table._free = list(self._free)
+        table._columns = self._copy_columns()
+        table._defaults = dict(self._defaults)
+        table._deltas = None
+        return table
+
+    def fork(self):
+        """\
+        Return a copy of this table which shares its keys, identifiers and
+        columns with this table, in time independent of the number of keys.
+        This table must not be changed afterward (fork it again instead).
+
+        @rtype: L{AttributeTable}
+        """
+        table = object.__new__(type(self))
+        table._ids = fork(self._ids)
+        table._keys = fork(self._keys)
+        table._free = list(self._free)
+        table._columns = dict(self._columns)
+        table._defaults = dict(self._defaults)
+        table._deltas = dict((name, dict(self._deltas[name]) \
+            if self._deltas is not None else {}) for name in self._columns)
+        return table
+
+    def _copy_columns(self):
+        """\
+        Return private copies of the columns of this table, with any changes
+        recorded in deltas applied.
+
+        @rtype: C{dict}
+        """
+        columns = {}
+        for name, column in self._columns.iteritems():
+            columns[name] = column.copy()
+            if self._deltas is not None:
+                for i, value in self._deltas[name].iteritems():
+                    columns[name][i] = value
+        return columns
+
+    def _write(self, name, i, value):
+        """\
+        Set the value of an attribute at an identifier, in the column or, if
+        the column is shared, in its delta. A delta which grows to a quarter of
+        the column is merged into a private copy of the columns.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param i: The identifier.
+        @type i: C{int}
+        @param value: The value.
+        @type value: C{float} or C{int}
+        """
+        if self._deltas is None:
+            self._columns[name][i] = value
+            return
+        delta = self._deltas[name]
+        delta[i] = self._columns[name].dtype.type(value)
+        if len(delta) * 4 >= len(self._columns[name]):
+            self._own_columns()
+
+    def _own_columns(self):
+        """\
+        Replace shared columns with private copies, merging their deltas.
+        """
+        if self._deltas is not None:
+            self._columns = self._copy_columns()
+            self._deltas = None
+
+    @property
+    def columns(self):
+        """\
+        Names of the attributes in this table.
+
+        @rtype: C{list} of C{str}
+        """
+        return self._columns.keys()
+
+    @property
+    def size(self):
+        """\
+        Number of identifiers in use or free (the length of each column).
+
+        @rtype: C{int}
+        """
+        return len(self._keys)
+
+    def add_column(self, name, dtype=float, default=0.0):
+        """\
+        Add a numeric attribute to this table, with the default value for every
+        key.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param dtype: The NumPy data type of the attribute.
+        @type dtype: C{type}
+        @param default: The value of the attribute for new keys.
+        @type default: C{float}
+        @raise ValueError: Attribute exists or type is not numeric.
+        """
+        dtype = numpy.dtype(dtype)
+        try:
+            assert name not in self._columns
+        except AssertionError:
+            raise ValueError('attribute %s already exists' % name)
+        try:
+            assert dtype.kind in 'biuf'
+        except AssertionError:
+            raise ValueError('attribute %s must be numeric' % name)
+        capacity = len(self._columns.itervalues().next()) \
+            if self._columns else max(len(self._keys), 16)
+        self._columns[name] = numpy.empty(capacity, dtype=dtype)
+        self._columns[name][:len(self._keys)] = default
+        self._defaults[name] = dtype.type(default)
+        if self._deltas is not None:
+            self._deltas[name] = {}
+
+    def remove_column(self, name):
+        """\
+        Remove an attribute from this table.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @raise KeyError: No such attribute.
+        """
+        del self._columns[name]
+        del self._defaults[name]
+        if self._deltas is not None:
+            del self._deltas[name]
+
+    def add(self, key):
+        """\
+        Add a key to this table with default attribute values, if it is not
+        already present.
+
+        @param key: The key.
+        @type key: C{object}
+        @return: The identifier of the key.
+        @rtype: C{int}
+        """
+        i = self._ids.get(key)
+        if i is not None:
+            return i
+        if self._free:
+            i = self._free.pop()
+            self._keys[i] = key
+        else:
+            i = len(self._keys)
+            self._keys.append(key)
+            if self._columns and i == len(self._columns.itervalues().next()):
+                self._grow(2 * i)
+        self._ids[key] = i
+        if self._deltas is None:
+            for name, column in self._columns.iteritems():
+                column[i] = self._defaults[name]
+        else:
+            for name in self._columns:
+                self._write(name, i, self._defaults[name])
+        if type(self._ids) is not dict:
+            self._settle()
+        return i
+
+    def update(self, keys):
+        """\
+        Add several keys to this table.
+
+        @param keys: The keys.
+        @type keys: C{object}
+        """
+        for key in keys:
+            if key not in self._ids:
+                self.add(key)
+
+    def extend(self, keys, **values):
+        """\
+        Add several keys, none of which is already present, to this table at
+        once. Attributes take the values given as arrays in the order of the
+        keys, and their default values otherwise.
+
+        @param keys: The keys.
+        @type keys: C{list}
+        @param values: Attribute values of the keys, by attribute name.
+        @type values: C{numpy.ndarray}
+        @return: The identifiers of the keys.
+        @rtype: C{numpy.ndarray}
+        @raise KeyError: No such attribute.
+        """
+        for name in values:
+            if name not in self._columns:
+                raise KeyError(name)
+        if type(self._ids) is not dict and len(keys) * 4 >= len(self._keys):
+            self._ids = settle(self._ids, force=True)
+            self._keys = list(self._keys)
+        reused = min(len(self._free), len(keys))
+        start = len(self._keys)
+        ids = numpy.empty(len(keys), dtype=numpy.intp)
+        if reused:
+            ids[:reused] = self._free[:-reused - 1:-1]
+            del self._free[-reused:]
+            for i, key in zip(ids[:reused].tolist(), keys):
+                self._keys[i] = key
+        ids[reused:] = numpy.arange(start, start + len(keys) - reused)
+        self._keys.extend(keys[reused:])
+        self._ids.update(izip(keys, ids.tolist()))
+        if type(self._ids) is not dict:
+            self._settle()
+        if self._columns:
+            capacity = len(self._columns.itervalues().next())
+            if len(self._keys) > capacity:
+                self._grow(max(2 * capacity, len(self._keys)))
+            elif len(keys) * 4 >= capacity:
+                self._own_columns()
+        for name, column in self._columns.iteritems():
+            value = values[name] if name in values else self._defaults[name]
+            if self._deltas is None:
+                column[ids] = value
+                continue
+            value = numpy.broadcast_to(numpy.asarray(value, column.dtype),
+                ids.shape)
+            for i, item in izip(ids.tolist(), value):
+                self._write(name, i, item)
+        return ids
+
+    def discard(self, key):
+        """\
+        Remove a key from this table, if present, freeing its identifier.
+
+        @param key: The key.
+        @type key: C{object}
+        """
+        try:
+            i = self._ids.pop(key)
+        except KeyError:
+            return
+        self._keys[i] = _FREE
+        self._free.append(i)
+        if type(self._ids) is not dict:
+            self._settle()
+
+    def _settle(self):
+        """\
+        Replace the identifier and key overlays of a forked table with plain
+        copies once their changes have grown large.
+        """
+        ids = settle(self._ids)
+        if ids is not self._ids:
+            self._ids = ids
+            self._keys = list(self._keys)
+
+    def _grow(self, capacity):
+        """\
+        Enlarge every column to a new capacity.
+
+        @param capacity: The new capacity.
+        @type capacity: C{int}
+        """
+        for name, column in self._columns.items():
+            grown = numpy.empty(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            if self._deltas is not None:
+                for i, value in self._deltas[name].iteritems():
+                    grown[i] = value
+            self._columns[name] = grown
+        self._deltas = None
+
+    def id(self, key):
+        """\
+        Return the identifier of a key.
+
+        @param key: The key.
+        @type key: C{object}
+        @rtype: C{int}
+        @raise KeyError: Key is not in this table.
+        """
+        return self._ids[key]
+
+    def ids(self, keys):
+        """\
+        Return the identifiers of several keys.
+
+        @param keys: The keys.
+        @type keys: C{object}
+        @rtype: C{numpy.ndarray}
+        @raise KeyError: One or more keys are not in this table.
+        """
+        return numpy.fromiter(imap(self._ids.__getitem__, keys), numpy.intp)
+
+    def key(self, i):
+        """\
+        Return the key with an identifier.
+
+        @param i: The identifier.
+        @type i: C{int}
+        @rtype: C{object}
+        @raise KeyError: Identifier is not in use.
+        """
+        key = self._keys[i] if 0 <= i < len(self._keys) else _FREE
+        if key is _FREE:
+            raise KeyError(i)
+        return key
+
+    def get(self, name, key):
+        """\
+        Return the value of an attribute of a key.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param key: The key.
+        @type key: C{object}
+        @rtype: C{float} or C{int}
+        @raise KeyError: No such attribute or key.
+        """
+        i = self._ids[key]
+        if self._deltas is not None:
+            value = self._deltas[name].get(i)
+            if value is not None:
+                return value.item()
+        return self._columns[name][i].item()
+
+    def set(self, name, key, value):
+        """\
+        Set the value of an attribute of a key.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param key: The key.
+        @type key: C{object}
+        @param value: The value.
+        @type value: C{float} or C{int}
+        @raise KeyError: No such attribute or key.
+        """
+        self._write(name, self._ids[key], value)
+
+    def column(self, name):
+        """\
+        Return the values of an attribute of every key as a read-only array
+        indexed by identifier. Entries at free identifiers hold no meaningful
+        value. The array reflects later changes to the attribute values until
+        the table next grows or is forked. Reading a column of a forked table
+        first copies its shared columns.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @rtype: C{numpy.ndarray}
+        @raise KeyError: No such attribute.
+        """
+        self._own_columns()
+        column = self._columns[name][:len(self._keys)]
+        column.flags.writeable = False
+        return column
+
+    def values(self, name, keys=None):
+        """\
+        Return the values of an attribute of several keys (by default, every
+        key in iteration order, which is identifier order) as an array.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param keys: The keys (optional).
+        @type keys: C{object}
+        @rtype: C{numpy.ndarray}
+        @raise KeyError: No such attribute or key.
+        """
+        if keys is not None:
+            ids = self.ids(keys)
+            values = self._columns[name][ids]
+            if self._deltas:
+                delta = self._deltas[name]
+                for j, i in enumerate(ids.tolist()):
+                    if i in delta:
+                        values[j] = delta[i]
+            return values
+        live = numpy.ones(len(self._keys), dtype=bool)
+        live[self._free] = False
+        return self.column(name)[live]
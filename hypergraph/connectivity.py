@@ -8,27 +8,457 @@ Hypergraph - connectivity properties.
 """
 
 from itertools import combinations
+from random import Random
 
+import numpy
+
+from .frozen import FrozenHypergraph
 from .matrix import laplacian_matrix, laplacian_eigenvalues
 
 
-def connected(H):
+class DisjointSet(object):
+    """\
+    Disjoint-set forest (union-find) over hashable elements, with union by
+    rank and path compression.
+
+        - R. E. Tarjan, "Efficiency of a Good But Not Linear Set Union
+          Algorithm," J. of the ACM, vol. 22, no. 2, pp. 215-225, 1975.
+    """
+    def __init__(self, elements=None):
+        """\
+        Constructor.
+
+        @param elements: The initial singleton elements (optional).
+        @type elements: C{object}
+        """
+        self._parent = {}
+        self._rank = {}
+        self._count = 0
+        for element in elements or []:
+            self.add(element)
+
+    def __contains__(self, element):
+        return element in self._parent
+
+    def __len__(self):
+        """\
+        Return the number of disjoint sets.
+
+        @rtype: C{int}
+        """
+        return self._count
+
+    def add(self, element):
+        """\
+        Add an element as a singleton set, if it is not already present.
+
+        @param element: The element.
+        @type element: C{object}
+        """
+        if element not in self._parent:
+            self._parent[element] = element
+            self._rank[element] = 0
+            self._count += 1
+
+    def find(self, element):
+        """\
+        Return the representative element of the set containing an element.
+
+        @param element: The element.
+        @type element: C{object}
+        @return: The representative element.
+        @rtype: C{object}
+        @raise KeyError: Element is not present.
+        """
+        parent = self._parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+        while parent[element] != root:
+            parent[element], element = root, parent[element]
+        return root
+
+    def union(self, u, v):
+        """\
+        Merge the sets containing two elements.
+
+        @param u: The first element.
+        @type u: C{object}
+        @param v: The second element.
+        @type v: C{object}
+        @return: True if the elements were in different sets.
+        @rtype: C{bool}
+        @raise KeyError: An element is not present.
+        """
+        u, v = self.find(u), self.find(v)
+        if u == v:
+            return False
+        if self._rank[u] < self._rank[v]:
+            u, v = v, u
+        self._parent[v] = u
+        if self._rank[u] == self._rank[v]:
+            self._rank[u] += 1
+        self._count -= 1
+        return True
+
+
+class ReachabilityIndex(object):
+    """\
+    Reachability index for a hypergraph, answering whether one vertex can
+    reach another (over edges from tail to head, in a directed hypergraph). The
+    strongly connected components are condensed into a directed acyclic graph.
+    For small condensations, the transitive closure is stored as one bitset per
+    component; otherwise, each component is labelled with nested intervals
+    from randomized depth-first traversals, which answer most negative queries
+    at once and prune the search for the rest.
+
+        - R. Tarjan, "Depth-First Search and Linear Graph Algorithms," SIAM J.
+          on Computing, vol. 1, no. 2, pp. 146-160, 1972.
+
+        - H. Yildirim, V. Chaoji, and M. J. Zaki, "GRAIL: Scalable
+          Reachability Index for Large Graphs," Proc. VLDB Endowment, vol. 3,
+          no. 1, pp. 276-284, 2010.
+
+    The index is built on first use, and rebuilt when the version of the
+    hypergraph changes.
+    """
+    def __init__(self, H, method=None, labels=2, threshold=16384, seed=None):
+        """\
+        Constructor.
+
+        @param H: The hypergraph.
+        @type H: L{Hypergraph}
+        @param method: One of 'closure' or 'intervals' (optional, by size of
+                       the condensation by default).
+        @type method: C{str}
+        @param labels: The number of interval labels.
+        @type labels: C{int}
+        @param threshold: The greatest number of components for which the
+                          closure is stored by default.
+        @type threshold: C{int}
+        @param seed: The seed for the traversal orders (optional).
+        @type seed: C{object}
+        @raise ValueError: Unknown method.
+        """
+        try:
+            assert method in (None, 'closure', 'intervals')
+        except AssertionError:
+            raise ValueError('unknown reachability index method %s' % method)
+        self._hypergraph = H
+        self._method = method
+        self._labels = labels
+        self._threshold = threshold
+        self._random = Random(seed)
+        self._version = None
+        self._frozen = None
+
+    def _update(self):
+        """\
+        Build the index if the hypergraph has changed since it was built.
+        """
+        version = getattr(self._hypergraph, 'version', None)
+        if self._frozen is not None and version == self._version:
+            return
+        F = self._hypergraph.freeze()
+        n = len(F.vertex_offsets) - 1
+        if F.directed:
+            tails = F.edge_members
+            heads = F.heads[F.entry_edges]
+            tails, heads = tails[tails != heads], heads[tails != heads]
+            order = numpy.argsort(tails, kind='mergesort')
+            offsets = numpy.zeros(n + 1, dtype=numpy.intp)
+            numpy.cumsum(numpy.bincount(tails, minlength=n),
+                out=offsets[1:])
+            component = _strong_components(offsets.tolist(),
+                heads[order].tolist())
+        else:
+            S = DisjointSet(range(n))
+            for e in range(len(F.heads)):
+                members = F.members(e).tolist()
+                for v in members[1:]:
+                    S.union(members[0], v)
+            roots = {}
+            component = [roots.setdefault(S.find(v), len(roots)) \
+                for v in range(n)]
+            tails = heads = F.edge_members[:0]
+        component = numpy.array(component, dtype=numpy.intp)
+        k = int(component.max()) + 1 if n else 0
+        arcs = numpy.unique(component[tails] * k + component[heads])
+        arcs = arcs[arcs // k != arcs % k] if k else arcs
+        self._successors = [[] for c in range(k)]
+        for arc in arcs.tolist():
+            self._successors[arc // k].append(arc % k)
+        self._component = component
+        order = numpy.argsort(component, kind='mergesort')
+        self._members = [F.vertex(i) for i in order.tolist()]
+        self._member_offsets = numpy.zeros(k + 1, dtype=numpy.intp)
+        numpy.cumsum(numpy.bincount(component, minlength=k),
+            out=self._member_offsets[1:])
+        method = self._method
+        if method is None:
+            method = 'closure' if k <= self._threshold else 'intervals'
+        self._closure = None
+        self._intervals = None
+        if method == 'closure':
+            self._build_closure(k)
+        else:
+            self._build_intervals(k)
+        self._frozen = F
+        self._version = version
+
+    def _build_closure(self, k):
+        """\
+        Build the transitive closure of the condensation, one packed bitset
+        row per component. Components are numbered so that every successor
+        precedes its predecessors.
+
+        @param k: The number of components.
+        @type k: C{int}
+        """
+        closure = numpy.zeros((k, (k + 7) // 8), dtype=numpy.uint8)
+        for c in range(k):
+            closure[c, c // 8] = 0x80 >> (c % 8)
+            for d in self._successors[c]:
+                closure[c] |= closure[d]
+        self._closure = closure
+
+    def _build_intervals(self, k):
+        """\
+        Build the interval labels of the condensation. Each label is the
+        post-order rank of a component in a randomized depth-first traversal
+        and the least rank among its descendants.
+
+        @param k: The number of components.
+        @type k: C{int}
+        """
+        low = numpy.empty((self._labels, k), dtype=numpy.intp)
+        post = numpy.empty((self._labels, k), dtype=numpy.intp)
+        for t in range(self._labels):
+            roots = range(k)
+            self._random.shuffle(roots)
+            rank = 0
+            visited = [False] * k
+            for root in roots:
+                if visited[root]:
+                    continue
+                visited[root] = True
+                stack = [(root, self._shuffled(root))]
+                while stack:
+                    c, successors = stack[-1]
+                    for d in successors:
+                        if not visited[d]:
+                            visited[d] = True
+                            stack.append((d, self._shuffled(d)))
+                            break
+                    else:
+                        stack.pop()
+                        post[t, c] = rank
+                        low[t, c] = min([rank] + [low[t, d] \
+                            for d in self._successors[c]])
+                        rank += 1
+        self._intervals = (low.T.copy(), post.T.copy())
+
+    def _shuffled(self, c):
+        """\
+        Return an iterator over the successors of a component in random order.
+
+        @param c: The component.
+        @type c: C{int}
+        @rtype: C{iterator}
+        """
+        successors = list(self._successors[c])
+        self._random.shuffle(successors)
+        return iter(successors)
+
+    def _contains(self, c, d):
+        """\
+        Return whether every interval label of a component contains that of
+        another, as it must if the other is reachable from it.
+
+        @param c: The first component.
+        @type c: C{int}
+        @param d: The second component.
+        @type d: C{int}
+        @rtype: C{bool}
+        """
+        low, post = self._intervals
+        return bool(numpy.all(low[c] <= low[d]) \
+            and numpy.all(post[d] <= post[c]))
+
+    def _component_of(self, vertex):
+        """\
+        Return the component of a vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @rtype: C{int}
+        @raise KeyError: Vertex is not in the hypergraph.
+        """
+        return self._component[self._frozen.vertex_id(vertex)]
+
+    def reachable(self, u, v):
+        """\
+        Return whether one vertex can reach another.
+
+        @param u: The first vertex.
+        @type u: C{object}
+        @param v: The second vertex.
+        @type v: C{object}
+        @rtype: C{bool}
+        @raise KeyError: A vertex is not in the hypergraph.
+        """
+        self._update()
+        c, d = self._component_of(u), self._component_of(v)
+        if c == d:
+            return True
+        if self._closure is not None:
+            return bool(self._closure[c, d // 8] & (0x80 >> (d % 8)))
+        if not self._contains(c, d):
+            return False
+        visited = set([c])
+        stack = [c]
+        while stack:
+            for e in self._successors[stack.pop()]:
+                if e == d:
+                    return True
+                if e not in visited and self._contains(e, d):
+                    visited.add(e)
+                    stack.append(e)
+        return False
+
+    def reachable_from(self, u):
+        """\
+        Return the set of vertices which a vertex can reach (including itself).
+
+        @param u: The vertex.
+        @type u: C{object}
+        @rtype: C{set}
+        @raise KeyError: Vertex is not in the hypergraph.
+        """
+        self._update()
+        c = self._component_of(u)
+        if self._closure is not None:
+            k = len(self._successors)
+            components = numpy.flatnonzero(
+                numpy.unpackbits(self._closure[c])[:k]).tolist()
+        else:
+            components = [c]
+            visited = set(components)
+            for d in components:
+                for e in self._successors[d]:
+                    if e not in visited:
+                        visited.add(e)
+                        components.append(e)
+        offsets = self._member_offsets
+        return set([vertex for d in components \
+            for vertex in self._members[offsets[d]:offsets[d + 1]]])
+
+
+def _strong_components(offsets, heads):
     """\
-    Return whether an undirected hypergraph is connected using the eigenvalues
-    of its Laplacian matrix.
+    Tarjan's algorithm for the strongly connected components of a directed
+    graph given in compressed sparse row form, using an explicit stack.
+    Components are numbered in the order they are completed, so every
+    component reachable from another has a lower number.
+
+    @param offsets: Offsets into the head list, one per vertex plus a final
+                    sentinel.
+    @type offsets: C{list} of C{int}
+    @param heads: The head vertex identifier of each arc.
+    @type heads: C{list} of C{int}
+    @return: The component of each vertex.
+    @rtype: C{list} of C{int}
+    """
+    n = len(offsets) - 1
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    k = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [[root, offsets[root]]]
+        while work:
+            frame = work[-1]
+            v, i = frame
+            if i < offsets[v + 1]:
+                frame[1] += 1
+                w = heads[i]
+                if index[w] < 0:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append([w, offsets[w]])
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+                low[work[-1][0]] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = k
+                    if w == v:
+                        break
+                k += 1
+    return component
+
+
+def connected_components(H):
+    """\
+    Return the connected components of a hypergraph (weakly connected, in a
+    directed hypergraph), merging the vertices of each edge in a disjoint-set
+    forest.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @return: The vertex set of each component.
+    @rtype: C{list} of C{set}
+    """
+    S = DisjointSet(H.vertices)
+    for edge in H.edges:
+        if len(S) == 1:
+            break
+        vertices = iter(edge)
+        first = vertices.next()
+        for v in vertices:
+            S.union(first, v)
+    components = {}
+    for v in H.vertices:
+        components.setdefault(S.find(v), set()).add(v)
+    return components.values()
+
+
+def connected(H, spectral=False):
+    """\
+    Return whether an undirected hypergraph is connected, from its connected
+    components or, optionally, using the eigenvalues of its Laplacian matrix.
 
     @param H: The input undirected hypergraph.
     @type H: L{Hypergraph}
+    @param spectral: Use the Laplacian eigenvalues.
+    @type spectral: C{bool}
     @return: Connectivity.
     @rtype: C{bool}
     @raise ValueError: The hypergraph is not undirected.
-    @todo: Are there faster ways to determine connectedness for certain cases?
     """
     try:
         assert not H.directed
     except AssertionError:
         raise ValueError('function only applies to undirected hypergraphs')
-    return laplacian_eigenvalues(laplacian_matrix(H))[1] > 1e-8
+    if spectral:
+        return laplacian_eigenvalues(laplacian_matrix(H))[1] > 1e-8
+    return len(connected_components(H)) <= 1
 
 
 def edge_cut(H, X):
@@ -47,14 +477,15 @@ def edge_cut(H, X):
         assert X.issubset(H.vertices)
     except AssertionError:
         raise ValueError('set is not a subset of the hypergraph vertices')
+    if isinstance(H, FrozenHypergraph):
+        inside = numpy.zeros(len(H.vertex_offsets) - 1, dtype=numpy.intp)
+        inside[[H.vertex_id(v) for v in X]] = 1
+        count = numpy.add.reduceat(inside[H.edge_members], H.edge_offsets[:-1])
+        cut = (count > 0) & (count < numpy.diff(H.edge_offsets))
+        return set([H.edge(e) for e in numpy.flatnonzero(cut)])
     Y = H.vertices - X
-    EX = set()
-    for edge in H.edges:
-        for u, v in combinations(edge, 2):
-            if u in X and not u in Y and v in Y and not v in X:
-                EX.add(edge)
-                break
-    return EX
+    return set([edge for edge in H.edges \
+        if not edge.isdisjoint(X) and not edge.isdisjoint(Y)])
 
 
 def isoperimetric_number(H):
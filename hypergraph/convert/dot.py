@@ -30,7 +30,7 @@ def dot_export(G):
     weighted = not all([weight == 1.0 for weight in G.weights.values()])
     for e in G.edges:
         if G.directed:
-            tail, head = e.tail.pop(), e.head
+            tail, head = iter(e.tail).next(), e.head
         else:
             tail, head = tuple(e)
         if weighted:
@@ -31,5 +31,5 @@ def networkx_export(G):
     else:
         nxG = networkx.DiGraph()
         for edge in G.edges:
-            nxG.add_edge(edge.tail.pop(), edge.head, weight=G.weights[edge])
+            nxG.add_edge(iter(edge.tail).next(), edge.head, weight=G.weights[edge])
     return nxG
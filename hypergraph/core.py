@@ -7,10 +7,29 @@ Hypergraph - core classes.
 @license: LGPL-3
 """
 
+from collections import MutableMapping, deque
+from itertools import chain, imap, izip
+
+import numpy
+
+from .attribute import AttributeTable
+from .overlay import fork, settle
+
+_EMPTY = frozenset()
+
+_INDICES = ('_incidence', '_head_index', '_tail_index')
+_TABLES = ('_edge_data', '_vertex_data')
+_STRUCTURES = ('_vertices', '_edges', '_edge_data', '_vertex_data',
+               '_wdegree', '_windegree', '_woutdegree',
+               '_neighbor_cache') + _INDICES
+
+
 class Edge(frozenset):
     """\
     Edge class.
     """
+    __slots__ = ('_head', '_hash', '_tail')
+
     def __new__(cls, edge, head=None):
         """\
         Constructor. Verifies the immutability of the vertices.
@@ -23,12 +42,12 @@ class Edge(frozenset):
         @raise ValueError: No vertices given.
         """
         try:
-            assert all([vertex.__hash__ for vertex in edge])
-        except (AttributeError, AssertionError):
+            self = frozenset.__new__(cls, edge)
+        except TypeError:
             raise TypeError('vertices must be immutable')
-        if len(edge) < 1:
+        if not self:
             raise ValueError('edge must contain at least one vertex')
-        return frozenset.__new__(cls, edge)
+        return self
 
     def __init__(self, edge, head=None):
         """\
@@ -44,28 +63,68 @@ class Edge(frozenset):
             assert head is None or head in self
         except AssertionError:
             raise ValueError('edge has no vertex %s' % head)
+        self._set_head(head)
+
+    @classmethod
+    def trusted(cls, edge, head=None):
+        """\
+        Construct an edge without verifying the vertices or the head vertex,
+        for bulk loading from a known-good source.
+
+        @param edge: Initializing iterable of hashable vertices.
+        @type edge: C{object}
+        @param head: Head vertex, which must be in the edge (optional).
+        @type head: C{object}
+        @return: The new edge.
+        @rtype: L{Edge}
+        """
+        self = frozenset.__new__(cls, edge)
+        self._set_head(head)
+        return self
+
+    def _set_head(self, head):
+        """\
+        Set the head vertex and compute the hash of this edge.
+
+        @param head: Head vertex.
+        @type head: C{object}
+        """
         self._head = head
+        self._hash = frozenset.__hash__(self) + \
+            (head.__hash__() if head is not None else 0)
+        self._tail = None
+
+    def __reduce__(self):
+        """\
+        Pickling support.
+        """
+        return (type(self), (list(self), self._head))
 
     def __hash__(self):
         """\
         Hash function.
         """
-        return super(Edge, self).__hash__() + \
-            (self.head.__hash__() if self.head is not None else 0)
+        return self._hash
 
     def __eq__(self, other):
         """\
         Equality operator.
         """
-        return frozenset.__eq__(self, other) and self.head is other.head
+        return self is other or (frozenset.__eq__(self, other) \
+            and self._head == other.head)
+
+    def __ne__(self, other):
+        """\
+        Inequality operator.
+        """
+        return not self == other
 
     def __repr__(self):
         """\
         Canonical string representation.
         """
-        if self.head:
-            return '%s(%s, \'%s\')' % \
-                (type(self).__name__, list(self), self.head)
+        if self._head is not None:
+            return '%s(%s, %r)' % (type(self).__name__, list(self), self._head)
         else:
             return super(Edge, self).__repr__()
 
@@ -83,9 +142,11 @@ class Edge(frozenset):
         """\
         Edge tail set.
 
-        @rtype: C{set}
+        @rtype: C{frozenset}
         """
-        return set(self) - set([self._head])
+        if self._tail is None:
+            self._tail = frozenset(self).difference((self._head,))
+        return self._tail
 
 
 class Hypergraph(object):
@@ -115,22 +176,40 @@ class Hypergraph(object):
         except (AttributeError, AssertionError):
             raise TypeError('vertices must be immutable')
         self._vertices = vertices
-        self.weights = {}
+        self._edge_data = AttributeTable()
+        self._edge_data.add_column('weight', default=1.0)
         try:
             for edge in edges:
                 assert isinstance(edge, Edge)
                 assert (not directed and edge.head is None) \
                     or (directed and edge.head is not None)
+                self._edge_data.add(edge)
                 try:
-                    self.weights[edge] = float(weights[edge])
+                    self._edge_data.set('weight', edge, float(weights[edge]))
                 except (KeyError, TypeError):
-                    self.weights[edge] = 1.0
+                    pass
         except AssertionError:
             raise ValueError('invalid edge %s' % edge)
         except TypeError:
             pass
         self._vertices.update(*edges)
+        self._vertex_data = AttributeTable()
+        self._vertex_data.update(self._vertices)
         self._edges = edges
+        self._incidence = dict((vertex, set()) for vertex in self._vertices)
+        self._head_index = {}
+        self._tail_index = {}
+        self._wdegree = {}
+        self._windegree = {}
+        self._woutdegree = {}
+        self._neighbor_cache = {}
+        self._shared = set()
+        self._overlaid = set()
+        self._owned = dict.fromkeys(_INDICES)
+        self._version = 0
+        self._journal = None
+        for edge in self._edges:
+            self._index_edge(edge, self._edge_data.get('weight', edge))
 
     def __eq__(self, other):
         """\
@@ -164,7 +243,34 @@ class Hypergraph(object):
             assert vertex.__hash__
         except (AttributeError, AssertionError):
             raise TypeError('vertex must be immutable')
+        if vertex in self._vertices:
+            return
+        self._own('_vertices', '_vertex_data')
         self._vertices.add(vertex)
+        self._vertex_data.add(vertex)
+        self._bucket('_incidence', vertex)
+        self._record('add_vertex', vertex)
+
+    def add_vertices(self, vertices):
+        """\
+        Add several vertices to this hypergraph.
+
+        @param vertices: The vertex objects to add (or a NumPy array of them).
+        @type vertices: C{object}
+        @raise TypeError: One or more vertex objects are not immutable.
+        """
+        if hasattr(vertices, 'tolist'):
+            vertices = vertices.tolist()
+        try:
+            vertices = set(vertices) - self._vertices
+        except TypeError:
+            raise TypeError('vertices must be immutable')
+        self._own('_vertices', '_vertex_data')
+        self._vertices.update(vertices)
+        self._vertex_data.update(vertices)
+        for vertex in vertices:
+            self._bucket('_incidence', vertex)
+            self._record('add_vertex', vertex)
 
     def remove_vertex(self, vertex):
         """\
@@ -173,11 +279,42 @@ class Hypergraph(object):
         @param vertex: The vertex object to remove.
         @type vertex: C{object}
         """
-        edges = set(self.edges)
-        for edge in edges:
-            if vertex in edge:
-                self.remove_edge(edge)
-        self._vertices.remove(vertex)
+        self.remove_vertices([vertex])
+
+    def remove_vertices(self, vertices):
+        """\
+        Remove several vertices and all incident edges from this hypergraph.
+        Nothing is removed if any of the vertices is not in the hypergraph.
+        The edges are removed together as with L{remove_edges}, and the batch
+        counts as a single change to the version and journal.
+
+        @param vertices: The vertex objects to remove.
+        @type vertices: C{object}
+        @raise KeyError: One or more vertices are not in this hypergraph.
+        """
+        if hasattr(vertices, 'tolist'):
+            vertices = vertices.tolist()
+        vertices = set(vertices)
+        for vertex in vertices:
+            if vertex not in self._vertices:
+                raise KeyError(vertex)
+        if not vertices:
+            return
+        edges = set()
+        for vertex in vertices:
+            edges.update(self._incidence[vertex])
+        self._delete_edges(list(edges))
+        self._vertices.difference_update(vertices)
+        for vertex in vertices:
+            self._vertex_data.discard(vertex)
+            del self._incidence[vertex]
+            self._head_index.pop(vertex, None)
+            self._tail_index.pop(vertex, None)
+            self._wdegree.pop(vertex, None)
+            self._windegree.pop(vertex, None)
+            self._woutdegree.pop(vertex, None)
+            self._neighbor_cache.pop(vertex, None)
+        self._record('remove_vertices', list(vertices))
 
     def add_edge(self, edge, weight=1.0):
         """\
@@ -195,9 +332,213 @@ class Hypergraph(object):
                 or (self.directed and edge.head is not None)
         except AssertionError:
             raise ValueError('invalid edge %s' % edge)
-        self._vertices.update(edge)
+        self._insert_edge(edge, weight)
+
+    def add_edges(self, edges, weights=None, heads=None):
+        """\
+        Add several edges to this hypergraph. The edges are validated before
+        any of them is added, and are then added together: the indices and
+        weighted degrees are updated once per vertex, and the batch counts as
+        a single change to the version and journal. An edge already present
+        (or repeated in the batch) takes the last weight given for it.
+
+        The edges may also be given as a two-dimensional NumPy array of vertex
+        objects, one row per edge, in which case the edges of a directed
+        hypergraph take their head vertices from the heads array.
+
+        @param edges: The edges to add.
+        @type edges: C{object}
+        @param weights: Weights keyed by edge, or in the same order as the
+                        edges (optional, unit weights by default).
+        @type weights: C{dict} or C{object}
+        @param heads: Head vertices of array rows (directed only).
+        @type heads: C{object}
+        @raise ValueError: One or more edges are not valid for this hypergraph.
+        """
+        edges = self._edge_batch(edges, heads)
+        if weights is None:
+            weights = [1.0] * len(edges)
+        elif hasattr(weights, 'keys'):
+            weights = [weights.get(edge, 1.0) for edge in edges]
+        else:
+            weights = weights.tolist() if hasattr(weights, 'tolist') \
+                else list(weights)
+            if len(weights) != len(edges):
+                raise ValueError('number of weights does not match edges')
+        new, new_weights, changed, changed_weights = [], [], [], []
+        for edge, weight in izip(edges, weights):
+            if edge in self._edges:
+                delta = weight - self._edge_data.get('weight', edge)
+                if delta:
+                    self._own('_edge_data')
+                    self._edge_data.set('weight', edge, weight)
+                    self._adjust_degrees(edge, delta)
+                    changed.append(edge)
+                    changed_weights.append(weight)
+            else:
+                new.append(edge)
+                new_weights.append(weight)
+        if new:
+            self._insert_edges(new, new_weights)
+        if new or changed:
+            self._record('add_edges', changed + new, changed_weights + \
+                new_weights)
+
+    def _edge_batch(self, edges, heads=None):
+        """\
+        Validate a batch of edges for this hypergraph, building them from rows
+        of vertices (and head vertices) if given as an array.
+
+        @param edges: The edges, or an array of vertex rows.
+        @type edges: C{object}
+        @param heads: Head vertices of array rows (directed only).
+        @type heads: C{object}
+        @return: The list of edges.
+        @rtype: C{list} of L{Edge}
+        @raise ValueError: One or more edges are not valid for this hypergraph.
+        """
+        if not hasattr(edges, 'tolist'):
+            edges = list(edges)
+            for edge in edges:
+                if not isinstance(edge, Edge) \
+                or (edge.head is None) == self._directed:
+                    raise ValueError('invalid edge %s' % edge)
+            return edges
+        rows = edges.tolist()
+        if rows and not rows[0]:
+            raise ValueError('edge must contain at least one vertex')
+        if not self._directed:
+            if heads is not None:
+                raise ValueError('undirected edges have no head vertex')
+            return [Edge.trusted(row) for row in rows]
+        if heads is None:
+            raise ValueError('directed edges require head vertices')
+        heads = heads.tolist() if hasattr(heads, 'tolist') else list(heads)
+        if len(heads) != len(rows):
+            raise ValueError('number of heads does not match edges')
+        for row, head in zip(rows, heads):
+            if head not in row:
+                raise ValueError('edge has no vertex %s' % head)
+        return [Edge.trusted(row, head) for row, head in zip(rows, heads)]
+
+    def _insert_edge(self, edge, weight):
+        """\
+        Insert a validated edge into this hypergraph and all of its indices,
+        or set its weight if it is already present.
+
+        @param edge: The edge to insert.
+        @type edge: L{Edge}
+        @param weight: The weight of the edge.
+        @type weight: C{float}
+        """
+        if edge in self._edges:
+            self.set_weight(edge, weight)
+            return
+        self._own('_vertices', '_edges', '_edge_data', '_vertex_data')
+        if not self._vertices.issuperset(edge):
+            self._vertices.update(edge)
+            self._vertex_data.update(edge)
         self._edges.add(edge)
-        self.weights[edge] = weight
+        self._edge_data.add(edge)
+        self._edge_data.set('weight', edge, weight)
+        self._index_edge(edge, weight)
+        self._record('add_edge', edge, weight)
+
+    def _insert_edges(self, edges, weights):
+        """\
+        Insert several validated edges, none of which is already present, into
+        this hypergraph and all of its indices, grouping the index and weighted
+        degree updates by vertex. An edge repeated in the batch takes its last
+        weight. The change is not recorded.
+
+        @param edges: The edges to insert.
+        @type edges: C{list} of L{Edge}
+        @param weights: The weights of the edges.
+        @type weights: C{list} of C{float}
+        """
+        self._own(*_STRUCTURES)
+        self._flatten(len(edges))
+        size = len(self._edges)
+        self._edges.update(edges)
+        if len(self._edges) - size < len(edges):
+            weight_of = dict(izip(edges, weights))
+            seen = set()
+            edges = [edge for edge in edges \
+                if not (edge in seen or seen.add(edge))]
+            weights = [weight_of[edge] for edge in edges]
+        vertices = [vertex for vertex in set(chain.from_iterable(edges)) \
+            if vertex not in self._vertices]
+        self._vertices.update(vertices)
+        self._vertex_data.extend(vertices)
+        weights = numpy.array(weights, dtype=float)
+        self._edge_data.extend(edges, weight=weights)
+        cache = self._neighbor_cache
+        for name, degrees, vertex, group, delta in \
+            self._vertex_groups(edges, weights):
+            index = getattr(self, name)
+            if self._owned[name] is None:
+                index.setdefault(vertex, set()).update(group)
+            else:
+                self._bucket(name, vertex).update(group)
+            degrees[vertex] = degrees.get(vertex, 0.0) + delta
+            cache.pop(vertex, None)
+
+    def _vertex_groups(self, edges, weights):
+        """\
+        Group a batch of edges by vertex for the incidence index and, for
+        directed hypergraphs, the head and tail indices, using the identifiers
+        of the vertices in the vertex table.
+
+        @param edges: The edges, whose vertices are all in the hypergraph.
+        @type edges: C{list} of L{Edge}
+        @param weights: The weights of the edges.
+        @type weights: C{numpy.ndarray}
+        @return: For each index and vertex, the attribute name of the index,
+                 the corresponding weighted degrees, the vertex, its edges in
+                 the batch and the sum of their weights.
+        @rtype: C{generator} of C{tuple}
+        """
+        batch = numpy.empty(len(edges), dtype=object)
+        batch[:] = edges
+        members = [vertex for edge in edges for vertex in edge]
+        member_ids = self._vertex_data.ids(members)
+        owners = numpy.repeat(numpy.arange(len(edges)),
+            numpy.fromiter(imap(len, edges), numpy.intp, len(edges)))
+        groups = [('_incidence', self._wdegree, slice(None))]
+        if self._directed:
+            heads = self._vertex_data.ids(edge.head for edge in edges)
+            is_head = member_ids == heads[owners]
+            groups.append(('_head_index', self._windegree, is_head))
+            groups.append(('_tail_index', self._woutdegree, ~is_head))
+        key = self._vertex_data.key
+        for name, degrees, selection in groups:
+            ids, owned = member_ids[selection], owners[selection]
+            if not len(ids):
+                continue
+            order = numpy.argsort(ids, kind='mergesort')
+            ids, owned = ids[order], owned[order]
+            starts = numpy.flatnonzero(numpy.concatenate(([True],
+                ids[1:] != ids[:-1])))
+            deltas = numpy.add.reduceat(weights[owned], starts)
+            ends = numpy.append(starts[1:], len(ids))
+            grouped = batch[owned].tolist()
+            for i, start, end, delta in izip(ids[starts].tolist(),
+                starts.tolist(), ends.tolist(), deltas.tolist()):
+                yield name, degrees, key(i), grouped[start:end], delta
+
+    def _flatten(self, size):
+        """\
+        Replace every overlay of this hypergraph with a plain copy ahead of a
+        batch of changes large enough (a quarter of the edges) that the
+        overlays would be replaced during it anyway.
+
+        @param size: The number of edges in the batch.
+        @type size: C{int}
+        """
+        if self._overlaid and size * 4 >= len(self._edges):
+            for name in self._overlaid:
+                setattr(self, name, settle(getattr(self, name), force=True))
+            self._overlaid.clear()
 
     def remove_edge(self, edge):
         """\
@@ -206,8 +547,498 @@ class Hypergraph(object):
         @param edge: The edge to add.
         @type edge: L{Edge}
         """
-        del self.weights[edge]
+        self._delete_edge(edge)
+
+    def remove_edges(self, edges):
+        """\
+        Remove several edges from this hypergraph. The edges are validated
+        before any of them is removed (nothing is removed if any of them is not
+        in the hypergraph), and are then removed together: the indices and
+        weighted degrees are updated once per vertex, and the batch counts as
+        a single change to the version and journal.
+
+        @param edges: The edges to remove.
+        @type edges: C{object}
+        @raise KeyError: One or more edges are not in this hypergraph.
+        """
+        edges = set(edges)
+        for edge in edges:
+            if edge not in self._edges:
+                raise KeyError(edge)
+        if not edges:
+            return
+        edges = list(edges)
+        self._delete_edges(edges)
+        self._record('remove_edges', edges)
+
+    def _delete_edge(self, edge):
+        """\
+        Delete an edge from this hypergraph and all of its indices.
+
+        @param edge: The edge to delete.
+        @type edge: L{Edge}
+        @raise KeyError: Edge is not in this hypergraph.
+        """
+        self._own('_edges', '_edge_data')
         self._edges.remove(edge)
+        self._unindex_edge(edge, self._edge_data.get('weight', edge))
+        self._edge_data.discard(edge)
+        self._record('remove_edge', edge)
+
+    def _delete_edges(self, edges):
+        """\
+        Delete several distinct edges, all of which are present, from this
+        hypergraph and all of its indices, grouping the index and weighted
+        degree updates by vertex. A weighted degree whose vertex has no
+        remaining incident edges is reset to exactly zero. The change is not
+        recorded.
+
+        @param edges: The edges to delete.
+        @type edges: C{list} of L{Edge}
+        """
+        self._own(*_STRUCTURES)
+        self._flatten(len(edges))
+        weights = self._edge_data.values('weight', edges)
+        cache = self._neighbor_cache
+        for name, degrees, vertex, group, delta in \
+            self._vertex_groups(edges, weights):
+            index = getattr(self, name)
+            bucket = index[vertex] if self._owned[name] is None \
+                else self._bucket(name, vertex)
+            bucket.difference_update(group)
+            degrees[vertex] = degrees.get(vertex, 0.0) - delta \
+                if bucket else 0.0
+            cache.pop(vertex, None)
+        self._edges.difference_update(edges)
+        for edge in edges:
+            self._edge_data.discard(edge)
+
+    def set_weight(self, edge, weight):
+        """\
+        Set the weight of an edge in this hypergraph, keeping the weighted
+        degrees of its vertices up to date.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @param weight: The new weight of the edge.
+        @type weight: C{float}
+        @raise KeyError: Edge is not in this hypergraph.
+        """
+        delta = weight - self._edge_data.get('weight', edge)
+        if not delta:
+            return
+        self._own('_edge_data')
+        self._edge_data.set('weight', edge, weight)
+        self._adjust_degrees(edge, delta)
+        self._record('set_weight', edge, weight)
+
+    def copy(self):
+        """\
+        Return a copy of this hypergraph. The copy shares its vertex set, edge
+        set, attribute tables and indices with this hypergraph. Either side
+        changes a shared structure through an overlay which records its own
+        changes (per vertex, edge or identifier) and falls back to the shared
+        structure otherwise, so that copying and each change after it take
+        time and memory independent of the size of the hypergraph. An overlay
+        is replaced by a plain copy once its changes reach a quarter of the
+        shared structure, and reading a whole attribute column (for example,
+        with L{freeze}) copies the shared columns once.
+
+        @return: The copy.
+        @rtype: L{Hypergraph}
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        self._shared.update(_STRUCTURES)
+        clone._shared = set(_STRUCTURES)
+        clone._overlaid = set(self._overlaid)
+        clone._owned = dict.fromkeys(_INDICES)
+        if self._journal is not None:
+            clone._journal = deque(self._journal, self._journal.maxlen)
+        return clone
+
+    __copy__ = copy
+
+    @property
+    def version(self):
+        """\
+        Version of the hypergraph, which increases by one with every change to
+        its vertices, edges, weights or attributes (a batch of edges added or
+        removed with L{add_edges}, L{remove_edges} or L{remove_vertices} is one
+        change).
+
+        @rtype: C{int}
+        """
+        return self._version
+
+    def enable_journal(self, maxlen=None):
+        """\
+        Start recording changes to this hypergraph in a journal, from which
+        they can be read with L{changes_since}. A bounded journal keeps only
+        the most recent changes.
+
+        @param maxlen: The maximum number of changes to keep (optional).
+        @type maxlen: C{int}
+        """
+        self._journal = deque(maxlen=maxlen)
+
+    def disable_journal(self):
+        """\
+        Stop recording changes to this hypergraph and discard the journal.
+        """
+        self._journal = None
+
+    def changes_since(self, version):
+        """\
+        Return the changes made to this hypergraph after a given version, as a
+        list of (version, operation, arguments) tuples, for replay on another
+        hypergraph with L{apply_changes}.
+
+        @param version: The version.
+        @type version: C{int}
+        @return: The changes in order.
+        @rtype: C{list} of C{tuple}
+        @raise ValueError: The journal does not reach back to the version.
+        """
+        if version >= self._version:
+            return []
+        try:
+            assert self._journal is not None
+        except AssertionError:
+            raise ValueError('journal is not enabled')
+        try:
+            assert self._journal and self._journal[0][0] <= version + 1
+        except AssertionError:
+            raise ValueError('journal does not reach version %d' % version)
+        changes = list(self._journal)
+        return changes[len(changes) - (self._version - version):]
+
+    def apply_changes(self, changes):
+        """\
+        Replay changes read with L{changes_since} from another hypergraph at
+        the same version as this one (for example, a copy or an unpickled
+        replica). Changes already applied are skipped.
+
+        @param changes: The changes in order.
+        @type changes: C{list} of C{tuple}
+        @raise ValueError: The changes do not follow the version of this
+                           hypergraph.
+        """
+        for version, operation, args in changes:
+            if version <= self._version:
+                continue
+            try:
+                assert version == self._version + 1
+            except AssertionError:
+                raise ValueError('missing changes before version %d' % version)
+            if operation == 'add_vertex':
+                self.add_vertex(*args)
+            elif operation == 'remove_vertex':
+                self.remove_vertices(args)
+            elif operation == 'remove_vertices':
+                self.remove_vertices(*args)
+            elif operation == 'add_edge':
+                self._insert_edge(*args)
+            elif operation == 'add_edges':
+                self.add_edges(*args)
+            elif operation == 'remove_edge':
+                self._delete_edge(*args)
+            elif operation == 'remove_edges':
+                self.remove_edges(*args)
+            elif operation == 'set_weight':
+                self.set_weight(*args)
+            elif operation == 'add_edge_attribute':
+                self.add_edge_attribute(*args)
+            elif operation == 'add_vertex_attribute':
+                self.add_vertex_attribute(*args)
+            elif operation == 'set_edge_attribute':
+                self._set_attribute('_edge_data', *args)
+            elif operation == 'set_vertex_attribute':
+                self._set_attribute('_vertex_data', *args)
+            else:
+                raise ValueError('unknown operation %s' % operation)
+
+    def _record(self, operation, *args):
+        """\
+        Advance the version of this hypergraph and record a change in the
+        journal, if enabled.
+
+        @param operation: The name of the operation.
+        @type operation: C{str}
+        @param args: The arguments of the operation.
+        @type args: C{tuple}
+        """
+        self._version += 1
+        if self._journal is not None:
+            self._journal.append((self._version, operation, args))
+
+    def _own(self, *names):
+        """\
+        Make the named structures private to this hypergraph, forking any
+        which are shared with a copy. A forked structure is an overlay which
+        records changes over the shared one, so that forking takes time
+        independent of its size; an overlay whose changes grow large is
+        replaced by a plain copy. The vertex sets of index dictionaries are
+        copied on demand by L{_bucket}.
+
+        @param names: The attribute names of the structures.
+        @type names: C{str}
+        """
+        if not self._shared and not self._overlaid:
+            return
+        for name in names:
+            if name in self._shared:
+                self._shared.remove(name)
+                setattr(self, name, getattr(self, name).fork() \
+                    if name in _TABLES else fork(getattr(self, name)))
+                if name in self._owned:
+                    self._owned[name] = set()
+                if name not in _TABLES:
+                    self._overlaid.add(name)
+            elif name in self._overlaid:
+                structure = settle(getattr(self, name))
+                if structure is not getattr(self, name):
+                    setattr(self, name, structure)
+                    self._overlaid.remove(name)
+
+    def _bucket(self, name, vertex):
+        """\
+        Return the set of an index dictionary for a vertex, ready for
+        modification, creating it if necessary and copying it if it is shared
+        with a copy.
+
+        @param name: The attribute name of the index dictionary.
+        @type name: C{str}
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The index set of the vertex.
+        @rtype: C{set}
+        """
+        self._own(name)
+        index = getattr(self, name)
+        owned = self._owned[name]
+        try:
+            bucket = index[vertex]
+        except KeyError:
+            bucket = index[vertex] = set()
+            if owned is not None:
+                owned.add(vertex)
+            return bucket
+        if owned is not None and vertex not in owned:
+            bucket = index[vertex] = set(bucket)
+            owned.add(vertex)
+        return bucket
+
+    def _index_edge(self, edge, weight):
+        """\
+        Record an edge in the vertex incidence index and, for directed
+        hypergraphs, in the head and tail indices, and add its weight to the
+        weighted degrees of its vertices.
+
+        @param edge: The edge to index.
+        @type edge: L{Edge}
+        @param weight: The weight of the edge.
+        @type weight: C{float}
+        """
+        self._reindex(edge, set.add)
+        self._adjust_degrees(edge, weight)
+
+    def _unindex_edge(self, edge, weight):
+        """\
+        Remove an edge from the vertex incidence, head and tail indices, and
+        subtract its weight from the weighted degrees of its vertices.
+
+        @param edge: The edge to unindex.
+        @type edge: L{Edge}
+        @param weight: The weight of the edge.
+        @type weight: C{float}
+        """
+        self._reindex(edge, set.discard)
+        self._adjust_degrees(edge, -weight)
+
+    def _reindex(self, edge, op):
+        """\
+        Apply a set operation with an edge to the incidence (and head or tail)
+        index sets of each of its vertices. The index dictionaries are updated
+        directly unless this hypergraph has been copied.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @param op: The set operation (C{set.add} or C{set.discard}).
+        @type op: C{function}
+        """
+        self._own('_neighbor_cache')
+        cache = self._neighbor_cache
+        head = edge.head if self._directed else None
+        if not self._shared and self._owned['_incidence'] is None:
+            incidence = self._incidence
+            heads, tails = self._head_index, self._tail_index
+            for vertex in edge:
+                op(incidence.setdefault(vertex, set()), edge)
+                cache.pop(vertex, None)
+                if head is not None:
+                    op((heads if vertex == head else tails).setdefault(vertex,
+                        set()), edge)
+            return
+        for vertex in edge:
+            op(self._bucket('_incidence', vertex), edge)
+            cache.pop(vertex, None)
+            if head is not None:
+                op(self._bucket('_head_index' if vertex == head \
+                    else '_tail_index', vertex), edge)
+
+    def _adjust_degrees(self, edge, delta):
+        """\
+        Add a weight difference to the weighted degrees of the vertices of an
+        edge. A weighted degree whose vertex has no remaining incident edges is
+        reset to exactly zero, so that rounding error does not accumulate.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @param delta: The weight difference.
+        @type delta: C{float}
+        """
+        self._own('_wdegree', '_windegree', '_woutdegree')
+        wdegree = self._wdegree
+        head = edge.head if self._directed else None
+        for vertex in edge:
+            wdegree[vertex] = wdegree.get(vertex, 0.0) + delta \
+                if self._incidence[vertex] else 0.0
+            if head is None:
+                continue
+            if vertex == head:
+                self._windegree[vertex] = self._windegree.get(vertex, 0.0) \
+                    + delta if self._head_index[vertex] else 0.0
+            else:
+                self._woutdegree[vertex] = self._woutdegree.get(vertex, 0.0) \
+                    + delta if self._tail_index[vertex] else 0.0
+
+    def freeze(self):
+        """\
+        Return an immutable, integer-indexed snapshot of this hypergraph.
+
+        @return: The frozen hypergraph.
+        @rtype: L{FrozenHypergraph}
+        """
+        from .frozen import FrozenHypergraph
+        return FrozenHypergraph(self)
+
+    def subgraph(self, vertices):
+        """\
+        Return a read-only view of the subhypergraph induced by a set of
+        vertices.
+
+        @param vertices: The vertex subset.
+        @type vertices: C{set}
+        @rtype: L{SubgraphView}
+        """
+        from .view import SubgraphView
+        return SubgraphView(self, vertices)
+
+    def edge_subgraph(self, edges):
+        """\
+        Return a read-only view of the spanning subhypergraph with a subset of
+        the edges.
+
+        @param edges: The edge subset.
+        @type edges: C{set}
+        @rtype: L{EdgeSubsetView}
+        """
+        from .view import EdgeSubsetView
+        return EdgeSubsetView(self, edges)
+
+    def reweighted(self, weights):
+        """\
+        Return a read-only view of this hypergraph with different edge weights.
+
+        @param weights: New weights keyed by edge, or a function of the edge.
+        @type weights: C{dict} or C{function}
+        @rtype: L{ReweightedView}
+        """
+        from .view import ReweightedView
+        return ReweightedView(self, weights)
+
+    def add_edge_attribute(self, name, dtype=float, default=0.0):
+        """\
+        Add a numeric attribute of the edges of this hypergraph.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param dtype: The NumPy data type of the attribute.
+        @type dtype: C{type}
+        @param default: The value of the attribute for every edge.
+        @type default: C{float}
+        @raise ValueError: Attribute exists or type is not numeric.
+        """
+        self._own('_edge_data')
+        self._edge_data.add_column(name, dtype, default)
+        self._record('add_edge_attribute', name, dtype, default)
+
+    def add_vertex_attribute(self, name, dtype=float, default=0.0):
+        """\
+        Add a numeric attribute of the vertices of this hypergraph.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param dtype: The NumPy data type of the attribute.
+        @type dtype: C{type}
+        @param default: The value of the attribute for every vertex.
+        @type default: C{float}
+        @raise ValueError: Attribute exists or type is not numeric.
+        """
+        self._own('_vertex_data')
+        self._vertex_data.add_column(name, dtype, default)
+        self._record('add_vertex_attribute', name, dtype, default)
+
+    def edge_attribute(self, name):
+        """\
+        Return a mapping view of a numeric attribute of the edges of this
+        hypergraph. The weight attribute is named 'weight'.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @rtype: L{AttributeMap}
+        @raise KeyError: No such attribute.
+        """
+        if name not in self._edge_data.columns:
+            raise KeyError(name)
+        if name == 'weight':
+            return WeightMap(self)
+        return AttributeMap(self, '_edge_data', name)
+
+    def vertex_attribute(self, name):
+        """\
+        Return a mapping view of a numeric attribute of the vertices of this
+        hypergraph.
+
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @rtype: L{AttributeMap}
+        @raise KeyError: No such attribute.
+        """
+        if name not in self._vertex_data.columns:
+            raise KeyError(name)
+        return AttributeMap(self, '_vertex_data', name)
+
+    def _set_attribute(self, table, name, key, value):
+        """\
+        Set the value of an attribute in one of the attribute tables.
+
+        @param table: The attribute name of the table.
+        @type table: C{str}
+        @param name: The name of the attribute.
+        @type name: C{str}
+        @param key: The edge or vertex.
+        @type key: C{object}
+        @param value: The value.
+        @type value: C{float} or C{int}
+        @raise KeyError: No such attribute, edge or vertex.
+        """
+        getattr(self, table).get(name, key)
+        self._own(table)
+        getattr(self, table).set(name, key, value)
+        self._record(table == '_edge_data' and 'set_edge_attribute' \
+            or 'set_vertex_attribute', name, key, value)
 
     @property
     def directed(self):
@@ -236,6 +1067,61 @@ class Hypergraph(object):
         """
         return self._edges
 
+    @property
+    def weights(self):
+        """\
+        Weight relation of the hypergraph. Assigning to an item sets the weight
+        of an existing edge via L{set_weight}.
+
+        @rtype: L{WeightMap}
+        """
+        return WeightMap(self)
+
+    @weights.setter
+    def weights(self, weights):
+        """\
+        Replace the weight relation of the hypergraph. Edges missing from the
+        new relation receive unit weight.
+
+        @param weights: The new weight relation.
+        @type weights: C{dict}
+        """
+        for edge in self._edges:
+            try:
+                self.set_weight(edge, float(weights[edge]))
+            except KeyError:
+                self.set_weight(edge, 1.0)
+
+    @property
+    def edge_table(self):
+        """\
+        Attribute table of the edges of the hypergraph, giving each edge a
+        stable integer identifier. It must not be modified directly.
+
+        @rtype: L{AttributeTable}
+        """
+        return self._edge_data
+
+    @property
+    def vertex_table(self):
+        """\
+        Attribute table of the vertices of the hypergraph, giving each vertex a
+        stable integer identifier. It must not be modified directly.
+
+        @rtype: L{AttributeTable}
+        """
+        return self._vertex_data
+
+    def has_edge(self, edge):
+        """\
+        Return whether an edge is in this hypergraph.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @rtype: C{bool}
+        """
+        return edge in self._edges
+
     def uniform(self, k=None):
         """\
         Return whether this is a k-uniform hypergraph.
@@ -272,9 +1158,10 @@ class Hypergraph(object):
         @return: A set of 
         @rtype: C{set} of L{Edge}
         """
-        if u == v:
+        edges = self._incidence.get(u)
+        if u == v or edges is None:
             return set()
-        return set([edge for edge in self.edges if u in edge and v in edge])
+        return edges & self._incidence.get(v, _EMPTY)
 
     def incident(self, v, forward=True):
         """\
@@ -292,11 +1179,12 @@ class Hypergraph(object):
         @return: A set of incident edges.
         @rtype: C{set} of L{Edge}
         """
-        if forward and self.directed:
-            return set([edge for edge in self.edges if edge.head == v])
+        if not self.directed:
+            return set(self._incidence.get(v, _EMPTY))
+        elif forward:
+            return set(self._head_index.get(v, _EMPTY))
         else:
-            return set([edge for edge in self.edges \
-                if v in edge and edge.head != v])
+            return set(self._tail_index.get(v, _EMPTY))
 
     def reachable(self, tail, head):
         """\
@@ -311,7 +1199,10 @@ class Hypergraph(object):
         @rtype: C{set} of L{Edge}
         """
         if self.directed:
-            return self.adjacent(tail, head) & self.incident(head)
+            edges = self._tail_index.get(tail)
+            if edges is None:
+                return set()
+            return edges & self._head_index.get(head, _EMPTY)
         else:
             return self.adjacent(tail, head)
 
@@ -325,7 +1216,33 @@ class Hypergraph(object):
         @return: The set of vertices adjacent to the vertex.
         @rtype: C{set}
         """
-        return set([v for v in self.vertices if self.reachable(vertex, v)])
+        if self.directed:
+            return set([edge.head for edge \
+                in self._tail_index.get(vertex, _EMPTY)])
+        neighbors = set()
+        for edge in self._incidence.get(vertex, _EMPTY):
+            neighbors.update(edge)
+        neighbors.discard(vertex)
+        return neighbors
+
+    def neighbor_view(self, vertex):
+        """\
+        Return the neighbors of a given vertex as an immutable set, which is
+        cached until an edge containing the vertex is added or removed.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The set of vertices adjacent to the vertex.
+        @rtype: C{frozenset}
+        """
+        try:
+            return self._neighbor_cache[vertex]
+        except KeyError:
+            neighbors = frozenset(self.neighbors(vertex))
+            if vertex in self._vertices:
+                self._own('_neighbor_cache')
+                self._neighbor_cache[vertex] = neighbors
+            return neighbors
 
     def degree(self, vertex, weighted=True):
         """\
@@ -338,8 +1255,9 @@ class Hypergraph(object):
         @return: Degree of the vertex.
         @rtype: C{float}
         """
-        return sum([self.weights[edge] if weighted else 1 for edge \
-            in self.edges if vertex in edge])
+        if weighted:
+            return self._wdegree.get(vertex, 0.0)
+        return len(self._incidence.get(vertex, _EMPTY))
 
     def indegree(self, vertex, weighted=True):
         """\
@@ -354,8 +1272,9 @@ class Hypergraph(object):
         """
         if not self.directed:
             return self.degree(vertex, weighted)
-        return sum([self.weights[edge] if weighted else 1 for edge \
-            in self.edges if edge.head == vertex])
+        if weighted:
+            return self._windegree.get(vertex, 0.0)
+        return len(self._head_index.get(vertex, _EMPTY))
         
     def outdegree(self, vertex, weighted=True):
         """\
@@ -370,9 +1289,134 @@ class Hypergraph(object):
         """
         if not self.directed:
             return self.degree(vertex, weighted)
-        return sum([self.weights[edge] if weighted else 1 for edge \
-            in self.edges if vertex in edge and edge.head != vertex])
-        
+        if weighted:
+            return self._woutdegree.get(vertex, 0.0)
+        return len(self._tail_index.get(vertex, _EMPTY))
+
+    def degrees(self, weighted=True, kind='degree'):
+        """\
+        Return the (weighted) degree, indegree or outdegree of every vertex.
+
+        @param weighted: Return weighted degrees if true.
+        @type weighted: C{bool}
+        @param kind: One of 'degree', 'indegree' or 'outdegree'.
+        @type kind: C{str}
+        @return: Degree of each vertex.
+        @rtype: C{dict}
+        @raise ValueError: Unknown kind of degree.
+        """
+        try:
+            assert kind in ('degree', 'indegree', 'outdegree')
+        except AssertionError:
+            raise ValueError('unknown kind of degree %s' % kind)
+        if kind == 'degree' or not self.directed:
+            counters = (self._incidence, self._wdegree)
+        elif kind == 'indegree':
+            counters = (self._head_index, self._windegree)
+        else:
+            counters = (self._tail_index, self._woutdegree)
+        if weighted:
+            return dict((vertex, counters[1].get(vertex, 0.0)) \
+                for vertex in self._vertices)
+        return dict((vertex, len(counters[0].get(vertex, _EMPTY))) \
+            for vertex in self._vertices)
+
+
+class AttributeMap(MutableMapping):
+    """\
+    Mapping view of a numeric attribute of the edges or vertices of a
+    hypergraph.
+    """
+    __slots__ = ('_hypergraph', '_table', '_name')
+
+    def __init__(self, hypergraph, table, name):
+        """\
+        Constructor.
+
+        @param hypergraph: The hypergraph whose attribute to view.
+        @type hypergraph: L{Hypergraph}
+        @param table: The attribute name of the table ('_edge_data' or
+                      '_vertex_data').
+        @type table: C{str}
+        @param name: The name of the attribute.
+        @type name: C{str}
+        """
+        self._hypergraph = hypergraph
+        self._table = table
+        self._name = name
+
+    def _data(self):
+        return getattr(self._hypergraph, self._table)
+
+    def __getitem__(self, key):
+        return self._data().get(self._name, key)
+
+    def __setitem__(self, key, value):
+        self._hypergraph._set_attribute(self._table, self._name, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError('attribute values cannot be deleted')
+
+    def __contains__(self, key):
+        return key in self._data()
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def keys(self):
+        return list(self._data())
+
+    def values(self):
+        return self._data().values(self._name).tolist()
+
+    def items(self):
+        return zip(self.keys(), self.values())
+
+    def array(self):
+        """\
+        Return the attribute values as a read-only array indexed by the
+        identifiers of the attribute table.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._data().column(self._name)
+
+    def copy(self):
+        """\
+        Return a copy of the attribute values.
+
+        @rtype: C{dict}
+        """
+        return dict(self.items())
+
+
+class WeightMap(AttributeMap):
+    """\
+    Mapping view of the weight relation of a hypergraph.
+    """
+    __slots__ = ()
+
+    def __init__(self, hypergraph):
+        """\
+        Constructor.
+
+        @param hypergraph: The hypergraph whose weights to view.
+        @type hypergraph: L{Hypergraph}
+        """
+        super(WeightMap, self).__init__(hypergraph, '_edge_data', 'weight')
+
+    def __setitem__(self, edge, weight):
+        self._hypergraph.set_weight(edge, weight)
+
+    def __delitem__(self, edge):
+        raise TypeError('edge weights cannot be deleted, remove the edge')
+
 
 class Graph(Hypergraph):
     """\
@@ -0,0 +1,615 @@
+"""\
+Hypergraph - frozen, integer-indexed hypergraph snapshots.
+
+@author: Aaron Mavrinac
+@organization: University of Windsor
+@contact: mavrin1@uwindsor.ca
+@license: LGPL-3
+"""
+
+import numpy
+
+from .core import Edge, Hypergraph
+
+
+def _readonly(array):
+    """\
+    Mark a NumPy array as read-only and return it.
+
+    @param array: The array.
+    @type array: C{numpy.ndarray}
+    @return: The same array.
+    @rtype: C{numpy.ndarray}
+    """
+    array.flags.writeable = False
+    return array
+
+
+class FrozenHypergraph(object):
+    """\
+    Immutable snapshot of a hypergraph. Vertices and edges are mapped to dense
+    integer identifiers (vertices in sorted order), and incidence is stored as
+    a pair of compressed sparse row (CSR) structures: edge offsets and member
+    vertices, and vertex offsets and containing edges. Directed hypergraphs
+    also store the head vertex of each edge.
+
+    The query interface of L{Hypergraph} is supported, so read-only algorithms
+    accept a frozen hypergraph in place of a mutable one. Methods returning
+    L{Edge} objects build them on first use.
+    """
+    def __init__(self, H):
+        """\
+        Constructor.
+
+        @param H: The hypergraph to freeze.
+        @type H: L{Hypergraph}
+        """
+        self._directed = H.directed
+        self._vertex_list = sorted(H.vertices)
+        self._vertex_index = dict((vertex, i) \
+            for i, vertex in enumerate(self._vertex_list))
+        edges = list(H.edges)
+        weights = H.weights
+        total = sum([len(edge) for edge in edges])
+        itype = numpy.int32 \
+            if max(len(self._vertex_list), len(edges), total) < 2 ** 31 \
+            else numpy.int64
+        index = self._vertex_index
+        sizes = numpy.fromiter((len(edge) for edge in edges), itype,
+            len(edges))
+        self._edge_offsets = numpy.zeros(len(edges) + 1, dtype=itype)
+        numpy.cumsum(sizes, out=self._edge_offsets[1:])
+        self._edge_members = numpy.fromiter((index[vertex] for edge in edges \
+            for vertex in edge), itype, total)
+        self._heads = numpy.fromiter((index[edge.head] if self._directed \
+            else -1 for edge in edges), itype, len(edges))
+        if isinstance(H, Hypergraph):
+            self._edge_weights = weights.array()[H.edge_table.ids(edges)] \
+                .astype(numpy.float64)
+        else:
+            self._edge_weights = numpy.fromiter((weights[edge] \
+                for edge in edges), numpy.float64, len(edges))
+        entry_edges = numpy.repeat(numpy.arange(len(edges), dtype=itype),
+            sizes)
+        order = numpy.argsort(self._edge_members, kind='mergesort')
+        self._vertex_edges = entry_edges[order]
+        self._vertex_offsets = numpy.zeros(len(self._vertex_list) + 1,
+            dtype=itype)
+        numpy.cumsum(numpy.bincount(self._edge_members,
+            minlength=len(self._vertex_list)), out=self._vertex_offsets[1:])
+        for array in (self._edge_offsets, self._edge_members, self._heads,
+                      self._edge_weights, self._vertex_edges,
+                      self._vertex_offsets):
+            _readonly(array)
+        self._edge_list = None
+        self._edge_index = None
+        self._vertex_set = None
+        self._edge_set = None
+        self._weight_dict = None
+
+    def __repr__(self):
+        """\
+        Canonical string representation.
+
+        @rtype: C{str}
+        """
+        return '%s(%s)' % (type(self).__name__, repr(self.thaw()))
+
+    def freeze(self):
+        """\
+        Return this frozen hypergraph.
+
+        @rtype: L{FrozenHypergraph}
+        """
+        return self
+
+    def thaw(self):
+        """\
+        Return a mutable copy of this hypergraph.
+
+        @rtype: L{Hypergraph}
+        """
+        return Hypergraph(vertices=self.vertices, edges=self.edges,
+            weights=self.weights, directed=self.directed)
+
+    def subgraph(self, vertices):
+        """\
+        Return a read-only view of the subhypergraph induced by a set of
+        vertices.
+
+        @param vertices: The vertex subset.
+        @type vertices: C{set}
+        @rtype: L{SubgraphView}
+        """
+        from .view import SubgraphView
+        return SubgraphView(self, vertices)
+
+    def edge_subgraph(self, edges):
+        """\
+        Return a read-only view of the spanning subhypergraph with a subset of
+        the edges.
+
+        @param edges: The edge subset.
+        @type edges: C{set}
+        @rtype: L{EdgeSubsetView}
+        """
+        from .view import EdgeSubsetView
+        return EdgeSubsetView(self, edges)
+
+    def reweighted(self, weights):
+        """\
+        Return a read-only view of this hypergraph with different edge
+        weights.
+
+        @param weights: New weights keyed by edge, or a function of the edge.
+        @type weights: C{dict} or C{function}
+        @rtype: L{ReweightedView}
+        """
+        from .view import ReweightedView
+        return ReweightedView(self, weights)
+
+    @property
+    def directed(self):
+        """\
+        Directedness of the hypergraph.
+
+        @rtype: C{bool}
+        """
+        return self._directed
+
+    @property
+    def edge_offsets(self):
+        """\
+        CSR offsets into L{edge_members}, one per edge plus a final sentinel.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._edge_offsets
+
+    @property
+    def edge_members(self):
+        """\
+        CSR member vertex identifiers of each edge.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._edge_members
+
+    @property
+    def vertex_offsets(self):
+        """\
+        CSR offsets into L{vertex_edges}, one per vertex plus a final sentinel.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._vertex_offsets
+
+    @property
+    def vertex_edges(self):
+        """\
+        CSR identifiers of the edges containing each vertex.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._vertex_edges
+
+    @property
+    def heads(self):
+        """\
+        Head vertex identifier of each edge (-1 if undirected).
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._heads
+
+    @property
+    def edge_weights(self):
+        """\
+        Weight of each edge.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._edge_weights
+
+    @property
+    def entry_edges(self):
+        """\
+        Edge identifier of each entry of L{edge_members}.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return numpy.repeat(numpy.arange(len(self._heads),
+            dtype=self._edge_offsets.dtype), numpy.diff(self._edge_offsets))
+
+    def vertex(self, i):
+        """\
+        Return the vertex with the given identifier.
+
+        @param i: The vertex identifier.
+        @type i: C{int}
+        @rtype: C{object}
+        """
+        return self._vertex_list[i]
+
+    def vertex_id(self, vertex):
+        """\
+        Return the identifier of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @rtype: C{int}
+        @raise KeyError: Vertex is not in this hypergraph.
+        """
+        return self._vertex_index[vertex]
+
+    def edge(self, i):
+        """\
+        Return the edge with the given identifier.
+
+        @param i: The edge identifier.
+        @type i: C{int}
+        @rtype: L{Edge}
+        """
+        if self._edge_list is not None:
+            return self._edge_list[i]
+        head = self._heads[i]
+        return Edge.trusted([self._vertex_list[j] for j in self.members(i)],
+            head=(self._vertex_list[head] if head >= 0 else None))
+
+    def _edge_objects(self):
+        """\
+        Return the list of all edges, building it on first use.
+
+        @rtype: C{list} of L{Edge}
+        """
+        if self._edge_list is None:
+            self._edge_list = [self.edge(i) for i in range(len(self._heads))]
+        return self._edge_list
+
+    def edge_id(self, edge):
+        """\
+        Return the identifier of the given edge.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @rtype: C{int}
+        @raise KeyError: Edge is not in this hypergraph.
+        """
+        if self._edge_index is None:
+            self._edge_index = dict((edge, i) \
+                for i, edge in enumerate(self._edge_objects()))
+        return self._edge_index[edge]
+
+    def has_edge(self, edge):
+        """\
+        Return whether an edge is in this hypergraph.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @rtype: C{bool}
+        """
+        try:
+            self.edge_id(edge)
+        except KeyError:
+            return False
+        return True
+
+    def members(self, i):
+        """\
+        Return the member vertex identifiers of an edge.
+
+        @param i: The edge identifier.
+        @type i: C{int}
+        @rtype: C{numpy.ndarray}
+        """
+        return self._edge_members[self._edge_offsets[i]:
+            self._edge_offsets[i + 1]]
+
+    def containing(self, i):
+        """\
+        Return the identifiers of the edges containing a vertex.
+
+        @param i: The vertex identifier.
+        @type i: C{int}
+        @rtype: C{numpy.ndarray}
+        """
+        return self._vertex_edges[self._vertex_offsets[i]:
+            self._vertex_offsets[i + 1]]
+
+    def _incident_ids(self, v, forward=True):
+        """\
+        Return the identifiers of the edges incident on a vertex, following
+        the semantics of L{Hypergraph.incident}.
+
+        @param v: The vertex.
+        @type v: C{object}
+        @param forward: Direction of incidence.
+        @type forward: C{bool}
+        @rtype: C{numpy.ndarray}
+        """
+        try:
+            i = self._vertex_index[v]
+        except KeyError:
+            return self._vertex_edges[:0]
+        edges = self.containing(i)
+        if not self._directed:
+            return edges
+        elif forward:
+            return edges[self._heads[edges] == i]
+        else:
+            return edges[self._heads[edges] != i]
+
+    def arcs(self, i, reverse=False):
+        """\
+        Return the vertices reachable from a vertex over a single edge (the
+        other members of each edge containing it, or, in a directed
+        hypergraph, the head of each edge of which it is a tail vertex), with
+        the edge of each. In reverse, return the vertices from which the
+        vertex is reachable instead. No L{Edge} objects are built.
+
+        @param i: The vertex identifier.
+        @type i: C{int}
+        @param reverse: Follow edges backward.
+        @type reverse: C{bool}
+        @return: The edge identifiers and vertex identifiers.
+        @rtype: C{numpy.ndarray}, C{numpy.ndarray}
+        """
+        edges = self.containing(i)
+        if self._directed:
+            if not reverse:
+                edges = edges[self._heads[edges] != i]
+                return edges, self._heads[edges]
+            edges = edges[self._heads[edges] == i]
+        sizes = self._edge_offsets[edges + 1] - self._edge_offsets[edges]
+        entries = numpy.arange(sizes.sum()) + numpy.repeat(
+            self._edge_offsets[edges] - (numpy.cumsum(sizes) - sizes), sizes)
+        members = self._edge_members[entries]
+        edges = numpy.repeat(edges, sizes)
+        other = members != i
+        return edges[other], members[other]
+
+    @property
+    def vertices(self):
+        """\
+        Vertex set of the hypergraph.
+
+        @rtype: C{frozenset}
+        """
+        if self._vertex_set is None:
+            self._vertex_set = frozenset(self._vertex_list)
+        return self._vertex_set
+
+    @property
+    def edges(self):
+        """\
+        Edge set of the hypergraph.
+
+        @rtype: C{frozenset}
+        """
+        if self._edge_set is None:
+            self._edge_set = frozenset(self._edge_objects())
+        return self._edge_set
+
+    @property
+    def weights(self):
+        """\
+        Weight relation of the hypergraph (read-only).
+
+        @rtype: C{dict}
+        """
+        if self._weight_dict is None:
+            self._weight_dict = dict(zip(self._edge_objects(),
+                self._edge_weights.tolist()))
+        return self._weight_dict
+
+    def uniform(self, k=None):
+        """\
+        Return whether this is a k-uniform hypergraph.
+
+        @param k: The value of k (optional).
+        @type k: C{int}
+        @return: Uniformity.
+        @rtype: C{bool}
+        """
+        sizes = numpy.diff(self._edge_offsets)
+        if not len(sizes):
+            return True
+        if k is None:
+            k = sizes[0]
+        return bool(numpy.all(sizes == k))
+
+    def regular(self, d=None):
+        """\
+        Return whether this is a d-regular hypergraph.
+
+        @param d: The value of d (optional).
+        @type d: C{int}
+        @return: Regularity.
+        @rtype: C{bool}
+        """
+        degrees = numpy.bincount(self._edge_members,
+            weights=self._edge_weights[self.entry_edges],
+            minlength=len(self._vertex_list))
+        if d is None:
+            d = degrees[0]
+        return bool(numpy.all(degrees == d))
+
+    def adjacent(self, u, v):
+        """\
+        Return the set of edges containing both of two distinct vertices.
+
+        @param u: The first vertex.
+        @type u: C{object}
+        @param v: The second vertex.
+        @type v: C{object}
+        @rtype: C{set} of L{Edge}
+        """
+        if u == v or u not in self._vertex_index \
+        or v not in self._vertex_index:
+            return set()
+        edges = self._edge_objects()
+        return set([edges[e] for e in numpy.intersect1d(
+            self.containing(self._vertex_index[u]),
+            self.containing(self._vertex_index[v]))])
+
+    def incident(self, v, forward=True):
+        """\
+        Return a set of edges incident on a vertex (see
+        L{Hypergraph.incident}).
+
+        @param v: The vertex.
+        @type v: C{object}
+        @param forward: Direction of incidence.
+        @type forward: C{bool}
+        @return: A set of incident edges.
+        @rtype: C{set} of L{Edge}
+        """
+        edges = self._edge_objects()
+        return set([edges[e] for e in self._incident_ids(v, forward)])
+
+    def reachable(self, tail, head):
+        """\
+        Return a set of edges which contain the tail vertex and are directed
+        into the head vertex.
+
+        @param tail: The tail vertex.
+        @type tail: C{object}
+        @param head: The head vertex.
+        @type head: C{object}
+        @return: A set of edges from tail to head.
+        @rtype: C{set} of L{Edge}
+        """
+        if not self._directed or head not in self._vertex_index:
+            return self.adjacent(tail, head)
+        ids = self._incident_ids(tail, forward=False)
+        edges = self._edge_objects()
+        return set([edges[e] for e \
+            in ids[self._heads[ids] == self._vertex_index[head]]])
+
+    def neighbors(self, vertex):
+        """\
+        Return the set of vertices which are adjacent (in an undirected
+        hypergraph) or incident (in a directed hypergraph) to a given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The set of vertices adjacent to the vertex.
+        @rtype: C{set}
+        """
+        edges = self._incident_ids(vertex, forward=False)
+        if self._directed:
+            ids = numpy.unique(self._heads[edges])
+        elif len(edges):
+            ids = numpy.unique(numpy.concatenate([self.members(e) \
+                for e in edges]))
+            ids = ids[ids != self._vertex_index[vertex]]
+        else:
+            ids = edges
+        return set([self._vertex_list[i] for i in ids])
+
+    def neighbor_view(self, vertex):
+        """\
+        Return the neighbors of a given vertex as an immutable set.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The set of vertices adjacent to the vertex.
+        @rtype: C{frozenset}
+        """
+        return frozenset(self.neighbors(vertex))
+
+    def degree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) degree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted degree if true.
+        @type weighted: C{bool}
+        @return: Degree of the vertex.
+        @rtype: C{float}
+        """
+        try:
+            edges = self.containing(self._vertex_index[vertex])
+        except KeyError:
+            return weighted and 0.0 or 0
+        if weighted:
+            return float(self._edge_weights[edges].sum())
+        return len(edges)
+
+    def indegree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) indegree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted indegree if true.
+        @type weighted: C{bool}
+        @return: Indegree of the vertex.
+        @rtype: C{float}
+        """
+        if not self._directed:
+            return self.degree(vertex, weighted)
+        edges = self._incident_ids(vertex)
+        if weighted:
+            return float(self._edge_weights[edges].sum())
+        return len(edges)
+
+    def outdegree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) outdegree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted outdegree if true.
+        @type weighted: C{bool}
+        @return: Outdegree of the vertex.
+        @rtype: C{float}
+        """
+        if not self._directed:
+            return self.degree(vertex, weighted)
+        edges = self._incident_ids(vertex, forward=False)
+        if weighted:
+            return float(self._edge_weights[edges].sum())
+        return len(edges)
+
+    def degree_array(self, weighted=True, kind='degree'):
+        """\
+        Return the (weighted) degree, indegree or outdegree of every vertex as
+        an array indexed by vertex identifier.
+
+        @param weighted: Return weighted degrees if true.
+        @type weighted: C{bool}
+        @param kind: One of 'degree', 'indegree' or 'outdegree'.
+        @type kind: C{str}
+        @return: Degree of each vertex.
+        @rtype: C{numpy.ndarray}
+        @raise ValueError: Unknown kind of degree.
+        """
+        try:
+            assert kind in ('degree', 'indegree', 'outdegree')
+        except AssertionError:
+            raise ValueError('unknown kind of degree %s' % kind)
+        n = len(self._vertex_list)
+        weights = self._edge_weights if weighted else None
+        total = numpy.bincount(self._edge_members, minlength=n,
+            weights=(weights[self.entry_edges] if weighted else None))
+        if kind == 'degree' or not self._directed:
+            return total
+        indegree = numpy.bincount(self._heads, weights=weights, minlength=n)
+        return indegree if kind == 'indegree' else total - indegree
+
+    def degrees(self, weighted=True, kind='degree'):
+        """\
+        Return the (weighted) degree, indegree or outdegree of every vertex.
+
+        @param weighted: Return weighted degrees if true.
+        @type weighted: C{bool}
+        @param kind: One of 'degree', 'indegree' or 'outdegree'.
+        @type kind: C{str}
+        @return: Degree of each vertex.
+        @rtype: C{dict}
+        @raise ValueError: Unknown kind of degree.
+        """
+        return dict(zip(self._vertex_list,
+            self.degree_array(weighted, kind).tolist()))
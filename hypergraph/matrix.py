@@ -9,6 +9,8 @@ Hypergraph - matrix functions, algebraic and spectral graph theory.
 
 import numpy
 
+from .frozen import FrozenHypergraph
+
 
 def degree_matrix(H):
     """\
@@ -20,27 +22,24 @@ def degree_matrix(H):
     @return: The degree matrix.
     @rtype: C{numpy.ndarray}
     """
-    return numpy.diag([H.indegree(v) for v in sorted(list(H.vertices))])
+    if isinstance(H, FrozenHypergraph):
+        return numpy.diag(H.degree_array(kind='indegree'))
+    degrees = H.degrees(kind='indegree')
+    return numpy.diag([degrees[v] for v in sorted(degrees)])
 
 
 def adjacency_matrix(H):
     """\
     Return the adjacency matrix of a hypergraph. For directed hypergraphs,
     considers the indegree adjacency (the column index is associated with the
-    head vertex).
+    head vertex). Computed from the CSR arrays of a frozen snapshot.
 
     @param H: The input graph.
     @type H: L{Hypergraph}
     @return: The adjacency matrix.
     @rtype: C{numpy.ndarray}
     """
-    V = sorted(list(H.vertices))
-    adjacency = numpy.zeros((len(V), len(V)))
-    for u in range(len(V)):
-        for v in range(len(V)):
-            adjacency[u][v] = sum([H.weights[edge] \
-                for edge in H.reachable(V[u], V[v])])
-    return adjacency
+    return _frozen_adjacency_matrix(H.freeze())
 
 
 def incidence_matrix(H):
@@ -52,6 +51,8 @@ def incidence_matrix(H):
     @return: The adjacency matrix.
     @rtype: C{numpy.ndarray}
     """
+    if isinstance(H, FrozenHypergraph):
+        return _frozen_incidence_matrix(H)
     V = sorted(list(H.vertices))
     E = sorted(list(H.edges))
     dV = {}
@@ -70,6 +71,51 @@ def incidence_matrix(H):
     return incidence
 
 
+def _frozen_adjacency_matrix(F):
+    """\
+    Return the adjacency matrix of a frozen hypergraph, computed from its CSR
+    arrays.
+
+    @param F: The input frozen hypergraph.
+    @type F: L{FrozenHypergraph}
+    @return: The adjacency matrix.
+    @rtype: C{numpy.ndarray}
+    """
+    n = len(F.vertex_offsets) - 1
+    adjacency = numpy.zeros((n, n))
+    if F.directed:
+        edges = F.entry_edges
+        tail = F.edge_members != F.heads[edges]
+        numpy.add.at(adjacency, (F.edge_members[tail], F.heads[edges[tail]]),
+            F.edge_weights[edges[tail]])
+    else:
+        for e in range(len(F.heads)):
+            members = F.members(e)
+            adjacency[numpy.ix_(members, members)] += F.edge_weights[e]
+        numpy.fill_diagonal(adjacency, 0.0)
+    return adjacency
+
+
+def _frozen_incidence_matrix(F):
+    """\
+    Return the incidence matrix of a frozen hypergraph, with columns in edge
+    identifier order.
+
+    @param F: The input frozen hypergraph.
+    @type F: L{FrozenHypergraph}
+    @return: The incidence matrix.
+    @rtype: C{numpy.ndarray}
+    """
+    edges = F.entry_edges
+    incidence = numpy.zeros((len(F.vertex_offsets) - 1, len(F.heads)))
+    if F.directed:
+        incidence[F.edge_members, edges] = numpy.where(
+            F.edge_members == F.heads[edges], 1, -1)
+    else:
+        incidence[F.edge_members, edges] = 1
+    return incidence
+
+
 def laplacian_matrix(H):
     """\
     Return the Laplacian matrix of a hypergraph.
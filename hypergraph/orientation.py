@@ -8,7 +8,6 @@ Hypergraph - orientation algorithms.
 """
 
 from random import sample
-from copy import copy
 
 from .core import Hypergraph, Edge
 
@@ -24,8 +23,7 @@ def random_orientation(H):
     """
     L = Hypergraph(vertices=H.vertices, directed=True)
     for edge in H.edges:
-        L.add_edge(Edge(edge, head=sample(edge, 1)[0]))
-    L.weights = copy(H.weights)
+        L.add_edge(Edge(edge, head=sample(edge, 1)[0]), weight=H.weights[edge])
     return L
 
 
@@ -109,16 +107,15 @@ def minimum_maximum_weighted_indegree_orientation(H):
     while accepted:
         accepted = False
         vmax = max([(L.indegree(v), v) for v in L.vertices])[1]
-        Emax = set([edge for edge in L.edges if edge.head is vmax])
+        Emax = L.incident(vmax)
         R = set([(v, emax) for v in L.vertices - set([vmax]) \
             for emax in Emax if v in emax])
         while R:
             vertex, edge = R.pop()
-            if L.indegree(vertex) + 1e-4 < L.indegree(vmax) \
-                - H.weights[Edge(edge)]:
+            weight = L.weights[edge]
+            if L.indegree(vertex) + 1e-4 < L.indegree(vmax) - weight:
                 L.remove_edge(edge)
-                L.add_edge(Edge(edge, head=vertex),
-                    weight=H.weights[Edge(edge)])
+                L.add_edge(Edge(edge, head=vertex), weight=weight)
                 accepted = True
                 break
     # search NI
@@ -133,20 +130,16 @@ def minimum_maximum_weighted_indegree_orientation(H):
                 for v2 in V:
                     if v2 is v1:
                         break
-                    for e1 in [edge for edge in L.edges \
-                    if edge.head is v1 and v2 in edge]:
-                        for e2 in [edge for edge in L.edges \
-                        if edge.head is v2 and v1 in edge]:
-                            if max(L.indegree(v1) - H.weights[Edge(e1)] \
-                                + H.weights[Edge(e2)], L.indegree(v2) \
-                                - H.weights[Edge(e2)] + H.weights[Edge(e1)]) \
-                                + 1e-4 < max(L.indegree(v1), L.indegree(v2)):
+                    for e1 in L.reachable(v2, v1):
+                        for e2 in L.reachable(v1, v2):
+                            w1, w2 = L.weights[e1], L.weights[e2]
+                            if max(L.indegree(v1) - w1 + w2, L.indegree(v2) \
+                                - w2 + w1) + 1e-4 \
+                                < max(L.indegree(v1), L.indegree(v2)):
                                 L.remove_edge(e1)
                                 L.remove_edge(e2)
-                                L.add_edge(Edge(e1, head=v2),
-                                    weight=H.weights[Edge(e1)])
-                                L.add_edge(Edge(e2, head=v1),
-                                    weight=H.weights[Edge(e2)])
+                                L.add_edge(Edge(e1, head=v2), weight=w1)
+                                L.add_edge(Edge(e2, head=v1), weight=w2)
                                 accepted = True
                                 raise Break
         except Break:
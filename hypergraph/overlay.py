@@ -0,0 +1,359 @@
+"""\
+Hypergraph - copy-on-write overlays.
+
+@author: Aaron Mavrinac
+@organization: University of Windsor
+@contact: mavrin1@uwindsor.ca
+@license: LGPL-3
+"""
+
+from collections import MutableMapping, MutableSet
+from itertools import chain
+
+_MISSING = object()
+_DELETED = object()
+
+
+class OverlayDict(MutableMapping):
+    """\
+    Dictionary which keeps its changes in a delta over a base dictionary,
+    falling back to the base for unchanged keys. The base is never modified,
+    so that it may be shared by any number of overlays (and by the structure
+    from which they were forked) without being copied.
+    """
+    def __init__(self, base):
+        """\
+        Constructor. Overlaying another overlay shares its base and copies its
+        delta.
+
+        @param base: The base dictionary.
+        @type base: C{dict} or L{OverlayDict}
+        """
+        if type(base) is OverlayDict:
+            self._base = base._base
+            self._delta = dict(base._delta)
+            self._len = base._len
+        else:
+            self._base = base
+            self._delta = {}
+            self._len = len(base)
+
+    def __reduce__(self):
+        """\
+        Pickling support (as a plain dictionary).
+        """
+        return (dict, (self.items(),))
+
+    def __getitem__(self, key):
+        value = self._delta.get(key, _MISSING)
+        if value is _MISSING:
+            return self._base[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._len += 1
+        self._delta[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._base:
+            self._delta[key] = _DELETED
+        else:
+            del self._delta[key]
+        self._len -= 1
+
+    def __contains__(self, key):
+        value = self._delta.get(key, _MISSING)
+        if value is _MISSING:
+            return key in self._base
+        return value is not _DELETED
+
+    def __iter__(self):
+        delta = self._delta
+        for key in self._base:
+            if key not in delta:
+                yield key
+        for key, value in delta.iteritems():
+            if value is not _DELETED:
+                yield key
+
+    def __len__(self):
+        return self._len
+
+    def iteritems(self):
+        delta = self._delta
+        for key, value in self._base.iteritems():
+            if key not in delta:
+                yield key, value
+        for key, value in delta.iteritems():
+            if value is not _DELETED:
+                yield key, value
+
+    def items(self):
+        return list(self.iteritems())
+
+    def get(self, key, default=None):
+        value = self._delta.get(key, _MISSING)
+        if value is _MISSING:
+            return self._base.get(key, default)
+        return default if value is _DELETED else value
+
+    def setdefault(self, key, default=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            self[key] = value = default
+        return value
+
+    def pop(self, key, default=_MISSING):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        del self[key]
+        return value
+
+    def copy(self):
+        """\
+        Return a copy of this dictionary, sharing its base.
+
+        @rtype: L{OverlayDict}
+        """
+        return OverlayDict(self)
+
+    @property
+    def changes(self):
+        """\
+        Number of keys changed from the base.
+
+        @rtype: C{int}
+        """
+        return len(self._delta)
+
+
+class OverlaySet(MutableSet):
+    """\
+    Set which keeps its changes in sets of added and removed elements over a
+    base set, which is never modified, so that it may be shared without being
+    copied. Binary set operations return plain sets.
+    """
+    def __init__(self, base):
+        """\
+        Constructor. Overlaying another overlay shares its base and copies its
+        changes.
+
+        @param base: The base set.
+        @type base: C{set} or L{OverlaySet}
+        """
+        if type(base) is OverlaySet:
+            self._base = base._base
+            self._added = set(base._added)
+            self._removed = set(base._removed)
+        else:
+            self._base = base
+            self._added = set()
+            self._removed = set()
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def __reduce__(self):
+        """\
+        Pickling support (as a plain set).
+        """
+        return (set, (list(self),))
+
+    def __contains__(self, element):
+        return element in self._added \
+            or (element in self._base and element not in self._removed)
+
+    def __iter__(self):
+        removed = self._removed
+        if not removed:
+            return chain(self._base, self._added)
+        return chain((element for element in self._base \
+            if element not in removed), self._added)
+
+    def __len__(self):
+        return len(self._base) - len(self._removed) + len(self._added)
+
+    def __repr__(self):
+        return repr(set(self))
+
+    def add(self, element):
+        if element in self._base:
+            self._removed.discard(element)
+        else:
+            self._added.add(element)
+
+    def discard(self, element):
+        if element in self._base:
+            self._removed.add(element)
+        else:
+            self._added.discard(element)
+
+    def remove(self, element):
+        if element not in self:
+            raise KeyError(element)
+        self.discard(element)
+
+    def update(self, *iterables):
+        for iterable in iterables:
+            for element in iterable:
+                self.add(element)
+
+    def difference_update(self, *iterables):
+        for iterable in iterables:
+            for element in iterable:
+                self.discard(element)
+
+    def issuperset(self, iterable):
+        return all(element in self for element in iterable)
+
+    def issubset(self, iterable):
+        return self <= set(iterable)
+
+    def union(self, *iterables):
+        return set(self).union(*iterables)
+
+    def intersection(self, *iterables):
+        return set(self).intersection(*iterables)
+
+    def difference(self, *iterables):
+        return set(self).difference(*iterables)
+
+    def copy(self):
+        """\
+        Return a copy of this set, sharing its base.
+
+        @rtype: L{OverlaySet}
+        """
+        return OverlaySet(self)
+
+    @property
+    def changes(self):
+        """\
+        Number of elements added to or removed from the base.
+
+        @rtype: C{int}
+        """
+        return len(self._added) + len(self._removed)
+
+
+class OverlayList(object):
+    """\
+    List which keeps its changes in a delta over a base list, which is never
+    modified, so that it may be shared without being copied. Supports
+    indexing by non-negative position, item assignment, appending and
+    iteration.
+    """
+    def __init__(self, base):
+        """\
+        Constructor. Overlaying another overlay shares its base and copies its
+        changes.
+
+        @param base: The base list.
+        @type base: C{list} or L{OverlayList}
+        """
+        if type(base) is OverlayList:
+            self._base = base._base
+            self._delta = dict(base._delta)
+            self._tail = list(base._tail)
+        else:
+            self._base = base
+            self._delta = {}
+            self._tail = []
+
+    def __reduce__(self):
+        """\
+        Pickling support (as a plain list).
+        """
+        return (list, (list(self),))
+
+    def __getitem__(self, i):
+        if i < len(self._base):
+            return self._delta.get(i, self._base[i])
+        return self._tail[i - len(self._base)]
+
+    def __setitem__(self, i, value):
+        if i < len(self._base):
+            self._delta[i] = value
+        else:
+            self._tail[i - len(self._base)] = value
+
+    def __iter__(self):
+        if not self._delta:
+            return chain(self._base, self._tail)
+        delta = self._delta
+        return chain((delta.get(i, value) \
+            for i, value in enumerate(self._base)), self._tail)
+
+    def __len__(self):
+        return len(self._base) + len(self._tail)
+
+    def append(self, value):
+        self._tail.append(value)
+
+    def extend(self, values):
+        self._tail.extend(values)
+
+    @property
+    def changes(self):
+        """\
+        Number of positions changed from or appended to the base.
+
+        @rtype: C{int}
+        """
+        return len(self._delta) + len(self._tail)
+
+
+_OVERLAYS = (OverlayDict, OverlaySet, OverlayList)
+
+
+def fork(structure):
+    """\
+    Return an overlay of a dictionary, set or list (or of another overlay),
+    which can be changed without changing the structure, in time independent
+    of its size.
+
+    @param structure: The structure.
+    @type structure: C{dict}, C{set} or C{list}
+    @return: The overlay.
+    @rtype: L{OverlayDict}, L{OverlaySet} or L{OverlayList}
+    """
+    if type(structure) in (dict, OverlayDict):
+        return OverlayDict(structure)
+    if type(structure) in (set, OverlaySet):
+        return OverlaySet(structure)
+    return OverlayList(structure)
+
+
+def settle(structure, force=False):
+    """\
+    Return a structure as it is, unless it is an overlay whose changes have
+    grown to a quarter of its base, in which case return a plain copy of it,
+    so that the cost of copying is amortized over the changes and lookups do
+    not slow down without bound.
+
+    @param structure: The structure.
+    @type structure: C{object}
+    @param force: Copy any overlay, whatever its changes.
+    @type force: C{bool}
+    @return: The structure or its plain copy.
+    @rtype: C{object}
+    """
+    if type(structure) not in _OVERLAYS:
+        return structure
+    changes = structure.changes
+    if not force and (changes < 64 or changes * 4 < len(structure._base)):
+        return structure
+    if type(structure) is OverlayDict:
+        return dict(structure.iteritems())
+    if type(structure) is OverlaySet:
+        return set(structure)
+    return list(structure)
@@ -7,17 +7,141 @@ Hypergraph - path algorithms.
 @license: LGPL-3
 """
 
-from copy import deepcopy
+from collections import Mapping, OrderedDict, deque
+from heapq import heappush, heappop
+from itertools import count
+from multiprocessing import Pool
 
-from .core import Graph, Edge
-from .search import breadth_first_search
-from .connectivity import connected
+import numpy
 
+from .core import Graph, Hypergraph
+from .frozen import FrozenHypergraph
+from .connectivity import DisjointSet
 
-def dijkstra(G, start):
+
+def _arcs(G, u, reverse=False):
+    """\
+    Generate the vertices reachable from a vertex over a single edge of a
+    2-uniform graph, with the weight of that edge. In reverse, generate the
+    vertices from which the vertex is reachable instead.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @param u: The vertex.
+    @type u: C{object}
+    @param reverse: Follow edges backward.
+    @type reverse: C{bool}
+    """
+    if isinstance(G, FrozenHypergraph):
+        try:
+            edges, vertices = G.arcs(G.vertex_id(u), reverse)
+        except KeyError:
+            return
+        for v, weight in zip(vertices.tolist(),
+                             G.edge_weights[edges].tolist()):
+            yield G.vertex(v), weight
+        return
+    weights = G.weights
+    for edge in G.incident(u, forward=reverse):
+        if G.directed:
+            if reverse:
+                yield iter(edge.tail).next(), weights[edge]
+            else:
+                yield edge.head, weights[edge]
+        else:
+            for v in edge:
+                if v != u:
+                    yield v, weights[edge]
+
+
+def _weight(G, u, v):
+    """\
+    Return the weight of the edge from one vertex to another in a 2-uniform
+    graph.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @param u: The tail vertex.
+    @type u: C{object}
+    @param v: The head vertex.
+    @type v: C{object}
+    @return: The edge weight.
+    @rtype: C{float}
+    @raise KeyError: There is no such edge.
+    """
+    try:
+        return min([G.weights[edge] for edge in G.reachable(u, v)])
+    except ValueError:
+        raise KeyError((u, v))
+
+
+def _nonnegative(G):
+    """\
+    Return whether every edge weight of a graph is nonnegative, reading the
+    weights as one array where the graph stores them so.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @rtype: C{bool}
+    """
+    if isinstance(G, FrozenHypergraph):
+        weights = G.edge_weights
+    elif isinstance(G, Hypergraph):
+        weights = G.edge_table.values('weight')
+    else:
+        weights = numpy.fromiter(G.weights.values(), numpy.float64)
+    return not len(weights) or weights.min() >= 0
+
+
+def _check_nonnegative(G):
+    """\
+    Check that a graph is 2-uniform with nonnegative edge weights, as required
+    by Dijkstra's algorithm and its variants.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @raise ValueError: Graph is not 2-uniform or has negative edge weights.
+    """
+    try:
+        assert G.uniform(2)
+        assert _nonnegative(G)
+    except AssertionError:
+        raise ValueError(('function can only be applied to 2-uniform graphs '
+                          'with nonnegative edge weights'))
+
+
+def _path(prev, start, end):
+    """\
+    Return the path from the start vertex to the end vertex in a shortest path
+    tree given by its "previous" array.
+
+    @param prev: The "previous" array.
+    @type prev: C{dict}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param end: The end vertex.
+    @type end: C{object}
+    @return: The path vertex list, or an empty list if the end vertex is not in
+             the tree.
+    @rtype: C{list}
+    """
+    path = []
+    u = end
+    while u in prev:
+        path.append(u)
+        if prev[u] is None:
+            break
+        u = prev[u]
+    path.reverse()
+    return path if path and path[0] == start else []
+
+
+def dijkstra(G, start, targets=None, cutoff=None):
     """\
     Dijkstra's algorithm for finding the shortest paths from the start vertex to
-    all other vertices in graphs with nonnegative weights.
+    all other vertices in graphs with nonnegative weights, using a binary heap
+    with lazy deletion. The search stops early once every target vertex has
+    been reached, and does not extend paths longer than the cutoff distance.
 
         - E. W. Dijkstra, "A Note on Two Problems in Connexion with Graphs,"
           Numerische Mathematik, vol. 1, pp. 269-271, 1959.
@@ -26,39 +150,191 @@ def dijkstra(G, start):
     @type G: L{Graph}
     @param start: The start vertex.
     @type start: C{object}
-    @return: The "previous" array of Dijkstra's algoritm.
-    @rtype: C{dict}
+    @param targets: The target vertices (optional).
+    @type targets: C{set}
+    @param cutoff: The maximum path length (optional).
+    @type cutoff: C{float}
+    @return: The distance and "previous" arrays of Dijkstra's algorithm, for
+             the vertices reached.
+    @rtype: C{dict}, C{dict}
+    @raise ValueError: Graph is not 2-uniform or has negative edge weights.
+    """
+    _check_nonnegative(G)
+    return _dijkstra(G, start, targets, cutoff)
+
+
+def _dijkstra(G, start, targets=None, cutoff=None):
+    """\
+    Dijkstra's algorithm without checking the graph (see L{dijkstra}).
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param targets: The target vertices (optional).
+    @type targets: C{set}
+    @param cutoff: The maximum path length (optional).
+    @type cutoff: C{float}
+    @return: The distance and "previous" arrays of Dijkstra's algorithm, for
+             the vertices reached.
+    @rtype: C{dict}, C{dict}
+    """
+    targets = set(targets) if targets is not None else None
+    dist = {}
+    prev = {start: None}
+    best = {start: 0.0}
+    order = count()
+    heap = [(0.0, order.next(), start)]
+    while heap:
+        d, _, u = heappop(heap)
+        if u in dist:
+            continue
+        dist[u] = d
+        if targets is not None:
+            targets.discard(u)
+            if not targets:
+                break
+        for vertex, weight in _arcs(G, u):
+            alt = d + weight
+            if vertex in dist or (cutoff is not None and alt > cutoff):
+                continue
+            if alt < best.get(vertex, float('inf')):
+                best[vertex] = alt
+                prev[vertex] = u
+                heappush(heap, (alt, order.next(), vertex))
+    return dist, dict((vertex, prev[vertex]) for vertex in dist)
+
+
+def bidirectional_dijkstra(G, start, end):
+    """\
+    Bidirectional Dijkstra's algorithm for finding the shortest path from the
+    start vertex to the end vertex in graphs with nonnegative weights. Searches
+    forward from the start vertex and backward from the end vertex, expanding
+    the side with the nearer frontier, until the frontiers meet.
+
+        - I. Pohl, "Bi-Directional Search," Machine Intelligence, vol. 6, pp.
+          127-140, 1971.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param end: The end vertex.
+    @type end: C{object}
+    @return: Shortest path vertex list and total distance (an empty list and
+             infinity if the end vertex is unreachable).
+    @rtype: C{list}, C{float}
+    @raise ValueError: Graph is not 2-uniform or has negative edge weights.
+    """
+    _check_nonnegative(G)
+    if start == end:
+        return [start], 0.0
+    inf = float('inf')
+    order = count()
+    dist = ({}, {})
+    best = ({start: 0.0}, {end: 0.0})
+    prev = ({start: None}, {end: None})
+    heap = ([(0.0, order.next(), start)], [(0.0, order.next(), end)])
+    length, meet = inf, None
+    while heap[0] and heap[1]:
+        if heap[0][0][0] + heap[1][0][0] >= length:
+            break
+        side = 0 if heap[0][0][0] <= heap[1][0][0] else 1
+        d, _, u = heappop(heap[side])
+        if u in dist[side]:
+            continue
+        dist[side][u] = d
+        for vertex, weight in _arcs(G, u, reverse=bool(side)):
+            alt = d + weight
+            if vertex in dist[side]:
+                continue
+            if alt < best[side].get(vertex, inf):
+                best[side][vertex] = alt
+                prev[side][vertex] = u
+                heappush(heap[side], (alt, order.next(), vertex))
+            if alt + best[1 - side].get(vertex, inf) < length:
+                length = alt + best[1 - side][vertex]
+                meet = vertex
+    if meet is None:
+        return [], inf
+    path = _path(prev[0], start, meet)
+    u = prev[1][meet]
+    while u is not None:
+        path.append(u)
+        u = prev[1][u]
+    return path, length
+
+
+def astar(G, start, end, heuristic=None):
+    """\
+    A* search for the shortest path from the start vertex to the end vertex in
+    graphs with nonnegative weights, guided by an admissible heuristic (one
+    which never overestimates the distance to the end vertex). Without a
+    heuristic, this is Dijkstra's algorithm with early exit.
+
+        - P. E. Hart, N. J. Nilsson, and B. Raphael, "A Formal Basis for the
+          Heuristic Determination of Minimum Cost Paths," IEEE Trans. on
+          Systems Science and Cybernetics, vol. 4, no. 2, pp. 100-107, 1968.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param end: The end vertex.
+    @type end: C{object}
+    @param heuristic: Estimate of the distance between two vertices
+                      (optional).
+    @type heuristic: C{function}
+    @return: Shortest path vertex list and total distance (an empty list and
+             infinity if the end vertex is unreachable).
+    @rtype: C{list}, C{float}
     @raise ValueError: Graph is not 2-uniform or has negative edge weights.
     """
+    _check_nonnegative(G)
+    if heuristic is None:
+        heuristic = lambda u, v: 0.0
+    order = count()
+    best = {start: 0.0}
+    prev = {start: None}
+    heap = [(heuristic(start, end), order.next(), 0.0, start)]
+    while heap:
+        _, _, d, u = heappop(heap)
+        if d > best[u]:
+            continue
+        if u == end:
+            return _path(prev, start, end), d
+        for vertex, weight in _arcs(G, u):
+            alt = d + weight
+            if alt < best.get(vertex, float('inf')):
+                best[vertex] = alt
+                prev[vertex] = u
+                heappush(heap, (alt + heuristic(vertex, end), order.next(),
+                    alt, vertex))
+    return [], float('inf')
+
+
+def _check_digraph(G):
+    """\
+    Check that a graph is a 2-uniform digraph, as required by the Bellman-Ford
+    algorithm and its variants.
+
+    @param G: The graph.
+    @type G: L{Graph}
+    @raise ValueError: Graph is not 2-uniform or is not directed.
+    """
     try:
+        assert G.directed
         assert G.uniform(2)
-        assert all([weight >= 0 for weight in G.weights.values()])
     except AssertionError:
-        raise ValueError(('function can only be applied to 2-uniform graphs '
-                          'with nonnegative edge weights'))
-    dist = dict.fromkeys(G.vertices, float('inf'))
-    prev = dict.fromkeys(G.vertices, None)
-    Q = set(G.vertices)
-    dist[start] = 0.0
-    while Q:
-        u = None
-        for vertex in Q:
-            if not u or dist[vertex] < dist[u]:
-                u = vertex
-        Q.remove(u)
-        for vertex in G.neighbors(u):
-            alt = dist[u] + G.weights[Edge([u, vertex],
-                head=(vertex if G.directed else None))]
-            if alt < dist[vertex]:
-                dist[vertex] = alt
-                prev[vertex] = u
-    return prev
+        raise ValueError('function can only be applied to 2-uniform digraphs')
 
 
-def bellman_ford(G, start):
+def bellman_ford(G, start, vectorized=False):
     """\
     Bellman-Ford algorithm for finding the shortest paths from the start vertex
-    to all other vertices in directed graphs.
+    to all other vertices in directed graphs. Stops early after a pass which
+    changes no distance. The vectorized mode relaxes every edge at once in each
+    pass, from the arrays of a frozen snapshot of the graph.
 
         - R. Bellman, "On a Routing Problem," Quarterly of Applied Mathematics,
           vol. 16, no. 1, pp. 87-90, 1958.
@@ -70,64 +346,492 @@ def bellman_ford(G, start):
     @type G: L{Graph}
     @param start: The start vertex.
     @type start: C{object}
-    @return:
-    @rtype: C{dict}
+    @param vectorized: Relax edges with NumPy array operations.
+    @type vectorized: C{bool}
+    @return: The distance and "previous" arrays, for the vertices reachable
+             from the start vertex.
+    @rtype: C{dict}, C{dict}
     @raise ValueError: Graph is not 2-uniform or is not directed.
     @raise RuntimeError: Graph contains a negative-weight cycle.
     """
+    _check_digraph(G)
+    if vectorized:
+        return _bellman_ford_arrays(G.freeze(), start)
+    return _bellman_ford(G, start)
+
+
+def _bellman_ford(G, start):
+    """\
+    Bellman-Ford algorithm without checking the graph (see L{bellman_ford}).
+
+    @param G: The directed graph.
+    @type G: L{Graph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @return: The distance and "previous" arrays, for the vertices reachable
+             from the start vertex.
+    @rtype: C{dict}, C{dict}
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
+    if isinstance(G, FrozenHypergraph):
+        tails, heads, weights = _arc_arrays(G)
+        arcs = [(G.vertex(u), G.vertex(v), weight) for u, v, weight \
+            in zip(tails.tolist(), heads.tolist(), weights.tolist())]
+    else:
+        weights = G.weights
+        arcs = [(iter(edge.tail).next(), edge.head, weights[edge]) \
+            for edge in G.edges]
+    dist = {start: 0.0}
+    prev = {start: None}
+    inf = float('inf')
+    for i in range(len(G.vertices)):
+        changed = False
+        for u, v, weight in arcs:
+            if dist.get(u, inf) + weight < dist.get(v, inf):
+                dist[v] = dist[u] + weight
+                prev[v] = u
+                changed = True
+        if not changed:
+            return dist, prev
+    raise RuntimeError('graph contains a negative-weight cycle')
+
+
+def _arc_arrays(F):
+    """\
+    Return the tail vertex, head vertex and weight arrays of the arcs of a
+    frozen 2-uniform graph. Each undirected edge gives an arc in either
+    direction.
+
+    @param F: The frozen graph.
+    @type F: L{FrozenHypergraph}
+    @return: Tail identifiers, head identifiers and weights of the arcs.
+    @rtype: C{numpy.ndarray}, C{numpy.ndarray}, C{numpy.ndarray}
+    """
+    members = F.edge_members.reshape(-1, 2)
+    if F.directed:
+        heads = F.heads
+        tails = numpy.where(members[:, 0] == heads, members[:, 1],
+            members[:, 0])
+        return tails, heads, F.edge_weights
+    return numpy.concatenate((members[:, 0], members[:, 1])), \
+        numpy.concatenate((members[:, 1], members[:, 0])), \
+        numpy.concatenate((F.edge_weights, F.edge_weights))
+
+
+def _relax_arrays(dist, tails, heads, weights):
+    """\
+    Relax all arcs at once in each of up to |V| passes with
+    C{numpy.minimum.at}, stopping after a pass which changes no distance.
+
+    @param dist: The initial distance of each vertex.
+    @type dist: C{numpy.ndarray}
+    @param tails: The tail vertex identifier of each arc.
+    @type tails: C{numpy.ndarray}
+    @param heads: The head vertex identifier of each arc.
+    @type heads: C{numpy.ndarray}
+    @param weights: The weight of each arc.
+    @type weights: C{numpy.ndarray}
+    @return: The distance and "previous" identifier (or -1) of each vertex.
+    @rtype: C{numpy.ndarray}, C{numpy.ndarray}
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
+    prev = numpy.empty(len(dist), dtype=numpy.intp)
+    prev.fill(-1)
+    for i in range(len(dist)):
+        candidate = dist[tails] + weights
+        relaxed = dist.copy()
+        numpy.minimum.at(relaxed, heads, candidate)
+        improved = relaxed < dist
+        if not improved.any():
+            return dist, prev
+        best = improved[heads] & (candidate == relaxed[heads])
+        prev[heads[best]] = tails[best]
+        dist = relaxed
+    raise RuntimeError('graph contains a negative-weight cycle')
+
+
+def _bellman_ford_arrays(F, start):
+    """\
+    Vectorized Bellman-Ford algorithm on a frozen directed graph, relaxing all
+    edges at once in each pass with C{numpy.minimum.at}.
+
+    @param F: The frozen directed graph.
+    @type F: L{FrozenHypergraph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @return: The distance and "previous" arrays, for the vertices reachable
+             from the start vertex.
+    @rtype: C{dict}, C{dict}
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
     try:
-        assert G.directed
-        assert G.uniform(2)
-    except AssertionError:
-        raise ValueError('function can only be applied to 2-uniform digraphs')
-    dist = dict.fromkeys(G.vertices, float('inf'))
-    prev = dict.fromkeys(G.vertices, None)
-    dist[start] = 0.0
-    for i in range(1, len(G.vertices) - 1):
-        for edge in G.edges:
-            u, v = edge.tail.pop(), edge.head
-            if dist[u] + G.weights[edge] < dist[v]:
-                dist[v] = dist[u] + G.weights[edge]
+        s = F.vertex_id(start)
+    except KeyError:
+        return {start: 0.0}, {start: None}
+    tails, heads, weights = _arc_arrays(F)
+    dist = numpy.empty(len(F.vertex_offsets) - 1)
+    dist.fill(numpy.inf)
+    dist[s] = 0.0
+    dist, prev = _relax_arrays(dist, tails, heads, weights)
+    reached = numpy.flatnonzero(dist < numpy.inf).tolist()
+    return dict((F.vertex(i), float(dist[i])) for i in reached), \
+        dict((F.vertex(i), F.vertex(prev[i]) if prev[i] >= 0 else None) \
+        for i in reached)
+
+
+def spfa(G, start):
+    """\
+    Queue-based Bellman-Ford algorithm (the shortest path faster algorithm) for
+    finding the shortest paths from the start vertex to all other vertices in
+    directed graphs. Only edges leaving vertices whose distance has changed
+    are relaxed. A negative-weight cycle is detected when the path to a vertex
+    reaches as many edges as there are vertices.
+
+        - E. F. Moore, "The Shortest Path Through a Maze," Proc. Int. Symp. on
+          the Theory of Switching, pp. 285-292, 1959.
+
+    @param G: The directed graph.
+    @type G: L{Graph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @return: The distance and "previous" arrays, for the vertices reachable
+             from the start vertex.
+    @rtype: C{dict}, C{dict}
+    @raise ValueError: Graph is not 2-uniform or is not directed.
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
+    _check_digraph(G)
+    n = len(G.vertices)
+    dist = {start: 0.0}
+    prev = {start: None}
+    hops = {start: 0}
+    Q = deque([start])
+    waiting = set(Q)
+    inf = float('inf')
+    while Q:
+        u = Q.popleft()
+        waiting.remove(u)
+        for v, weight in _arcs(G, u):
+            if dist[u] + weight < dist.get(v, inf):
+                dist[v] = dist[u] + weight
                 prev[v] = u
-    for edge in G.edges:
-        u, v = edge.tail.pop(), edge.head
-        if dist[u] + G.weights[edge] < dist[v]:
-            raise RuntimeError('graph contains a negative-weight cycle')
-    return prev
+                hops[v] = hops[u] + 1
+                if hops[v] >= n:
+                    raise RuntimeError('graph contains a negative-weight cycle')
+                if v not in waiting:
+                    Q.append(v)
+                    waiting.add(v)
+    return dist, prev
 
 
-def shortest_path(G, start, end):
+def shortest_path(G, start, end, method='dijkstra', heuristic=None):
     """\
     Find the shortest path from the start vertex to the end vertex. Attempt to
-    use Dijkstra's algorithm first, then Bellman-Ford algorithm.
+    use Dijkstra's algorithm first (or one of its point-to-point variants,
+    bidirectional Dijkstra or A* search), then Bellman-Ford algorithm.
 
+    @param G: The graph.
+    @type G: L{Graph}
     @param start: The start vertex.
     @type start: C{object}
     @param end: The end vertex.
     @type end: C{object}
-    @return: Shortest path vertex list and total distance.
+    @param method: One of 'dijkstra', 'bidirectional' or 'astar'.
+    @type method: C{str}
+    @param heuristic: Admissible distance estimate for A* search (optional).
+    @type heuristic: C{function}
+    @return: Shortest path vertex list and total distance (an empty list and
+             infinity if the end vertex is unreachable).
     @rtype: C{list}, C{float}
+    @raise ValueError: Unknown method.
     """
     try:
-        prev = dijkstra(G, start)
+        assert method in ('dijkstra', 'bidirectional', 'astar')
+    except AssertionError:
+        raise ValueError('unknown shortest path method %s' % method)
+    try:
+        if method == 'bidirectional':
+            return bidirectional_dijkstra(G, start, end)
+        elif method == 'astar':
+            return astar(G, start, end, heuristic)
+        dist, prev = dijkstra(G, start, targets=[end])
     except ValueError:
-        prev = bellman_ford(G, start)
-    path = []
-    u = end
-    dist = 0.0
-    while u in prev.keys():
-        path.insert(0, u)
-        if prev[u]:
-            dist += G.weights[Edge([prev[u], u],
-                head=(u if G.directed else None))]
-        u = prev[u]
-    return path, dist
+        dist, prev = bellman_ford(G, start)
+    path = _path(prev, start, end)
+    if not path:
+        return path, float('inf')
+    return path, dist[end]
+
+
+class ShortestPathEngine(object):
+    """\
+    Shortest path query engine for a graph. The graph is validated once, and
+    single-source shortest path trees are kept in a least-recently-used
+    cache, so that queries sharing a start vertex are answered from one tree.
+    Dijkstra's algorithm is used for graphs with nonnegative weights, and the
+    Bellman-Ford algorithm otherwise. If the graph has a version counter (a
+    view takes that of its parent), the cache is cleared and the graph
+    revalidated whenever it changes.
+    """
+    def __init__(self, G, maxsize=128):
+        """\
+        Constructor.
+
+        @param G: The graph.
+        @type G: L{Graph}
+        @param maxsize: The maximum number of cached trees.
+        @type maxsize: C{int}
+        @raise ValueError: Graph is not 2-uniform, or has negative edge
+                           weights and is not directed.
+        """
+        self._graph = G
+        self._maxsize = maxsize
+        self._trees = OrderedDict()
+        self._version = None
+        self._search = None
+        self._hits = 0
+        self._misses = 0
+        self._validate()
 
+    def _validate(self):
+        """\
+        Validate the graph and choose the shortest path algorithm for it, if
+        it has changed since the last validation, clearing the cache.
 
-def floyd_warshall(G):
+        @raise ValueError: Graph is not 2-uniform, or has negative edge
+                           weights and is not directed.
+        """
+        version = getattr(self._graph, 'version', None)
+        if self._search is not None and version == self._version:
+            return
+        self._trees.clear()
+        self._search = None
+        if _nonnegative(self._graph):
+            try:
+                assert self._graph.uniform(2)
+            except AssertionError:
+                raise ValueError(('function can only be applied to 2-uniform '
+                                  'graphs'))
+            self._search = _dijkstra
+        else:
+            _check_digraph(self._graph)
+            self._search = _bellman_ford
+        self._version = version
+
+    @property
+    def graph(self):
+        """\
+        The graph.
+
+        @rtype: L{Graph}
+        """
+        return self._graph
+
+    @property
+    def hits(self):
+        """\
+        Number of trees fetched from the cache.
+
+        @rtype: C{int}
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """\
+        Number of trees computed.
+
+        @rtype: C{int}
+        """
+        return self._misses
+
+    def clear(self):
+        """\
+        Clear the cache and the hit and miss counters.
+        """
+        self._trees.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def tree(self, start):
+        """\
+        Return the shortest path tree from a start vertex.
+
+        @param start: The start vertex.
+        @type start: C{object}
+        @return: The distance and "previous" arrays, for the vertices
+                 reachable from the start vertex.
+        @rtype: C{dict}, C{dict}
+        @raise ValueError: Graph is no longer valid.
+        @raise RuntimeError: Graph contains a negative-weight cycle.
+        """
+        self._validate()
+        try:
+            tree = self._trees.pop(start)
+        except KeyError:
+            self._misses += 1
+            tree = self._search(self._graph, start)
+            if self._maxsize > 0 and len(self._trees) >= self._maxsize:
+                self._trees.popitem(last=False)
+        else:
+            self._hits += 1
+        if self._maxsize > 0:
+            self._trees[start] = tree
+        return tree
+
+    def query(self, start, end):
+        """\
+        Find the shortest path from the start vertex to the end vertex.
+
+        @param start: The start vertex.
+        @type start: C{object}
+        @param end: The end vertex.
+        @type end: C{object}
+        @return: Shortest path vertex list and total distance (an empty list
+                 and infinity if the end vertex is unreachable).
+        @rtype: C{list}, C{float}
+        @raise ValueError: Graph is no longer valid.
+        @raise RuntimeError: Graph contains a negative-weight cycle.
+        """
+        dist, prev = self.tree(start)
+        path = _path(prev, start, end)
+        if not path:
+            return path, float('inf')
+        return path, dist[end]
+
+    def query_many(self, pairs):
+        """\
+        Find the shortest paths between several pairs of vertices, computing
+        or fetching the tree from each distinct start vertex once.
+
+        @param pairs: The (start, end) vertex pairs.
+        @type pairs: C{list} of C{tuple}
+        @return: Shortest path vertex list and total distance for each pair,
+                 in order.
+        @rtype: C{list} of C{tuple}
+        @raise ValueError: Graph is no longer valid.
+        @raise RuntimeError: Graph contains a negative-weight cycle.
+        """
+        groups = OrderedDict()
+        for i, (start, end) in enumerate(pairs):
+            groups.setdefault(start, []).append((i, end))
+        results = [None] * len(pairs)
+        for start, ends in groups.iteritems():
+            dist, prev = self.tree(start)
+            for i, end in ends:
+                path = _path(prev, start, end)
+                results[i] = (path, dist[end]) if path \
+                    else (path, float('inf'))
+        return results
+
+
+def shortest_hyperpaths(H, start, cost='sum'):
+    """\
+    Shortest B-hyperpath (SBT) procedure for finding the shortest hyperpaths
+    from the start vertex to all other vertices in directed hypergraphs with
+    nonnegative weights. An edge is traversed only once every vertex of its
+    tail has been reached; this is tracked by a count of the tail vertices not
+    yet reached for each edge, and vertices are reached in order from a binary
+    heap with lazy deletion. The cost of reaching the head of an edge is its
+    weight plus either the sum ('sum', the traversal cost) or the maximum
+    ('max', the distance) of the costs of its tail vertices.
+
+        - G. Gallo, G. Longo, S. Pallottino, and S. Nguyen, "Directed
+          Hypergraphs and Applications," Discrete Applied Mathematics, vol.
+          42, no. 2-3, pp. 177-201, 1993.
+
+    @param H: The directed hypergraph.
+    @type H: L{Hypergraph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param cost: One of 'sum' or 'max'.
+    @type cost: C{str}
+    @return: The cost and "previous" edge arrays, for the vertices reached.
+    @rtype: C{dict}, C{dict}
+    @raise ValueError: Hypergraph is not directed or has negative edge
+                       weights, or unknown cost function.
+    """
+    try:
+        assert H.directed
+        assert _nonnegative(H)
+    except AssertionError:
+        raise ValueError(('function can only be applied to directed '
+                          'hypergraphs with nonnegative edge weights'))
+    try:
+        assert cost in ('sum', 'max')
+    except AssertionError:
+        raise ValueError('unknown hyperpath cost function %s' % cost)
+    additive = cost == 'sum'
+    weights = H.weights
+    dist = {}
+    prev = {start: None}
+    best = {start: 0.0}
+    waiting = {}
+    tail_cost = {}
+    order = count()
+    heap = [(0.0, order.next(), start)]
+    while heap:
+        d, _, u = heappop(heap)
+        if u in dist:
+            continue
+        dist[u] = d
+        for edge in H.incident(u, forward=False):
+            remaining = waiting.get(edge, len(edge.tail)) - 1
+            waiting[edge] = remaining
+            if additive:
+                tail_cost[edge] = tail_cost.get(edge, 0.0) + d
+            else:
+                tail_cost[edge] = max(tail_cost.get(edge, 0.0), d)
+            if remaining or edge.head in dist:
+                continue
+            alt = weights[edge] + tail_cost[edge]
+            if alt < best.get(edge.head, float('inf')):
+                best[edge.head] = alt
+                prev[edge.head] = edge
+                heappush(heap, (alt, order.next(), edge.head))
+    return dist, dict((vertex, prev[vertex]) for vertex in dist)
+
+
+def shortest_hyperpath(H, start, end, cost='sum'):
+    """\
+    Find the shortest B-hyperpath from the start vertex to the end vertex in a
+    directed hypergraph (see L{shortest_hyperpaths}).
+
+    @param H: The directed hypergraph.
+    @type H: L{Hypergraph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param end: The end vertex.
+    @type end: C{object}
+    @param cost: One of 'sum' or 'max'.
+    @type cost: C{str}
+    @return: Shortest hyperpath edge set and its cost (an empty set and
+             infinity if the end vertex is unreachable).
+    @rtype: C{set} of L{Edge}, C{float}
+    @raise ValueError: Hypergraph is not directed or has negative edge
+                       weights, or unknown cost function.
+    """
+    dist, prev = shortest_hyperpaths(H, start, cost)
+    if end not in dist:
+        return set(), float('inf')
+    path = set()
+    stack = [end]
+    while stack:
+        edge = prev[stack.pop()]
+        if edge is not None and edge not in path:
+            path.add(edge)
+            stack.extend(edge.tail)
+    return path, dist[end]
+
+
+def floyd_warshall(G, dtype=numpy.float64, block=None, predecessors=False,
+                   filename=None):
     """\
     Floyd-Warshall algorithm for finding the shortest path lengths between all
-    pairs of vertices in a graph.
+    pairs of vertices in a graph. The distance matrix is built from the edge
+    arrays of a frozen snapshot of the graph, and each step is a single NumPy
+    operation over the matrix, or, if a block size is given, over one block of
+    rows at a time to stay in cache.
 
         - R. W. Floyd, "Algorithm 97: Shortest Path," Comm. of the ACM, vol. 5,
           no. 6, p. 345, 1962.
@@ -135,84 +839,617 @@ def floyd_warshall(G):
         - S. Warshall, "A Theorem on Boolean Matrices," J. of the ACM, vol. 9,
           no. 1, pp. 11-12, 1962.
 
+        - G. Venkataraman, S. Sahni, and S. Mukhopadhyaya, "A Blocked All-Pairs
+          Shortest-Paths Algorithm," J. of Experimental Algorithmics, vol. 8,
+          2003.
+
     @param G: The input graph.
     @type G: L{Graph}
-    @return: A two-dimensional dictionary of pairwise shortest path lengths.
-    @rtype: C{dict} of C{dict} of C{float}
+    @param dtype: The floating-point type of the distance matrix.
+    @type dtype: C{type}
+    @param block: The block size (optional).
+    @type block: C{int}
+    @param predecessors: Also compute the predecessor matrix.
+    @type predecessors: C{bool}
+    @param filename: File to memory-map the distance matrix to, and (with
+                     '.pred' appended) the predecessor matrix (optional).
+    @type filename: C{str}
+    @return: A two-dimensional mapping of pairwise shortest path lengths.
+    @rtype: L{DistanceTable}
     @raise ValueError: Graph is not 2-uniform.
     """
     try:
         assert G.uniform(2)
     except AssertionError:
         raise ValueError('function can only be applied to 2-uniform graphs')
-    path = {}
-    for u in G.vertices:
-        path[u] = {}
-        for v in G.vertices:
-            if u == v:
-                path[u][v] = 0.0
-                continue
-            try:
-                path[u][v] = G.weights[Edge([u, v],
-                    head=(v if G.directed else None))]
-            except KeyError:
-                path[u][v] = float('inf')
-    for w in G.vertices:
-        for u in G.vertices:
-            for v in G.vertices:
-                path[u][v] = min(path[u][v], path[u][w] + path[w][v])
-    return path
+    F = G.freeze()
+    n = len(F.vertex_offsets) - 1
+    if filename is not None:
+        dist = numpy.memmap(filename, dtype=dtype, mode='w+', shape=(n, n))
+    else:
+        dist = numpy.empty((n, n), dtype=dtype)
+    dist.fill(numpy.inf)
+    tails, heads, weights = _arc_arrays(F)
+    numpy.minimum.at(dist, (tails, heads), weights.astype(dtype))
+    numpy.fill_diagonal(dist, 0.0)
+    pred = None
+    if predecessors:
+        if filename is not None:
+            pred = numpy.memmap(filename + '.pred', dtype=numpy.intp,
+                mode='w+', shape=(n, n))
+        else:
+            pred = numpy.empty((n, n), dtype=numpy.intp)
+        pred[:] = numpy.arange(n)[:, numpy.newaxis]
+        pred[numpy.isinf(dist)] = -1
+        numpy.fill_diagonal(pred, -1)
+    if not block or block >= n:
+        _floyd_warshall_rows(dist, pred, range(n), slice(None))
+    else:
+        for start in range(0, n, block):
+            K = range(start, min(start + block, n))
+            _floyd_warshall_rows(dist, pred, K, slice(start, start + block))
+            for first in range(0, n, block):
+                if first != start:
+                    _floyd_warshall_rows(dist, pred, K,
+                        slice(first, first + block))
+    return DistanceTable([F.vertex(i) for i in range(n)], dist, pred)
+
+
+def _floyd_warshall_rows(dist, pred, K, rows):
+    """\
+    Relax a range of rows of a Floyd-Warshall distance matrix through each of
+    a range of intermediate vertices in turn.
+
+    @param dist: The distance matrix.
+    @type dist: C{numpy.ndarray}
+    @param pred: The predecessor matrix, if any.
+    @type pred: C{numpy.ndarray}
+    @param K: The intermediate vertex identifiers.
+    @type K: C{list} of C{int}
+    @param rows: The rows to relax.
+    @type rows: C{slice}
+    """
+    D = dist[rows]
+    if pred is None:
+        for k in K:
+            numpy.minimum(D, D[:, k, numpy.newaxis] + dist[k], out=D)
+        return
+    P = pred[rows]
+    for k in K:
+        candidate = D[:, k, numpy.newaxis] + dist[k]
+        better = candidate < D
+        numpy.copyto(D, candidate, where=better)
+        numpy.copyto(P, pred[k], where=better)
+
+
+class DistanceTable(Mapping):
+    """\
+    Two-dimensional mapping view of a matrix of pairwise shortest path lengths,
+    indexed by vertex, with optional path reconstruction from a predecessor
+    matrix.
+    """
+    def __init__(self, vertices, matrix, predecessors=None):
+        """\
+        Constructor.
+
+        @param vertices: The vertices, in matrix order.
+        @type vertices: C{list}
+        @param matrix: The distance matrix.
+        @type matrix: C{numpy.ndarray}
+        @param predecessors: The predecessor matrix (optional).
+        @type predecessors: C{numpy.ndarray}
+        """
+        self._vertices = vertices
+        self._index = dict((vertex, i) for i, vertex in enumerate(vertices))
+        self._matrix = matrix
+        self._predecessors = predecessors
+
+    def __getitem__(self, u):
+        return _DistanceRow(self, self._index[u])
+
+    def __iter__(self):
+        return iter(self._vertices)
+
+    def __len__(self):
+        return len(self._vertices)
+
+    @property
+    def vertices(self):
+        """\
+        Vertices in matrix order.
+
+        @rtype: C{list}
+        """
+        return self._vertices
+
+    @property
+    def matrix(self):
+        """\
+        Distance matrix.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._matrix
+
+    @property
+    def predecessors(self):
+        """\
+        Predecessor matrix (the identifier of the vertex before the column
+        vertex on a shortest path from the row vertex, or -1), if computed.
+
+        @rtype: C{numpy.ndarray}
+        """
+        return self._predecessors
+
+    def path(self, u, v):
+        """\
+        Return a shortest path between two vertices.
+
+        @param u: The start vertex.
+        @type u: C{object}
+        @param v: The end vertex.
+        @type v: C{object}
+        @return: The path vertex list, or an empty list if there is no path.
+        @rtype: C{list}
+        @raise ValueError: Predecessors were not computed.
+        """
+        try:
+            assert self._predecessors is not None
+        except AssertionError:
+            raise ValueError('predecessor matrix was not computed')
+        i, j = self._index[u], self._index[v]
+        if i != j and self._predecessors[i, j] < 0:
+            return []
+        path = [j]
+        while j != i:
+            j = self._predecessors[i, j]
+            path.append(j)
+        return [self._vertices[j] for j in reversed(path)]
+
+
+class _DistanceRow(Mapping):
+    """\
+    Mapping view of one row of a L{DistanceTable}.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, v):
+        return float(self._table._matrix[self._row, self._table._index[v]])
+
+    def __iter__(self):
+        return iter(self._table._vertices)
+
+    def __len__(self):
+        return len(self._table._vertices)
+
+
+def _out_arcs(n, tails, heads, weights):
+    """\
+    Arrange arcs by tail vertex in compressed sparse row (CSR) form.
+
+    @param n: The number of vertices.
+    @type n: C{int}
+    @param tails: The tail vertex identifier of each arc.
+    @type tails: C{numpy.ndarray}
+    @param heads: The head vertex identifier of each arc.
+    @type heads: C{numpy.ndarray}
+    @param weights: The weight of each arc.
+    @type weights: C{numpy.ndarray}
+    @return: Offsets into the head and weight lists, one per vertex plus a
+             final sentinel, and the head identifiers and weights of the arcs;
+             and the original index of each arc in CSR order.
+    @rtype: C{tuple} of C{list}, C{numpy.ndarray}
+    """
+    order = numpy.argsort(tails, kind='mergesort')
+    offsets = numpy.zeros(n + 1, dtype=numpy.intp)
+    numpy.cumsum(numpy.bincount(tails, minlength=n), out=offsets[1:])
+    return (offsets.tolist(), heads[order].tolist(),
+        weights[order].tolist()), order
+
+
+def _potentials(n, tails, heads, weights):
+    """\
+    Return vertex potentials which make every arc weight nonnegative, from one
+    vectorized Bellman-Ford pass with every vertex at distance zero, and the
+    reweighted arcs.
+
+    @param n: The number of vertices.
+    @type n: C{int}
+    @param tails: The tail vertex identifier of each arc.
+    @type tails: C{numpy.ndarray}
+    @param heads: The head vertex identifier of each arc.
+    @type heads: C{numpy.ndarray}
+    @param weights: The weight of each arc.
+    @type weights: C{numpy.ndarray}
+    @return: The potential of each vertex and the reweighted arc weights.
+    @rtype: C{numpy.ndarray}, C{numpy.ndarray}
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
+    h = numpy.zeros(n)
+    if len(weights) and weights.min() < 0:
+        h = _relax_arrays(h, tails, heads, weights)[0]
+        weights = numpy.maximum(weights + h[tails] - h[heads], 0.0)
+    return h, weights
 
 
-def shortest_path_subgraph(G):
+def _dijkstra_row(arcs, s):
+    """\
+    Dijkstra's algorithm from one source over CSR arcs with nonnegative
+    weights.
+
+    @param arcs: The CSR offsets, heads and weights of the arcs.
+    @type arcs: C{tuple} of C{list}
+    @param s: The source vertex identifier.
+    @type s: C{int}
+    @return: The source identifier, and the distance and "previous" identifier
+             (or -1) of each vertex.
+    @rtype: C{int}, C{numpy.ndarray}, C{numpy.ndarray}
+    """
+    offsets, heads, weights = arcs
+    n = len(offsets) - 1
+    inf = float('inf')
+    dist = [inf] * n
+    prev = [-1] * n
+    done = [False] * n
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    while heap:
+        d, u = heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        for i in range(offsets[u], offsets[u + 1]):
+            v = heads[i]
+            alt = d + weights[i]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heappush(heap, (alt, v))
+    return s, numpy.array(dist), numpy.array(prev, dtype=numpy.intp)
+
+
+def _strong_arcs(arcs, s):
+    """\
+    Find the strong arcs leaving one source over CSR arcs with nonnegative
+    weights. An arc is strong if no other path to its head is shorter, so
+    Dijkstra's algorithm need not extend paths longer than the heaviest arc
+    leaving the source.
+
+    @param arcs: The CSR offsets, heads and weights of the arcs.
+    @type arcs: C{tuple} of C{list}
+    @param s: The source vertex identifier.
+    @type s: C{int}
+    @return: The source identifier and the CSR positions of its strong arcs.
+    @rtype: C{int}, C{list} of C{int}
+    """
+    offsets, heads, weights = arcs
+    first, last = offsets[s], offsets[s + 1]
+    if first == last:
+        return s, []
+    cutoff = max(weights[first:last])
+    inf = float('inf')
+    dist = {s: 0.0}
+    done = set()
+    heap = [(0.0, s)]
+    while heap:
+        d, u = heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        for i in range(offsets[u], offsets[u + 1]):
+            v = heads[i]
+            alt = d + weights[i]
+            if alt <= cutoff and alt < dist.get(v, inf):
+                dist[v] = alt
+                heappush(heap, (alt, v))
+    return s, [i for i in range(first, last) \
+        if weights[i] - dist[heads[i]] <= 1e-9 * max(1.0, weights[i])]
+
+
+_worker_arcs = None
+
+
+def _init_worker(arcs):
+    """\
+    Store the CSR arcs in a worker process.
+
+    @param arcs: The CSR offsets, heads and weights of the arcs.
+    @type arcs: C{tuple} of C{list}
+    """
+    global _worker_arcs
+    _worker_arcs = arcs
+
+
+def _run_worker(job):
+    """\
+    Run a single-source function on the stored CSR arcs in a worker process.
+
+    @param job: The function and the source vertex identifier.
+    @type job: C{tuple}
+    @return: The result of the function.
+    @rtype: C{tuple}
+    """
+    function, s = job
+    return function(_worker_arcs, s)
+
+
+def _each_source(arcs, function, workers=None):
+    """\
+    Generate the results of a single-source function over CSR arcs from every
+    vertex, in no particular order. With more than one worker, the sources are
+    spread over a pool of processes; the arcs are sent to each worker once,
+    and each result comes back as soon as it is ready.
+
+    @param arcs: The CSR offsets, heads and weights of the arcs.
+    @type arcs: C{tuple} of C{list}
+    @param function: The single-source function of (arcs, source).
+    @type function: C{function}
+    @param workers: The number of worker processes (optional).
+    @type workers: C{int}
+    """
+    n = len(arcs[0]) - 1
+    if workers is None or workers < 2:
+        for s in range(n):
+            yield function(arcs, s)
+        return
+    pool = Pool(workers, _init_worker, (arcs,))
+    try:
+        for result in pool.imap_unordered(_run_worker,
+                [(function, s) for s in range(n)],
+                max(1, n // (4 * workers))):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def johnson(G, workers=None, predecessors=False):
+    """\
+    Johnson's algorithm for finding the shortest path lengths between all
+    pairs of vertices in a sparse graph. Edges are reweighted to be
+    nonnegative by vertex potentials from one vectorized Bellman-Ford pass,
+    then Dijkstra's algorithm is run from every vertex, optionally across a
+    pool of worker processes. The arcs are sent to each worker once, and the
+    distances come back one row at a time.
+
+        - D. B. Johnson, "Efficient Algorithms for Shortest Paths in Sparse
+          Networks," J. of the ACM, vol. 24, no. 1, pp. 1-13, 1977.
+
+    @param G: The input graph.
+    @type G: L{Graph}
+    @param workers: The number of worker processes (optional).
+    @type workers: C{int}
+    @param predecessors: Also compute the predecessor matrix.
+    @type predecessors: C{bool}
+    @return: A two-dimensional mapping of pairwise shortest path lengths.
+    @rtype: L{DistanceTable}
+    @raise ValueError: Graph is not 2-uniform.
+    @raise RuntimeError: Graph contains a negative-weight cycle.
+    """
+    try:
+        assert G.uniform(2)
+    except AssertionError:
+        raise ValueError('function can only be applied to 2-uniform graphs')
+    F = G.freeze()
+    n = len(F.vertex_offsets) - 1
+    tails, heads, weights = _arc_arrays(F)
+    h, weights = _potentials(n, tails, heads, weights)
+    arcs = _out_arcs(n, tails, heads, weights)[0]
+    dist = numpy.empty((n, n))
+    pred = numpy.empty((n, n), dtype=numpy.intp) if predecessors else None
+    for s, row, prev in _each_source(arcs, _dijkstra_row, workers):
+        dist[s] = row - h[s] + h
+        if pred is not None:
+            pred[s] = prev
+    return DistanceTable([F.vertex(i) for i in range(n)], dist, pred)
+
+
+def shortest_path_subgraph(G, method='dijkstra', workers=None):
     """\
     Return the shortest path subgraph of a graph, which contains only strong
     edges (edges which form part of a shortest path between some pair of
-    vertices).
+    vertices). An edge is strong exactly when it is itself a shortest path
+    between its ends, so by default a Dijkstra search bounded by the heaviest
+    edge leaving each vertex suffices (after reweighting, if some weights are
+    negative), optionally across a pool of worker processes. The all-pairs
+    methods instead compare each edge against a full distance table, within
+    the same relative tolerance for rounding.
 
     @param G: The input graph.
     @type G: L{Graph}
+    @param method: One of 'dijkstra', 'floyd_warshall' or 'johnson'.
+    @type method: C{str}
+    @param workers: The number of worker processes (optional).
+    @type workers: C{int}
     @return: The shortest path subgraph.
-    @rtype: L{Graph}
+    @rtype: L{EdgeSubsetView}
+    @raise ValueError: Graph is not 2-uniform, or unknown method.
+    @raise RuntimeError: Graph contains a negative-weight cycle.
     """
-    S = deepcopy(G)
-    path = floyd_warshall(S)
-    for edge in S.edges:
-        if S.weights[edge] > path[edge.tail.pop()][edge.head]:
-            S.remove_edge(edge)
-    return S
+    try:
+        assert method in ('dijkstra', 'floyd_warshall', 'johnson')
+    except AssertionError:
+        raise ValueError('unknown shortest path subgraph method %s' % method)
+    try:
+        assert G.uniform(2)
+    except AssertionError:
+        raise ValueError('function can only be applied to 2-uniform graphs')
+    F = G.freeze()
+    n = len(F.vertex_offsets) - 1
+    tails, heads, weights = _arc_arrays(F)
+    if method == 'dijkstra':
+        arcs, order = _out_arcs(n, tails, heads,
+            _potentials(n, tails, heads, weights)[1])
+        strong = numpy.zeros(len(weights), dtype=bool)
+        for s, found in _each_source(arcs, _strong_arcs, workers):
+            strong[order[found]] = True
+    else:
+        if method == 'johnson':
+            path = johnson(G, workers=workers).matrix
+        else:
+            path = floyd_warshall(G).matrix
+        strong = weights - path[tails, heads] \
+            <= 1e-9 * numpy.maximum(1.0, numpy.abs(weights))
+    m = len(F.heads)
+    return G.edge_subgraph(set([F.edge(e) \
+        for e in (numpy.flatnonzero(strong) % m).tolist()]))
 
 
-def minimum_spanning_tree(G):
+def _kruskal(F):
     """\
-    Return the minimum spanning tree of a graph via Kruskal's algorithm.
+    Kruskal's algorithm on a frozen undirected graph, using a disjoint-set
+    forest and stopping once the edges accepted span every vertex.
+
+    @param F: The frozen undirected graph.
+    @type F: L{FrozenHypergraph}
+    @return: The identifiers of the spanning forest edges.
+    @rtype: C{list} of C{int}
+    """
+    n = len(F.vertex_offsets) - 1
+    members = F.edge_members.reshape(-1, 2).tolist()
+    forest = []
+    S = DisjointSet(range(n))
+    for e in numpy.argsort(F.edge_weights, kind='mergesort').tolist():
+        if S.union(*members[e]):
+            forest.append(e)
+            if len(forest) == n - 1:
+                break
+    return forest
+
+
+def _prim(F):
+    """\
+    Prim's algorithm on a frozen undirected graph, using a binary heap with
+    lazy deletion, restarted from an unreached vertex in each component.
+
+    @param F: The frozen undirected graph.
+    @type F: L{FrozenHypergraph}
+    @return: The identifiers of the spanning forest edges.
+    @rtype: C{list} of C{int}
+    """
+    n = len(F.vertex_offsets) - 1
+    offsets = F.vertex_offsets.tolist()
+    containing = F.vertex_edges.tolist()
+    ends = F.edge_members.reshape(-1, 2).sum(axis=1).tolist()
+    weights = F.edge_weights.tolist()
+    reached = [False] * n
+    forest = []
+    for root in range(n):
+        if reached[root]:
+            continue
+        heap = [(0.0, -1, root)]
+        while heap:
+            _, e, u = heappop(heap)
+            if reached[u]:
+                continue
+            reached[u] = True
+            if e >= 0:
+                forest.append(e)
+            for e in containing[offsets[u]:offsets[u + 1]]:
+                if not reached[ends[e] - u]:
+                    heappush(heap, (weights[e], e, ends[e] - u))
+    return forest
+
+
+def _boruvka(F):
+    """\
+    Boruvka's algorithm on a frozen undirected graph. In each round, the
+    lightest edge leaving every component is found for all components at once
+    by one scan over the edge arrays, and the components are merged along
+    these edges.
+
+    @param F: The frozen undirected graph.
+    @type F: L{FrozenHypergraph}
+    @return: The identifiers of the spanning forest edges.
+    @rtype: C{list} of C{int}
+    """
+    n = len(F.vertex_offsets) - 1
+    members = F.edge_members.reshape(-1, 2)
+    ordered = numpy.argsort(F.edge_weights, kind='mergesort')
+    m = len(ordered)
+    rank = numpy.empty(m, dtype=numpy.intp)
+    rank[ordered] = numpy.arange(m)
+    labels = numpy.arange(n)
+    edges = numpy.arange(m)
+    forest = []
+    S = DisjointSet(range(n))
+    while True:
+        u, v = labels[members[edges, 0]], labels[members[edges, 1]]
+        crossing = u != v
+        edges, u, v = edges[crossing], u[crossing], v[crossing]
+        if not len(edges):
+            break
+        lightest = numpy.empty(n, dtype=numpy.intp)
+        lightest.fill(m)
+        numpy.minimum.at(lightest, u, rank[edges])
+        numpy.minimum.at(lightest, v, rank[edges])
+        for e in ordered[numpy.unique(lightest[lightest < m])].tolist():
+            if S.union(*members[e].tolist()):
+                forest.append(e)
+        labels = numpy.array([S.find(i) for i in range(n)])
+    return forest
+
+
+def minimum_spanning_forest(G, method='kruskal'):
+    """\
+    Return the minimum spanning forest of a graph, which contains a minimum
+    spanning tree of each connected component, via Kruskal's, Prim's or
+    Boruvka's algorithm. Edges of equal weight are taken in the same order by
+    each method, so all give the same forest.
 
         - J. B. Kruskal, "On the Shortest Spanning Subtree of a Graph and the
           Traveling Salesman Problem," Proc. American Mathematical Soc., vol. 7,
           pp. 48-50, 1956.
 
+        - R. C. Prim, "Shortest Connection Networks and Some Generalizations,"
+          Bell System Technical J., vol. 36, no. 6, pp. 1389-1401, 1957.
+
+        - O. Boruvka, "O Jistem Problemu Minimalnim," Prace Moravske
+          Prirodovedecke Spolecnosti, vol. 3, pp. 37-58, 1926.
+
     @param G: The input undirected graph.
     @type G: L{Graph}
-    @return: The shortest path subgraph.
+    @param method: One of 'kruskal', 'prim' or 'boruvka'.
+    @type method: C{str}
+    @return: The minimum spanning forest.
     @rtype: L{Graph}
-    @raise ValueError: Graph is not 2-uniform or is directed.
+    @raise ValueError: Graph is not 2-uniform or is directed, or unknown method.
     """
     try:
         assert not G.directed
         assert G.uniform(2)
     except AssertionError:
-        raise ValueError(('function can only be applied to 2-uniform'
+        raise ValueError(('function can only be applied to 2-uniform '
                          'undirected graphs'))
-    ebw = sorted(G.edges, key=G.weights.__getitem__)
-    MST = Graph(vertices=G.vertices)
-    while ebw and not connected(MST):
-        edge = ebw.pop(0)
-        u, v = tuple(edge)
-        path = False
-        for w in breadth_first_search(MST, u):
-            if w == v:
-                path = True
-                break
-        if not path:
-            MST.add_edge(edge, weight=G.weights[edge])
-    return MST
+    try:
+        engine = {'kruskal': _kruskal, 'prim': _prim,
+            'boruvka': _boruvka}[method]
+    except KeyError:
+        raise ValueError('unknown spanning tree method %s' % method)
+    F = G.freeze()
+    forest = engine(F)
+    MSF = Graph(vertices=G.vertices)
+    MSF.add_edges([F.edge(e) for e in forest],
+        weights=F.edge_weights[numpy.array(forest, dtype=numpy.intp)])
+    return MSF
+
+
+def minimum_spanning_tree(G, method='kruskal'):
+    """\
+    Return the minimum spanning tree of a graph (see L{minimum_spanning_forest}).
+    If the graph is not connected, this is the minimum spanning forest.
+
+    @param G: The input undirected graph.
+    @type G: L{Graph}
+    @param method: One of 'kruskal', 'prim' or 'boruvka'.
+    @type method: C{str}
+    @return: The minimum spanning tree.
+    @rtype: L{Graph}
+    @raise ValueError: Graph is not 2-uniform or is directed, or unknown method.
+    """
+    return minimum_spanning_forest(G, method)
@@ -7,6 +7,103 @@ Hypergraph - search algorithms.
 @license: LGPL-3
 """
 
+import numpy
+
+from .frozen import FrozenHypergraph
+
+
+def _successors(H, v):
+    """\
+    Generate the vertices reachable from a vertex over a single edge, from the
+    incidence index, with that edge. In a directed hypergraph, these are the
+    heads of the edges of which the vertex is a tail vertex.
+
+    @param H: The hypergraph.
+    @type H: L{Hypergraph}
+    @param v: The vertex.
+    @type v: C{object}
+    """
+    if H.directed:
+        for edge in H.incident(v, forward=False):
+            yield edge, edge.head
+    else:
+        for edge in H.incident(v):
+            for w in edge:
+                if w != v:
+                    yield edge, w
+
+
+def _successor_ids(F, v):
+    """\
+    Generate the vertices reachable from a vertex of a frozen hypergraph over
+    a single edge, from the CSR incidence, with the identifier of that edge,
+    without building L{Edge} objects.
+
+    @param F: The frozen hypergraph.
+    @type F: L{FrozenHypergraph}
+    @param v: The vertex.
+    @type v: C{object}
+    """
+    try:
+        edges, vertices = F.arcs(F.vertex_id(v))
+    except KeyError:
+        return
+    vertex = F.vertex
+    for e, w in zip(edges.tolist(), vertices.tolist()):
+        yield e, vertex(w)
+
+
+def _successor_function(H):
+    """\
+    Return the successor generator for a hypergraph, and a function mapping
+    the edge token it yields to the edge (None if the token is the edge).
+
+    @param H: The hypergraph.
+    @type H: L{Hypergraph}
+    @rtype: C{function}, C{function}
+    """
+    if isinstance(H, FrozenHypergraph):
+        return _successor_ids, H.edge
+    return _successors, None
+
+
+def _frontiers(H, starts, parent, max_depth=None):
+    """\
+    Breadth-first search generator over whole levels. Yields the list of
+    vertices first reached at each depth, recording the edge over which each
+    was reached in the parent array before it is yielded. The next level is
+    only expanded when requested.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param starts: The start vertices.
+    @type starts: C{object}
+    @param parent: The parent edge array to fill (None for start vertices).
+    @type parent: C{dict}
+    @param max_depth: The maximum depth (optional).
+    @type max_depth: C{int}
+    """
+    successors, edge_of = _successor_function(H)
+    frontier = []
+    for v in starts:
+        if v not in parent:
+            parent[v] = None
+            frontier.append(v)
+    depth = 0
+    while frontier:
+        yield frontier
+        if max_depth is not None and depth >= max_depth:
+            return
+        depth += 1
+        reached = []
+        for v in frontier:
+            for edge, w in successors(H, v):
+                if w not in parent:
+                    parent[w] = edge_of(edge) if edge_of else edge
+                    reached.append(w)
+        frontier = reached
+
+
 def breadth_first_search(H, start):
     """\
     Breadth-first search generator. Yields vertices as they are reached.
@@ -16,40 +113,453 @@ def breadth_first_search(H, start):
     @param start: The start vertex.
     @type start: C{object}
     """
-    yield start
-    marked = set([start])
-    Q = [start]
-    while Q:
-        v = Q.pop(0)
-        for edge in H.incident(v, forward=False):
-            for w in ([edge.head] if H.directed else edge):
-                if not w in marked:
-                    marked.add(w)
-                    Q.append(w)
-                    yield w
+    for level in _frontiers(H, [start], {}):
+        for v in level:
+            yield v
+
+
+def breadth_first_levels(H, starts, max_depth=None):
+    """\
+    Breadth-first search generator over levels. Yields the list of vertices
+    first reached at each depth from any of the start vertices.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param starts: The start vertices.
+    @type starts: C{object}
+    @param max_depth: The maximum depth (optional).
+    @type max_depth: C{int}
+    """
+    return _frontiers(H, starts, {}, max_depth)
+
+
+def breadth_first_tree(H, starts, targets=None, max_depth=None):
+    """\
+    Return the hop distances and breadth-first search tree from a set of start
+    vertices. The search stops at the level where every target vertex has been
+    reached, and does not go deeper than the maximum depth.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param starts: The start vertices.
+    @type starts: C{object}
+    @param targets: The target vertices (optional).
+    @type targets: C{set}
+    @param max_depth: The maximum depth (optional).
+    @type max_depth: C{int}
+    @return: The hop distance and parent edge (None for start vertices) of
+             each vertex reached.
+    @rtype: C{dict}, C{dict}
+    """
+    targets = set(targets) if targets is not None else None
+    dist = {}
+    parent = {}
+    for depth, level in enumerate(_frontiers(H, starts, parent, max_depth)):
+        for v in level:
+            dist[v] = depth
+        if targets is not None:
+            targets.difference_update(level)
+            if not targets:
+                break
+    return dist, parent
+
+
+def _depth_first(H, start, parent):
+    """\
+    Iterative depth-first search generator, using an explicit stack of
+    successor iterators. Yields ('pre', vertex) when a vertex is reached and
+    ('post', vertex) when all of its successors have been searched, recording
+    the edge over which each vertex was reached in the parent array.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param start: The start vertex.
+    @type start: C{object}
+    @param parent: The parent edge array to fill (None for the start vertex).
+    @type parent: C{dict}
+    """
+    successors, edge_of = _successor_function(H)
+    parent[start] = None
+    yield 'pre', start
+    stack = [(start, successors(H, start))]
+    while stack:
+        v, remaining = stack[-1]
+        for edge, w in remaining:
+            if w not in parent:
+                parent[w] = edge_of(edge) if edge_of else edge
+                yield 'pre', w
+                stack.append((w, successors(H, w)))
+                break
+        else:
+            stack.pop()
+            yield 'post', v
 
 
 def depth_first_search(H, start, marked=None):
     """\
-    Depth-first search generator. Yields vertices as they are reached, along
-    with the path over which each was reached (a list of tuples containing the
-    next edge in the path and the destination vertex).
+    Depth-first search generator. Yields vertices as they are reached.
 
     @param H: The input hypergraph.
     @type H: L{Hypergraph}
-    @param marked: The initial set of marked vertices (for internal use).
+    @param start: The start vertex.
+    @type start: C{object}
+    @param marked: Vertices to treat as already reached (optional).
     @type marked: C{set}
+    """
+    parent = dict.fromkeys(marked or [])
+    if start in parent:
+        return
+    for event, v in _depth_first(H, start, parent):
+        if event == 'pre':
+            yield v
+
+
+def depth_first_events(H, start):
+    """\
+    Depth-first search event generator. Yields ('pre', vertex, edge) when a
+    vertex is reached over an edge (None for the start vertex), and ('post',
+    vertex, edge) when all of its successors have been searched.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
     @param start: The start vertex.
     @type start: C{object}
     """
-    if marked is None:
-        yield start
-        marked = set()
-    marked.add(start)
-    for edge in H.incident(start, forward=False):
-        if not edge in marked:
-            for w in ([edge.head] if H.directed else edge):
-                if not w in marked:
-                    yield w
-                    for y in depth_first_search(H, w, marked=marked):
-                        yield y
+    parent = {}
+    for event, v in _depth_first(H, start, parent):
+        yield event, v, parent[v]
+
+
+def depth_first_tree(H, starts=None):
+    """\
+    Return the discovery and finish times and depth-first search forest from a
+    sequence of start vertices, each searched in turn if not already reached.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param starts: The start vertices (optional, all vertices by default).
+    @type starts: C{object}
+    @return: The discovery time, finish time and parent edge (None for the
+             roots) of each vertex reached.
+    @rtype: C{dict}, C{dict}, C{dict}
+    """
+    discovery = {}
+    finish = {}
+    parent = {}
+    time = 0
+    for start in (starts if starts is not None else H.vertices):
+        if start in parent:
+            continue
+        for event, v in _depth_first(H, start, parent):
+            if event == 'pre':
+                discovery[v] = time
+            else:
+                finish[v] = time
+            time += 1
+    return discovery, finish, parent
+
+
+def _segment_or(values, offsets):
+    """\
+    Return the bitwise OR of the rows of each segment of a bitset array.
+
+    @param values: The bitset rows.
+    @type values: C{numpy.ndarray}
+    @param offsets: Offsets of the segments, plus a final sentinel.
+    @type offsets: C{numpy.ndarray}
+    @return: The OR of each segment (zero for empty segments).
+    @rtype: C{numpy.ndarray}
+    """
+    result = numpy.zeros((len(offsets) - 1, values.shape[1]),
+        dtype=values.dtype)
+    nonempty = numpy.flatnonzero(numpy.diff(offsets))
+    if len(nonempty):
+        result[nonempty] = numpy.bitwise_or.reduceat(values,
+            offsets[nonempty], axis=0)
+    return result
+
+
+def _segments(offsets, ids):
+    """\
+    Return the positions of the CSR segments with the given identifiers, in
+    order, and the length of each segment.
+
+    @param offsets: The CSR offsets, plus a final sentinel.
+    @type offsets: C{numpy.ndarray}
+    @param ids: The segment identifiers.
+    @type ids: C{numpy.ndarray}
+    @return: The positions and the segment lengths.
+    @rtype: C{numpy.ndarray}, C{numpy.ndarray}
+    """
+    starts = offsets[ids]
+    lengths = offsets[ids + 1] - starts
+    ends = numpy.cumsum(lengths)
+    return numpy.repeat(starts - ends + lengths, lengths) \
+        + numpy.arange(ends[-1] if len(ends) else 0), lengths
+
+
+def _bit_successors(F):
+    """\
+    Return a function which maps a bitset row for each vertex of a frozen
+    hypergraph to the OR of the rows of the vertices from which each vertex
+    is reachable over a single edge, in two passes over the CSR incidence
+    (members to edges, then edges to vertices).
+
+    A dense pass touches every edge. When the vertices with non-zero rows
+    contain few enough incidences (an eighth of all of them), only the edges
+    containing those vertices are expanded instead, so that sparse frontiers
+    (such as the first and last levels of a search) cost time proportional to
+    the edges they touch.
+
+    @param F: The frozen hypergraph.
+    @type F: L{FrozenHypergraph}
+    @rtype: C{function}
+    """
+    members = F.edge_members
+    edge_offsets = F.edge_offsets
+    vertex_edges = F.vertex_edges
+    vertex_offsets = F.vertex_offsets
+    n = len(vertex_offsets) - 1
+    heads = F.heads if F.directed else None
+    is_head = members == heads[F.entry_edges] if F.directed else None
+    def expand_sparse(bits, active):
+        edges = numpy.unique(vertex_edges[_segments(vertex_offsets,
+            active)[0]])
+        result = numpy.zeros_like(bits)
+        if not len(edges):
+            return result
+        entries, lengths = _segments(edge_offsets, edges)
+        rows = bits[members[entries]]
+        if heads is not None:
+            rows[is_head[entries]] = 0
+        local = numpy.zeros(len(edges), dtype=numpy.intp)
+        numpy.cumsum(lengths[:-1], out=local[1:])
+        reached = numpy.bitwise_or.reduceat(rows, local, axis=0)
+        if heads is not None:
+            targets = heads[edges]
+        else:
+            targets = members[entries]
+            reached = numpy.repeat(reached, lengths, axis=0)
+        order = numpy.argsort(targets, kind='mergesort')
+        targets, reached = targets[order], reached[order]
+        starts = numpy.flatnonzero(numpy.concatenate(([True],
+            targets[1:] != targets[:-1])))
+        result[targets[starts]] = numpy.bitwise_or.reduceat(reached, starts,
+            axis=0)
+        return result
+    if not F.directed:
+        def expand_dense(bits):
+            reached = _segment_or(bits[members], edge_offsets)
+            return _segment_or(reached[vertex_edges], vertex_offsets)
+    else:
+        by_head = numpy.argsort(heads, kind='mergesort')
+        head_offsets = numpy.zeros(n + 1, dtype=numpy.intp)
+        numpy.cumsum(numpy.bincount(heads, minlength=n), out=head_offsets[1:])
+        def expand_dense(bits):
+            tail_bits = bits[members]
+            tail_bits[is_head] = 0
+            reached = _segment_or(tail_bits, edge_offsets)
+            return _segment_or(reached[by_head], head_offsets)
+    def expand(bits):
+        active = numpy.flatnonzero(bits.any(axis=1))
+        if not len(active):
+            return numpy.zeros_like(bits)
+        incidences = (vertex_offsets[active + 1] - vertex_offsets[active]).sum()
+        if incidences * 8 < len(vertex_edges):
+            return expand_sparse(bits, active)
+        return expand_dense(bits)
+    return expand
+
+
+def bit_parallel_search(H, sources, batch=64):
+    """\
+    Multi-source breadth-first search generator over a frozen snapshot of a
+    hypergraph. Sources are searched together in batches, each vertex
+    carrying a bitset of the sources in the batch which have reached it, so
+    that a single traversal serves the whole batch. Yields the batch of
+    sources, the depth, and the bitsets of the vertices first reached at that
+    depth (a C{numpy.uint64} array with a row per vertex identifier, in which
+    source j of the batch is bit j % 64 of word j // 64). Each level takes
+    time linear in the number of vertices, plus the number of edges when the
+    frontier is dense, or only the edges containing it when it is sparse.
+
+        - M. Then, M. Kaufmann, F. Chirigati, T.-A. Hoang-Vu, K. Pham, A.
+          Kemper, T. Neumann, and H. T. Vo, "The More the Merrier: Efficient
+          Multi-Source Graph Traversal," Proc. VLDB Endowment, vol. 8, no. 4,
+          pp. 449-460, 2014.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param sources: The source vertices.
+    @type sources: C{list}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    """
+    F = H.freeze()
+    n = len(F.vertex_offsets) - 1
+    expand = _bit_successors(F)
+    sources = list(sources)
+    for first in range(0, len(sources), batch):
+        group = sources[first:first + batch]
+        frontier = numpy.zeros((n, (len(group) + 63) // 64), dtype='<u8')
+        for j, vertex in enumerate(group):
+            frontier[F.vertex_id(vertex), j // 64] |= \
+                numpy.uint64(1) << numpy.uint64(j % 64)
+        visited = frontier.copy()
+        depth = 0
+        while frontier.any():
+            yield group, depth, frontier
+            frontier = expand(frontier) & ~visited
+            visited |= frontier
+            depth += 1
+
+
+def _source_counts(bits, k):
+    """\
+    Return the number of vertices whose bitsets contain each source.
+
+    @param bits: The bitset rows.
+    @type bits: C{numpy.ndarray}
+    @param k: The number of sources.
+    @type k: C{int}
+    @return: The count for each source.
+    @rtype: C{numpy.ndarray}
+    """
+    columns = numpy.unpackbits(bits.view(numpy.uint8), axis=1).sum(axis=0,
+        dtype=numpy.int64)
+    order = numpy.arange(len(columns))
+    counts = numpy.empty(len(columns), dtype=columns.dtype)
+    counts[order - order % 8 + 7 - order % 8] = columns
+    return counts[:k]
+
+
+def _source_profiles(H, sources, batch=64):
+    """\
+    Generate the number of vertices reached, sum of hop distances and greatest
+    hop distance from each source, from bit-parallel breadth-first search.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param sources: The source vertices.
+    @type sources: C{list}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    """
+    current = None
+    for group, depth, frontier in bit_parallel_search(H, sources, batch):
+        if depth == 0:
+            if current is not None:
+                for profile in zip(current[0], *current[1:]):
+                    yield profile
+            k = len(group)
+            current = (group, numpy.zeros(k, dtype=numpy.int64),
+                numpy.zeros(k, dtype=numpy.int64),
+                numpy.zeros(k, dtype=numpy.int64))
+        counts = _source_counts(frontier, len(group))
+        current[1][:] += counts
+        current[2][:] += depth * counts
+        current[3][counts > 0] = depth
+    if current is not None:
+        for profile in zip(current[0], *current[1:]):
+            yield profile
+
+
+def eccentricity(H, vertices=None, batch=64):
+    """\
+    Return the eccentricity (greatest hop distance to any other vertex) of
+    vertices of a hypergraph, infinite if some vertex is unreachable.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param vertices: The vertices (optional, all vertices by default).
+    @type vertices: C{list}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    @return: The eccentricity of each vertex.
+    @rtype: C{dict}
+    """
+    n = len(H.vertices)
+    if vertices is None:
+        vertices = H.vertices
+    return dict((v, int(farthest) if reached == n else float('inf')) \
+        for v, reached, total, farthest \
+        in _source_profiles(H, vertices, batch))
+
+
+def diameter(H, exact=True, start=None, batch=64):
+    """\
+    Return the diameter (greatest hop distance between any two vertices) of a
+    hypergraph, infinite if it is not strongly connected. The approximate
+    double sweep searches once from the start vertex and once from the vertex
+    farthest from it, giving a lower bound on the diameter of the component.
+
+        - C. Magnien, M. Latapy, and M. Habib, "Fast Computation of Empirically
+          Tight Bounds for the Diameter of Massive Graphs," J. of Experimental
+          Algorithmics, vol. 13, 2009.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param exact: Search from every vertex if true, otherwise double sweep.
+    @type exact: C{bool}
+    @param start: The start vertex of the double sweep (optional).
+    @type start: C{object}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    @return: The diameter, or a lower bound on it.
+    @rtype: C{int}
+    """
+    if exact:
+        return max(eccentricity(H, batch=batch).values() or [0])
+    if start is None:
+        start = iter(H.vertices).next()
+    for level in breadth_first_levels(H, [start]):
+        start = level[0]
+    depth = -1
+    for level in breadth_first_levels(H, [start]):
+        depth += 1
+    return depth
+
+
+def closeness(H, vertices=None, batch=64):
+    """\
+    Return the closeness centrality of vertices of a hypergraph, the number of
+    other vertices reached divided by the sum of hop distances to them (zero
+    if none are reached).
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param vertices: The vertices (optional, all vertices by default).
+    @type vertices: C{list}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    @return: The closeness of each vertex.
+    @rtype: C{dict}
+    """
+    if vertices is None:
+        vertices = H.vertices
+    return dict((v, float(reached - 1) / total if total else 0.0) \
+        for v, reached, total, farthest \
+        in _source_profiles(H, vertices, batch))
+
+
+def hop_histogram(H, sources=None, batch=64):
+    """\
+    Return the number of (source, vertex) pairs at each hop distance.
+
+    @param H: The input hypergraph.
+    @type H: L{Hypergraph}
+    @param sources: The source vertices (optional, all vertices by default).
+    @type sources: C{list}
+    @param batch: The number of sources per traversal.
+    @type batch: C{int}
+    @return: The number of pairs at each distance, indexed by distance.
+    @rtype: C{list} of C{int}
+    """
+    if sources is None:
+        sources = H.vertices
+    histogram = []
+    for group, depth, frontier in bit_parallel_search(H, sources, batch):
+        if depth == len(histogram):
+            histogram.append(0)
+        histogram[depth] += int(_source_counts(frontier, len(group)).sum())
+    return histogram
@@ -0,0 +1,523 @@
+"""\
+Hypergraph - read-only views.
+
+@author: Aaron Mavrinac
+@organization: University of Windsor
+@contact: mavrin1@uwindsor.ca
+@license: LGPL-3
+"""
+
+from collections import Mapping
+
+from .frozen import FrozenHypergraph
+
+
+def _containing(H, v):
+    """\
+    Return the set of edges of a hypergraph which contain a vertex.
+
+    @param H: The hypergraph.
+    @type H: L{Hypergraph}
+    @param v: The vertex.
+    @type v: C{object}
+    @rtype: C{set} of L{Edge}
+    """
+    if H.directed:
+        return H.incident(v) | H.incident(v, forward=False)
+    return H.incident(v)
+
+
+class ViewWeights(Mapping):
+    """\
+    Read-only weight relation of a hypergraph view.
+    """
+    def __init__(self, view, weight):
+        """\
+        Constructor.
+
+        @param view: The view.
+        @type view: L{HypergraphView}
+        @param weight: Function returning the weight of an edge of the view.
+        @type weight: C{function}
+        """
+        self._view = view
+        self._weight = weight
+
+    def __getitem__(self, edge):
+        if not self._view.has_edge(edge):
+            raise KeyError(edge)
+        return self._weight(edge)
+
+    def __contains__(self, edge):
+        return self._view.has_edge(edge)
+
+    def __iter__(self):
+        return iter(self._view.edges)
+
+    def __len__(self):
+        return len(self._view.edges)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class HypergraphView(object):
+    """\
+    Base class for read-only views of a hypergraph. A view presents the query
+    interface of L{Hypergraph} over the storage of its parent, without copying
+    it, and reflects later changes to the parent.
+
+    Subclasses provide the vertex and edge sets, edge membership, the weight of
+    an edge, and the set of edges containing a vertex.
+    """
+    def __init__(self, parent):
+        """\
+        Constructor.
+
+        @param parent: The parent hypergraph.
+        @type parent: L{Hypergraph}
+        """
+        self._parent = parent
+
+    def __repr__(self):
+        """\
+        Canonical string representation.
+
+        @rtype: C{str}
+        """
+        return '%s(vertices=%s, edges=%s, weights=%s, directed=%s)' % \
+            (type(self).__name__, self.vertices, self.edges, self.weights,
+             self.directed)
+
+    @property
+    def parent(self):
+        """\
+        Parent hypergraph of the view.
+
+        @rtype: L{Hypergraph}
+        """
+        return self._parent
+
+    @property
+    def version(self):
+        """\
+        Version of the parent hypergraph (None if it has none), which changes
+        whenever the contents of the view may have changed with it. Changes to
+        the new weights of a L{ReweightedView} are not counted.
+
+        @rtype: C{int}
+        """
+        return getattr(self._parent, 'version', None)
+
+    @property
+    def directed(self):
+        """\
+        Directedness of the hypergraph.
+
+        @rtype: C{bool}
+        """
+        return self._parent.directed
+
+    @property
+    def vertices(self):
+        """\
+        Vertex set of the hypergraph.
+
+        @rtype: C{frozenset}
+        """
+        raise NotImplementedError
+
+    @property
+    def edges(self):
+        """\
+        Edge set of the hypergraph.
+
+        @rtype: C{frozenset}
+        """
+        raise NotImplementedError
+
+    @property
+    def weights(self):
+        """\
+        Weight relation of the hypergraph.
+
+        @rtype: L{ViewWeights}
+        """
+        return ViewWeights(self, self._weight)
+
+    def has_edge(self, edge):
+        """\
+        Return whether an edge is in this view.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @rtype: C{bool}
+        """
+        raise NotImplementedError
+
+    def _weight(self, edge):
+        """\
+        Return the weight of an edge of this view.
+
+        @param edge: The edge.
+        @type edge: L{Edge}
+        @rtype: C{float}
+        """
+        return self._parent.weights[edge]
+
+    def _containing(self, v):
+        """\
+        Return the edges of this view which contain a vertex.
+
+        @param v: The vertex.
+        @type v: C{object}
+        @rtype: C{set} of L{Edge}
+        """
+        raise NotImplementedError
+
+    def freeze(self):
+        """\
+        Return an immutable, integer-indexed snapshot of this view.
+
+        @rtype: L{FrozenHypergraph}
+        """
+        return FrozenHypergraph(self)
+
+    def subgraph(self, vertices):
+        """\
+        Return a view of the subhypergraph induced by a set of vertices.
+
+        @param vertices: The vertex subset.
+        @type vertices: C{set}
+        @rtype: L{SubgraphView}
+        """
+        return SubgraphView(self, vertices)
+
+    def edge_subgraph(self, edges):
+        """\
+        Return a view of the spanning subhypergraph with a subset of edges.
+
+        @param edges: The edge subset.
+        @type edges: C{set}
+        @rtype: L{EdgeSubsetView}
+        """
+        return EdgeSubsetView(self, edges)
+
+    def reweighted(self, weights):
+        """\
+        Return a view of this hypergraph with different edge weights.
+
+        @param weights: New weights keyed by edge, or a function of the edge.
+        @type weights: C{dict} or C{function}
+        @rtype: L{ReweightedView}
+        """
+        return ReweightedView(self, weights)
+
+    def uniform(self, k=None):
+        """\
+        Return whether this is a k-uniform hypergraph.
+
+        @param k: The value of k (optional).
+        @type k: C{int}
+        @return: Uniformity.
+        @rtype: C{bool}
+        """
+        if k is None:
+            k = len(iter(self.edges).next())
+        return all([len(edge) == k for edge in self.edges])
+
+    def regular(self, d=None):
+        """\
+        Return whether this is a d-regular hypergraph.
+
+        @param d: The value of d (optional).
+        @type d: C{int}
+        @return: Regularity.
+        @rtype: C{bool}
+        """
+        if d is None:
+            d = self.degree(iter(self.vertices).next())
+        return all([self.degree(vertex) == d for vertex in self.vertices])
+
+    def adjacent(self, u, v):
+        """\
+        Return the set of edges containing both of two distinct vertices.
+
+        @param u: The first vertex.
+        @type u: C{object}
+        @param v: The second vertex.
+        @type v: C{object}
+        @rtype: C{set} of L{Edge}
+        """
+        if u == v:
+            return set()
+        return set([edge for edge in self._containing(u) if v in edge])
+
+    def incident(self, v, forward=True):
+        """\
+        Return a set of edges incident on a vertex (see
+        L{Hypergraph.incident}).
+
+        @param v: The vertex.
+        @type v: C{object}
+        @param forward: Direction of incidence.
+        @type forward: C{bool}
+        @return: A set of incident edges.
+        @rtype: C{set} of L{Edge}
+        """
+        edges = self._containing(v)
+        if not self.directed:
+            return set(edges)
+        elif forward:
+            return set([edge for edge in edges if edge.head == v])
+        else:
+            return set([edge for edge in edges if edge.head != v])
+
+    def reachable(self, tail, head):
+        """\
+        Return a set of edges which contain the tail vertex and are directed
+        into the head vertex.
+
+        @param tail: The tail vertex.
+        @type tail: C{object}
+        @param head: The head vertex.
+        @type head: C{object}
+        @return: A set of edges from tail to head.
+        @rtype: C{set} of L{Edge}
+        """
+        if self.directed:
+            return set([edge for edge in self._containing(tail) \
+                if edge.head == head and tail != head])
+        return self.adjacent(tail, head)
+
+    def neighbors(self, vertex):
+        """\
+        Return the set of vertices which are adjacent (in an undirected
+        hypergraph) or incident (in a directed hypergraph) to a given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The set of vertices adjacent to the vertex.
+        @rtype: C{set}
+        """
+        if self.directed:
+            return set([edge.head for edge \
+                in self.incident(vertex, forward=False)])
+        neighbors = set()
+        for edge in self._containing(vertex):
+            neighbors.update(edge)
+        neighbors.discard(vertex)
+        return neighbors
+
+    def neighbor_view(self, vertex):
+        """\
+        Return the neighbors of a given vertex as an immutable set.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @return: The set of vertices adjacent to the vertex.
+        @rtype: C{frozenset}
+        """
+        return frozenset(self.neighbors(vertex))
+
+    def _sum(self, edges, weighted):
+        """\
+        Return the (weighted) number of edges in a collection.
+
+        @param edges: The edges.
+        @type edges: C{set} of L{Edge}
+        @param weighted: Sum the weights of the edges if true.
+        @type weighted: C{bool}
+        @rtype: C{float}
+        """
+        if weighted:
+            return sum([self._weight(edge) for edge in edges], 0.0)
+        return len(edges)
+
+    def degree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) degree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted degree if true.
+        @type weighted: C{bool}
+        @return: Degree of the vertex.
+        @rtype: C{float}
+        """
+        return self._sum(self._containing(vertex), weighted)
+
+    def indegree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) indegree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted indegree if true.
+        @type weighted: C{bool}
+        @return: Indegree of the vertex.
+        @rtype: C{float}
+        """
+        return self._sum(self.incident(vertex), weighted)
+
+    def outdegree(self, vertex, weighted=True):
+        """\
+        Return the (weighted) outdegree of the given vertex.
+
+        @param vertex: The vertex.
+        @type vertex: C{object}
+        @param weighted: Return the weighted outdegree if true.
+        @type weighted: C{bool}
+        @return: Outdegree of the vertex.
+        @rtype: C{float}
+        """
+        return self._sum(self.incident(vertex, forward=False), weighted)
+
+    def degrees(self, weighted=True, kind='degree'):
+        """\
+        Return the (weighted) degree, indegree or outdegree of every vertex.
+
+        @param weighted: Return weighted degrees if true.
+        @type weighted: C{bool}
+        @param kind: One of 'degree', 'indegree' or 'outdegree'.
+        @type kind: C{str}
+        @return: Degree of each vertex.
+        @rtype: C{dict}
+        @raise ValueError: Unknown kind of degree.
+        """
+        try:
+            degree = {'degree': self.degree, 'indegree': self.indegree,
+                      'outdegree': self.outdegree}[kind]
+        except KeyError:
+            raise ValueError('unknown kind of degree %s' % kind)
+        return dict((vertex, degree(vertex, weighted)) \
+            for vertex in self.vertices)
+
+
+class SubgraphView(HypergraphView):
+    """\
+    View of the subhypergraph induced by a set of vertices: those vertices, and
+    the edges of the parent all of whose vertices are among them.
+    """
+    def __init__(self, parent, vertices):
+        """\
+        Constructor.
+
+        @param parent: The parent hypergraph.
+        @type parent: L{Hypergraph}
+        @param vertices: The vertex subset.
+        @type vertices: C{set}
+        """
+        super(SubgraphView, self).__init__(parent)
+        self._vertex_filter = frozenset(vertices)
+
+    @property
+    def vertices(self):
+        return self._vertex_filter & self._parent.vertices
+
+    @property
+    def edges(self):
+        edges = set()
+        for vertex in self.vertices:
+            edges.update(self._containing(vertex))
+        return frozenset(edges)
+
+    def has_edge(self, edge):
+        return self._parent.has_edge(edge) \
+            and edge.issubset(self._vertex_filter)
+
+    def _containing(self, v):
+        if v not in self._vertex_filter:
+            return set()
+        return set([edge for edge in _containing(self._parent, v) \
+            if edge.issubset(self._vertex_filter)])
+
+
+class EdgeSubsetView(HypergraphView):
+    """\
+    View of the spanning subhypergraph with a subset of the edges of the
+    parent. Only the edge subset and its incidence are stored.
+    """
+    def __init__(self, parent, edges):
+        """\
+        Constructor.
+
+        @param parent: The parent hypergraph.
+        @type parent: L{Hypergraph}
+        @param edges: The edge subset.
+        @type edges: C{set}
+        """
+        super(EdgeSubsetView, self).__init__(parent)
+        self._edge_filter = frozenset(edges)
+        self._incidence = {}
+        for edge in self._edge_filter:
+            for vertex in edge:
+                self._incidence.setdefault(vertex, set()).add(edge)
+
+    @property
+    def vertices(self):
+        return self._parent.vertices
+
+    @property
+    def edges(self):
+        return frozenset([edge for edge in self._edge_filter \
+            if self._parent.has_edge(edge)])
+
+    def has_edge(self, edge):
+        return edge in self._edge_filter and self._parent.has_edge(edge)
+
+    def _containing(self, v):
+        return set([edge for edge in self._incidence.get(v, ()) \
+            if self._parent.has_edge(edge)])
+
+
+class ReweightedView(HypergraphView):
+    """\
+    View of the parent hypergraph with different edge weights. Edges without
+    a new weight keep their weight in the parent.
+    """
+    def __init__(self, parent, weights):
+        """\
+        Constructor.
+
+        @param parent: The parent hypergraph.
+        @type parent: L{Hypergraph}
+        @param weights: New weights keyed by edge, or a function of the edge.
+        @type weights: C{dict} or C{function}
+        """
+        super(ReweightedView, self).__init__(parent)
+        self._reweight = weights
+
+    @property
+    def vertices(self):
+        return self._parent.vertices
+
+    @property
+    def edges(self):
+        return self._parent.edges
+
+    def has_edge(self, edge):
+        return self._parent.has_edge(edge)
+
+    def _weight(self, edge):
+        if callable(self._reweight):
+            return self._reweight(edge)
+        try:
+            return self._reweight[edge]
+        except KeyError:
+            return self._parent.weights[edge]
+
+    def _containing(self, v):
+        return _containing(self._parent, v)
+
+    def adjacent(self, u, v):
+        return self._parent.adjacent(u, v)
+
+    def incident(self, v, forward=True):
+        return self._parent.incident(v, forward)
+
+    def reachable(self, tail, head):
+        return self._parent.reachable(tail, head)
+
+    def neighbors(self, vertex):
+        return self._parent.neighbors(vertex)
@@ -9,6 +9,7 @@ Unit tests for hypergraph.
 @license: LGPL-3
 """
 
+import pickle
 import unittest
 
 from hypergraph.core import *
@@ -74,6 +75,18 @@ class TestCore(unittest.TestCase):
         G.add_edge(E)
         self.assertTrue(E in G.edges)
 
+    def test_edge(self):
+        E = Edge([1000, 1001], head=1001)
+        self.assertEqual(E.tail, frozenset([1000]))
+        self.assertTrue(E.tail is E.tail)
+        self.assertEqual(Edge.trusted((1000, 1001), 1001), E)
+        self.assertEqual(hash(Edge.trusted((1000, 1001), 1001)), hash(E))
+        self.assertNotEqual(Edge([1000, 1001], head=1000), E)
+        self.assertEqual(pickle.loads(pickle.dumps(E)).head, 1001)
+        self.assertEqual(eval(repr(E)), E)
+        self.assertRaises(TypeError, Edge, [[1]])
+        self.assertRaises(ValueError, Edge, [1, 2], head=3)
+
     def test_equal_repr(self):
         self.assertEqual(Hypergraph(), Hypergraph())
         self.assertEqual(Graph(), Graph())
@@ -97,6 +110,247 @@ class TestCore(unittest.TestCase):
         self.assertFalse(Edge(['I', 'D']) in self.U.edges)
         self.assertFalse(Edge(['I', 'D']) in self.U.weights.keys())
 
+    def test_add_edges_array(self):
+        G = Hypergraph(directed=True)
+        G.add_vertices(numpy.arange(4))
+        G.add_edges(numpy.array([[0, 1], [1, 2], [2, 3]]), heads=numpy.array([1, 2, 3]), weights=numpy.array([0.5, 1.5, 2.5]))
+        self.assertEqual(G.vertices, set([0, 1, 2, 3]))
+        self.assertEqual(G.weights[Edge([1, 2], head=2)], 1.5)
+        self.assertEqual(G.neighbors(1), set([2]))
+        self.assertEqual((G.indegree(2), G.outdegree(2)), (1.5, 2.5))
+
+    def test_add_edges_invalid(self):
+        size = len(self.D.edges)
+        self.assertRaises(ValueError, self.D.add_edges, numpy.array([['A', 'Z']]), heads=numpy.array(['B']))
+        self.assertRaises(ValueError, self.D.add_edges, [Edge(['A', 'Z'], 'Z'), Edge(['A', 'B'])])
+        self.assertEqual(len(self.D.edges), size)
+        self.assertFalse('Z' in self.D.vertices)
+
+    def test_add_edges_repeated(self):
+        G = Hypergraph(vertices=range(4), directed=True)
+        G.add_edges([Edge([0, 1], head=1), Edge([2, 3], head=3)], weights=[0.5, 2.5])
+        G.add_edges([Edge([3, 4], head=4), Edge([0, 1], head=1), Edge([3, 4], head=4)], weights=[1.0, 2.0, 3.0])
+        self.assertEqual(G.weights[Edge([3, 4], head=4)], 3.0)
+        self.assertEqual(G.indegree(1), 2.0)
+        self.assertEqual((G.indegree(3), G.outdegree(3)), (2.5, 3.0))
+        self.assertEqual(G.incident(4), set([Edge([3, 4], head=4)]))
+        self.assertEqual(G.vertex_table.id(4), 4)
+
+    def test_add_edges_version(self):
+        version = self.U.version
+        self.U.add_edges([Edge(['A', 'Y']), Edge(['Y', 'Z'])], weights={Edge(['A', 'Y']): 2.0})
+        self.assertEqual(self.U.version, version + 1)
+        self.assertEqual(self.U.degree('Y'), 3.0)
+        self.U.add_edges([Edge(['A', 'Y'])], weights=[2.0])
+        self.assertEqual(self.U.version, version + 1)
+
+    def test_add_edges_copy(self):
+        C = self.U.copy()
+        self.U.add_edges([Edge(['A', 'Y']), Edge(['Y', 'Z'])])
+        self.assertFalse('Y' in C.vertices)
+        self.assertFalse(C.incident('A') & self.U.incident('Y'))
+        self.assertEqual(C.degree('A'), self.U.degree('A') - 1.0)
+
+    def test_remove_edges(self):
+        self.U.add_edges([Edge(['A', 'Y']), Edge(['Y', 'Z'])])
+        self.U.remove_edges([Edge(['A', 'Y']), Edge(['I', 'D'])])
+        self.assertEqual(self.U.neighbors('Y'), set(['Z']))
+        self.assertFalse(Edge(['I', 'D']) in self.U.weights.keys())
+
+    def test_remove_edges_missing(self):
+        self.assertRaises(KeyError, self.U.remove_edges, [Edge(['A', 'G']), Edge(['A', 'Y'])])
+        self.assertTrue(Edge(['A', 'G']) in self.U.edges)
+
+    def test_remove_edges_reuse(self):
+        self.U.remove_edges([Edge(['I', 'D'])])
+        self.U.add_edges([Edge(['I', 'D']), Edge(['A', 'Y'])], weights=[0.5, 1.5])
+        table = self.U.edge_table
+        self.assertEqual(len(table), len(self.U.edges))
+        self.assertEqual(table.key(table.id(Edge(['A', 'Y']))), Edge(['A', 'Y']))
+        self.assertEqual(self.U.weights[Edge(['I', 'D'])], 0.5)
+
+    def test_remove_vertices(self):
+        self.U.add_edges([Edge(['Y', 'Z'])])
+        self.U.remove_vertices(['I', 'Y'])
+        self.assertFalse(self.U.incident('Z'))
+        self.assertEqual(self.U.degree('Z'), 0.0)
+        self.assertEqual(self.U.degree('H', weighted=False), 2)
+        self.assertRaises(KeyError, self.U.remove_vertices, ['A', 'Y'])
+        self.assertTrue('A' in self.U.vertices)
+
+    def test_remove_batch(self):
+        self.D.enable_journal()
+        R = self.D.copy()
+        version = self.D.version
+        self.D.remove_edges([Edge(['A', 'G'], 'A'), Edge(['A', 'E', 'D', 'F'], 'A')])
+        self.D.remove_vertices(['J', 'H'])
+        self.assertEqual(self.D.version, version + 2)
+        self.assertEqual(self.D.indegree('A'), 0.0)
+        self.assertFalse([edge for edge in self.D.edges if 'J' in edge or 'H' in edge])
+        R.apply_changes(self.D.changes_since(version))
+        self.assertEqual(R, self.D)
+        self.assertEqual(R.indegree('A'), 0.0)
+
+    def test_subgraph_view(self):
+        X = set(['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+        S = self.D.subgraph(X)
+        self.assertEqual(S.edges, set([edge for edge in self.D.edges if edge <= X]))
+        self.assertEqual(S.incident('C'), set([Edge(['C', 'B', 'F'], 'C')]))
+        self.assertEqual(S.neighbors('E'), set(['A', 'F']))
+
+    def test_edge_subgraph_view(self):
+        X = set(['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+        E = self.D.subgraph(X).edge_subgraph([Edge(['C', 'B', 'F'], 'C'), Edge(['A', 'G'], 'A')])
+        self.assertEqual(E.vertices, X)
+        self.assertEqual(E.neighbors('G'), set(['A']))
+
+    def test_reweighted_view(self):
+        E = self.D.edge_subgraph([Edge(['C', 'B', 'F'], 'C'), Edge(['A', 'G'], 'A')])
+        R = E.reweighted({Edge(['A', 'G'], 'A'): 1.0})
+        self.assertEqual(R.indegree('A'), 1.0)
+        self.assertAlmostEqual(R.indegree('C'), 5.238859)
+
+    def test_view_follows_changes(self):
+        E = self.D.edge_subgraph([Edge(['C', 'B', 'F'], 'C'), Edge(['A', 'G'], 'A')])
+        R = E.reweighted({Edge(['A', 'G'], 'A'): 1.0})
+        self.D.remove_edge(Edge(['A', 'G'], 'A'))
+        self.assertEqual(R.edges, set([Edge(['C', 'B', 'F'], 'C')]))
+        self.assertRaises(KeyError, R.weights.__getitem__, Edge(['A', 'G'], 'A'))
+
+    def test_frozen_views(self):
+        X = set(['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+        F = self.U.freeze()
+        S = F.subgraph(X)
+        self.assertEqual(S.edges, set([edge for edge in self.U.edges if edge <= X]))
+        E = F.edge_subgraph([Edge(['I', 'D']), Edge(['A', 'G'])])
+        self.assertEqual(E.neighbors('G'), set(['A']))
+        self.assertEqual(E.vertices, self.U.vertices)
+        R = F.reweighted({Edge(['I', 'D']): 2.0})
+        self.assertEqual(R.weights[Edge(['I', 'D'])], 2.0)
+        self.assertAlmostEqual(R.weights[Edge(['A', 'G'])], 9.445038)
+
+    def test_attributes(self):
+        self.U.add_edge_attribute('capacity', dtype=int, default=3)
+        self.U.add_vertex_attribute('cost')
+        capacity = self.U.edge_attribute('capacity')
+        self.assertEqual(capacity[Edge(['I', 'D'])], 3)
+        capacity[Edge(['I', 'D'])] = 7
+        self.U.add_edge(Edge(['A', 'Z']))
+        self.assertEqual(capacity[Edge(['A', 'Z'])], 3)
+        self.assertEqual(self.U.vertex_attribute('cost')['Z'], 0.0)
+        self.U.remove_edge(Edge(['A', 'G']))
+        self.assertEqual(len(capacity), len(self.U.edges))
+        self.assertEqual(sorted(capacity.values()), [3] * 19 + [7])
+        table = self.U.edge_table
+        self.assertEqual(self.U.weights.array()[table.id(Edge(['I', 'D']))],
+            4.417088)
+        self.assertEqual(table.key(table.id(Edge(['A', 'Z']))), Edge(['A', 'Z']))
+        self.assertRaises(ValueError, self.U.add_edge_attribute, 'capacity')
+        self.assertRaises(KeyError, self.U.vertex_attribute, 'capacity')
+        self.assertRaises(KeyError, capacity.__setitem__, Edge(['A', 'G']), 1)
+        C = self.U.copy()
+        C.edge_attribute('capacity')[Edge(['I', 'D'])] = 1
+        self.assertEqual(capacity[Edge(['I', 'D'])], 7)
+
+    def test_version_pickle(self):
+        R = pickle.loads(pickle.dumps(self.D))
+        self.assertEqual(R.version, self.D.version)
+
+    def test_version_unchanged(self):
+        version = self.D.version
+        self.D.weights[Edge(['A', 'G'], 'A')] = 9.445038
+        self.D.add_vertex('A')
+        self.D.add_edges([Edge(['A', 'G'], 'A')], weights=[9.445038])
+        self.assertEqual(self.D.version, version)
+
+    def test_journal_changes(self):
+        self.D.enable_journal()
+        start = self.D.version
+        self.D.add_edge(Edge(['A', 'Z'], 'Z'), weight=0.5)
+        self.D.add_vertex_attribute('cost')
+        self.D.vertex_attribute('cost')['Z'] = 2.0
+        changes = self.D.changes_since(start)
+        self.assertEqual([change[:2] for change in changes], [(start + 1, 'add_edge'), (start + 2, 'add_vertex_attribute'), (start + 3, 'set_vertex_attribute')])
+        self.assertEqual(changes[-1][2], ('cost', 'Z', 2.0))
+        self.assertEqual(self.D.changes_since(self.D.version), [])
+
+    def test_journal_replay(self):
+        R = pickle.loads(pickle.dumps(self.D))
+        self.D.enable_journal()
+        start = self.D.version
+        self.D.remove_vertex('J')
+        self.D.add_edge(Edge(['A', 'Z'], 'Z'), weight=0.5)
+        self.D.weights[Edge(['A', 'G'], 'A')] = 1.0
+        self.D.add_edges([Edge(['A', 'Z'], 'Z'), Edge(['Z', 'Y'], 'Y')], weights=[0.25, 0.75])
+        self.D.add_vertex_attribute('cost')
+        self.D.vertex_attribute('cost')['Z'] = 2.0
+        R.apply_changes(self.D.changes_since(start))
+        self.assertEqual(R, self.D)
+        self.assertEqual(R.version, self.D.version)
+        self.assertEqual(R.vertex_attribute('cost')['Z'], 2.0)
+
+    def test_journal_partial_replay(self):
+        R = self.D.copy()
+        self.D.enable_journal()
+        start = self.D.version
+        for vertex in 'VWXYZ':
+            self.D.add_vertex(vertex)
+        changes = self.D.changes_since(start)
+        R.apply_changes(changes[:2])
+        self.assertRaises(ValueError, R.apply_changes, changes[3:])
+        R.apply_changes(changes)
+        self.assertEqual(R.vertices, self.D.vertices)
+        self.assertEqual(R.version, self.D.version)
+
+    def test_journal_disabled(self):
+        start = self.D.version
+        self.D.add_vertex('Z')
+        self.assertRaises(ValueError, self.D.changes_since, start)
+        self.D.enable_journal()
+        self.D.add_vertex('Y')
+        self.assertRaises(ValueError, self.D.changes_since, start)
+
+    def test_journal_bounded(self):
+        self.D.enable_journal(maxlen=2)
+        self.D.remove_edge(Edge(['A', 'G'], 'A'))
+        self.D.remove_vertex('J')
+        self.D.add_vertex('Y')
+        self.assertEqual(len(self.D.changes_since(self.D.version - 2)), 2)
+        self.assertRaises(ValueError, self.D.changes_since, self.D.version - 3)
+
+    def test_copy(self):
+        C = self.D.copy()
+        self.assertEqual(C, self.D)
+        C.remove_vertex('J')
+        C.add_edge(Edge(['A', 'Z'], 'Z'), weight=0.5)
+        C.weights[Edge(['A', 'G'], 'A')] = 1.0
+        self.assertTrue('J' in self.D.vertices)
+        self.assertFalse('Z' in self.D.vertices)
+        self.assertEqual(self.D.weights[Edge(['A', 'G'], 'A')], 9.445038)
+        self.assertEqual(len(C.edges), len(self.D.edges) + 1 -
+            len([edge for edge in self.D.edges if 'J' in edge]))
+        for G in [C, self.D]:
+            for v in G.vertices:
+                self.assertEqual(G.incident(v),
+                    set([edge for edge in G.edges if edge.head == v]))
+                self.assertAlmostEqual(G.indegree(v), sum([G.weights[edge] \
+                    for edge in G.incident(v)]))
+
+    def test_copy_shares_unchanged(self):
+        C = self.D.copy()
+        C.weights[Edge(['A', 'G'], 'A')] = 1.0
+        C.add_edge(Edge(['A', 'Z'], 'Z'))
+        self.assertTrue(C.edge_table._columns['weight'] is self.D.edge_table._columns['weight'])
+        self.assertTrue(C.edges._base is self.D.edges)
+        self.assertEqual(C.weights[Edge(['A', 'G'], 'A')], 1.0)
+        self.assertEqual(self.D.weights[Edge(['A', 'G'], 'A')], 9.445038)
+        self.assertEqual(C.indegree('A'), self.D.indegree('A') - 8.445038)
+        for edge in self.D.edges:
+            C.weights[edge] = 2.0
+        self.assertFalse(C.edge_table._columns['weight'] is self.D.edge_table._columns['weight'])
+        self.assertEqual(set(C.weights.values()), set([1.0, 2.0]))
+        self.assertEqual(C.copy().freeze().edge_weights.sum(), 2.0 * len(self.D.edges) + 1.0)
+
     def test_adjacent(self):
         self.assertTrue(self.U.adjacent('A', 'G'))
 
@@ -105,15 +359,78 @@ class TestCore(unittest.TestCase):
         self.assertTrue(self.D.reachable('G', 'A'))
         self.assertTrue(self.D.reachable('E', 'D'))
 
+    def test_adjacent_type(self):
+        for u, v in [('A', 'G'), ('A', 'Y'), ('Y', 'A'), ('A', 'A')]:
+            self.assertEqual(type(self.U.adjacent(u, v)), set)
+            self.assertEqual(type(self.D.reachable(u, v)), set)
+        self.assertEqual(self.D.reachable('Y', 'A'), set())
+
     def test_neighbors(self):
         self.assertEqual(self.U.neighbors('I'), set(['A', 'C', 'B', 'E', 'D', 'G', 'F', 'H', 'J']))
         self.assertEqual(self.D.neighbors('I'), set(['C', 'B', 'E', 'G', 'F', 'J']))
+        self.assertEqual(self.D.neighbor_view('I'), self.D.neighbors('I'))
+        self.D.remove_edge(Edge(['I', 'H', 'C'], 'C'))
+        self.D.add_edge(Edge(['I', 'A'], 'A'))
+        self.assertEqual(self.D.neighbor_view('I'), set(['A', 'B', 'E', 'G', 'F', 'J']))
 
     def test_degree(self):
         self.assertEqual(self.U.degree('I', weighted=False), 11)
         self.assertEqual(self.D.indegree('I', weighted=False), 3)
         self.assertEqual(self.D.outdegree('I', weighted=False), 8)
 
+    def test_degree_counters(self):
+        self.D.weights[Edge(['I', 'D'], 'I')] = 1.0
+        self.D.remove_edge(Edge(['I', 'E', 'G'], 'I'))
+        self.D.add_edge(Edge(['I', 'J'], 'I'), weight=0.5)
+        for G in [self.U, self.D]:
+            for v in G.vertices:
+                self.assertAlmostEqual(G.indegree(v), sum([G.weights[edge] \
+                    for edge in G.incident(v)]))
+                self.assertAlmostEqual(G.outdegree(v), sum([G.weights[edge] \
+                    for edge in G.incident(v, forward=False)]))
+        self.assertAlmostEqual(self.D.indegree('I'), 11.305444)
+        self.assertEqual(self.D.degrees(weighted=False, kind='indegree')['I'], 3)
+        self.assertRaises(KeyError, self.D.set_weight, Edge(['I', 'A'], 'I'), 1.0)
+
+    def test_freeze(self):
+        for G in [self.U, self.D]:
+            F = G.freeze()
+            self.assertEqual(F.vertices, G.vertices)
+            self.assertEqual(F.edges, G.edges)
+            for v in G.vertices:
+                self.assertEqual(F.incident(v), G.incident(v))
+                self.assertEqual(F.incident(v, forward=False), G.incident(v, forward=False))
+                self.assertEqual(F.neighbors(v), G.neighbors(v))
+                self.assertAlmostEqual(F.indegree(v), G.indegree(v))
+                self.assertAlmostEqual(F.outdegree(v), G.outdegree(v))
+            self.assertEqual(F.reachable('G', 'A'), G.reachable('G', 'A'))
+            self.assertEqual(F.thaw(), G)
+        X = set(['A', 'B', 'C'])
+        self.assertEqual(edge_cut(self.U.freeze(), X), edge_cut(self.U, X))
+
+    def test_incidence_index(self):
+        self.U.remove_edge(Edge(['I', 'D']))
+        self.U.remove_vertex('J')
+        self.U.add_edge(Edge(['A', 'Z']))
+        for v in self.U.vertices:
+            self.assertEqual(self.U.incident(v),
+                set([edge for edge in self.U.edges if v in edge]))
+        self.assertEqual(self.U.adjacent('A', 'Z'), set([Edge(['A', 'Z'])]))
+        self.assertEqual(self.U.degree('I', weighted=False), 7)
+
+    def test_head_tail_index(self):
+        self.D.remove_edge(Edge(['I', 'D'], 'I'))
+        self.D.remove_vertex('J')
+        for v in self.D.vertices:
+            self.assertEqual(self.D.incident(v),
+                set([edge for edge in self.D.edges if edge.head == v]))
+            self.assertEqual(self.D.incident(v, forward=False),
+                set([edge for edge in self.D.edges if v in edge.tail]))
+        self.assertEqual(self.D.reachable('F', 'I'), set())
+        self.assertEqual(self.D.reachable('G', 'I'),
+            set([Edge(['I', 'E', 'G'], 'I'),
+                 Edge(['A', 'C', 'B', 'D', 'G', 'I', 'H'], 'I')]))
+
 
 class TestOrientation(unittest.TestCase):
 
@@ -188,6 +505,25 @@ class TestMatrix(unittest.TestCase):
         self.assertTrue(numpy.all(degree_matrix(self.GU) == numpy.diag([2, 4, 3, 2, 4, 2, 3])))
         self.assertTrue(numpy.all(degree_matrix(self.GD) == numpy.diag([1, 1, 2, 1, 2, 2, 1])))
 
+    def test_adjacency_matrix(self):
+        self.GU.weights[Edge(['B', 'E'])] = 2.5
+        self.GD.weights[Edge(['C', 'E'], head='C')] = 0.5
+        HD = Hypergraph(vertices=range(5), directed=True)
+        HD.add_edge(Edge([0, 1, 2], head=2), weight=1.5)
+        HD.add_edge(Edge([1, 2], head=1), weight=2.0)
+        HD.add_edge(Edge([3], head=3))
+        for H in [self.GU, self.GD, self.HU, HD]:
+            V = sorted(H.vertices)
+            exp = numpy.array([[sum([H.weights[edge] for edge in H.reachable(u, v)]) for v in V] for u in V])
+            self.assertTrue(numpy.allclose(adjacency_matrix(H), exp))
+
+    def test_frozen_matrices(self):
+        for H in [self.GU, self.GD, self.HU]:
+            F = H.freeze()
+            self.assertTrue(numpy.all(degree_matrix(F) == degree_matrix(H)))
+            self.assertTrue(numpy.all(adjacency_matrix(F) == adjacency_matrix(H)))
+            self.assertEqual(sorted(incidence_matrix(F).sum(axis=0)), sorted(incidence_matrix(H).sum(axis=0)))
+
     def test_laplacian_eigenvalues(self):
         eLGU = laplacian_eigenvalues(laplacian_matrix(self.GU))
         eLHU = laplacian_eigenvalues(laplacian_matrix(self.HU))
@@ -204,6 +540,48 @@ class TestMatrix(unittest.TestCase):
         self.assertTrue(abs(laplacian_eigenvalues(laplacian_matrix(self.GU))[1]) < 1e-8)
         self.assertTrue(abs(laplacian_eigenvalues(laplacian_matrix(self.HU))[1]) < 1e-8)
 
+class TestConnectivity(unittest.TestCase):
+
+    def setUp(self):
+        self.D = Hypergraph(vertices=range(1, 8), directed=True)
+        self.D.add_edge(Edge([1, 2], head=2))
+        self.D.add_edge(Edge([2, 3, 1], head=1))
+        self.D.add_edge(Edge([3, 4], head=4))
+        self.D.add_edge(Edge([2, 5], head=5))
+        self.D.add_edge(Edge([5, 6], head=6))
+        self.D.add_edge(Edge([6, 5], head=5))
+
+    def test_connected_components(self):
+        C = connected_components(self.D)
+        self.assertEqual(sorted(map(sorted, C)), [[1, 2, 3, 4, 5, 6], [7]])
+        U = Hypergraph(vertices=range(6), edges=[Edge([0, 1, 2]), Edge([2, 3]), Edge([4])])
+        self.assertEqual(sorted(map(sorted, connected_components(U))), [[0, 1, 2, 3], [4], [5]])
+        for spectral in [False, True]:
+            self.assertFalse(connected(U, spectral=spectral))
+            U.add_edge(Edge([3, 4, 5]))
+            self.assertTrue(connected(U, spectral=spectral))
+            U.remove_edge(Edge([3, 4, 5]))
+        self.assertTrue(connected(U.freeze().thaw().subgraph([0, 1, 2, 3])))
+        self.assertRaises(ValueError, connected, self.D)
+
+    def test_reachability(self):
+        for method in ['closure', 'intervals']:
+            R = ReachabilityIndex(self.D, method=method, seed=0)
+            self.assertTrue(R.reachable(3, 6))
+            self.assertTrue(R.reachable(2, 1))
+            self.assertFalse(R.reachable(4, 3))
+            self.assertFalse(R.reachable(6, 2))
+            self.assertEqual(R.reachable_from(1), set([1, 2, 5, 6]))
+            self.assertEqual(R.reachable_from(7), set([7]))
+            self.D.add_edge(Edge([6, 7], head=7))
+            self.assertEqual(R.reachable_from(1), set([1, 2, 5, 6, 7]))
+            self.D.remove_edge(Edge([6, 7], head=7))
+        R = ReachabilityIndex(Hypergraph(vertices=range(5), edges=[Edge([0, 1, 2]), Edge([3, 4])]))
+        self.assertTrue(R.reachable(2, 0))
+        self.assertFalse(R.reachable(2, 3))
+        self.assertRaises(ValueError, ReachabilityIndex, self.D, method='bfs')
+
+
 class TestPath(unittest.TestCase):
 
     def setUp(self):
@@ -221,11 +599,37 @@ class TestPath(unittest.TestCase):
 
     def test_dijkstra(self):
         exp = {1: None, 2: 1, 3: 2, 4: 3, 5: 2}
-        act = dijkstra(self.U, 1)
+        act = dijkstra(self.U, 1)[1]
         self.assertEqual(act, exp)
         exp = {1: None, 2: 1, 3: 2, 4: 3, 5: 4}
-        act = dijkstra(self.D, 1)
+        act = dijkstra(self.D, 1)[1]
         self.assertEqual(act, exp)
+        dist, prev = dijkstra(self.D, 1, targets=[3])
+        self.assertEqual(dist, {1: 0.0, 2: 1.25, 3: 2.25})
+        dist, prev = dijkstra(self.D, 3, cutoff=2.0)
+        self.assertEqual(set(dist), set([3, 4]))
+        self.assertEqual(dijkstra(self.D, 5)[0], {5: 0.0, 2: 2.0, 3: 3.0, 4: 4.11})
+
+    def test_bellman_ford(self):
+        self.D.weights[Edge([5, 2], head=2)] = -3
+        self.D.add_edge(Edge([1, 4], head=4), weight=-1)
+        exp = bellman_ford(self.D, 1)
+        self.assertEqual(exp[1], {1: None, 2: 5, 3: 2, 4: 1, 5: 4})
+        for act in [bellman_ford(self.D, 1, vectorized=True), spfa(self.D, 1)]:
+            self.assertEqual(act[1], exp[1])
+            for v in exp[0]:
+                self.assertAlmostEqual(act[0][v], exp[0][v])
+        self.assertEqual(set(spfa(self.D, 3)[0]), set([2, 3, 4, 5]))
+        self.D.weights[Edge([2, 3], head=3)] = -1
+        self.assertRaises(RuntimeError, bellman_ford, self.D, 1)
+        self.assertRaises(RuntimeError, bellman_ford, self.D, 1, vectorized=True)
+        self.assertRaises(RuntimeError, spfa, self.D, 1)
+        self.assertRaises(ValueError, spfa, self.U, 1)
+
+    def test_bellman_ford_missing_start(self):
+        exp = ({6: 0.0}, {6: None})
+        self.assertEqual(bellman_ford(self.D, 6), exp)
+        self.assertEqual(bellman_ford(self.D, 6, vectorized=True), exp)
 
     def test_shortest_path(self):
         ep = [1, 2, 5]
@@ -243,13 +647,171 @@ class TestPath(unittest.TestCase):
         act = shortest_path(self.D, 1, 2)
         self.assertEqual(act, (ep, el))
 
+    def test_point_to_point(self):
+        for G, ep in [(self.U, [1, 2, 5]), (self.D, [1, 2, 3, 4, 5])]:
+            for method in ['bidirectional', 'astar']:
+                act = shortest_path(G, 1, 5, method=method)
+                self.assertEqual(act[0], ep)
+                self.assertAlmostEqual(act[1], shortest_path(G, 1, 5)[1])
+        act = astar(self.D, 1, 4, heuristic=lambda u, v: abs(u - v))
+        self.assertEqual(act[0], [1, 2, 3, 4])
+        self.assertEqual(bidirectional_dijkstra(self.D, 5, 1), ([], float('inf')))
+        self.assertRaises(ValueError, shortest_path, self.D, 1, 5, method='bfs')
+
+    def test_frozen(self):
+        for G in [self.U, self.D]:
+            F = G.freeze()
+            self.assertEqual(dijkstra(F, 1), dijkstra(G, 1))
+            self.assertEqual(dijkstra(F, 5, cutoff=3.0), dijkstra(G, 5, cutoff=3.0))
+            self.assertEqual(astar(F, 1, 4), astar(G, 1, 4))
+            self.assertEqual(bidirectional_dijkstra(F, 1, 5), bidirectional_dijkstra(G, 1, 5))
+            self.assertEqual(dijkstra(F, 6), ({6: 0.0}, {6: None}))
+        self.assertEqual(spfa(self.D.freeze(), 1), spfa(self.D, 1))
+        self.assertEqual(bellman_ford(self.D.freeze(), 1), bellman_ford(self.D, 1))
+        F = Graph(vertices=[1, 2]).freeze()
+        self.assertTrue(F.uniform())
+        self.assertTrue(F.uniform(3))
+
+    def test_engine_query_many(self):
+        E = ShortestPathEngine(self.D, maxsize=2)
+        pairs = [(1, 5), (1, 3), (3, 2), (1, 5), (5, 1)]
+        self.assertEqual(E.query_many(pairs), [shortest_path(self.D, u, v) for u, v in pairs])
+        self.assertEqual((E.hits, E.misses), (0, 3))
+
+    def test_engine_cache(self):
+        E = ShortestPathEngine(self.D, maxsize=2)
+        E.query_many([(1, 5), (3, 2), (5, 1)])
+        self.assertEqual(E.query(5, 2), ([5, 2], 2.0))
+        self.assertEqual(E.query(1, 2), ([1, 2], 1.25))
+        self.assertEqual((E.hits, E.misses), (1, 4))
+
+    def test_engine_invalidation(self):
+        E = ShortestPathEngine(self.D)
+        E.query(1, 2)
+        self.D.weights[Edge([5, 2], head=2)] = -3
+        self.D.add_edge(Edge([1, 4], head=4), weight=-1)
+        self.assertEqual(E.query(1, 2), shortest_path(self.D, 1, 2))
+        self.assertEqual((E.hits, E.misses), (0, 2))
+
+    def test_engine_no_revalidation(self):
+        E = ShortestPathEngine(self.D)
+        self.D.weights[Edge([5, 2], head=2)] = -3
+        self.D.add_edge(Edge([1, 4], head=4), weight=-1)
+        E.query(1, 2)
+        self.D.uniform = lambda k=None: self.fail('graph revalidated')
+        path, length = E.query(4, 2)
+        self.assertEqual(path, [4, 5, 2])
+        self.assertAlmostEqual(length, -1.6)
+
+    def test_engine_invalid(self):
+        self.assertRaises(ValueError, ShortestPathEngine, Hypergraph(vertices=[1, 2, 3], edges=[Edge([1, 2, 3])]))
+
+    def test_engine_uncached(self):
+        E = ShortestPathEngine(self.U, maxsize=0)
+        self.assertEqual(E.query(1, 5), shortest_path(self.U, 1, 5))
+        self.assertEqual(E.query(1, 5), shortest_path(self.U, 1, 5))
+        self.assertEqual((E.hits, E.misses), (0, 2))
+
+    def test_engine_view(self):
+        V = self.U.edge_subgraph(self.U.edges - set([Edge([1, 5])]))
+        E = ShortestPathEngine(V)
+        self.assertEqual(E.query(1, 5), ([1, 2, 5], 3.25))
+        self.U.weights[Edge([2, 5])] = 4
+        self.assertEqual(E.query(1, 5), ([1, 2, 3, 4, 5], 4.76))
+
+    def test_shortest_hyperpath(self):
+        H = Hypergraph(vertices=range(1, 7), directed=True)
+        H.add_edge(Edge([1, 2], head=2), weight=1)
+        H.add_edge(Edge([1, 3], head=3), weight=2)
+        H.add_edge(Edge([2, 3, 4], head=4), weight=1)
+        H.add_edge(Edge([1, 4], head=4), weight=10)
+        H.add_edge(Edge([4, 5], head=5), weight=1)
+        H.add_edge(Edge([5, 6], head=5), weight=0)
+        H.add_edge(Edge([6], head=6), weight=0)
+        dist, prev = shortest_hyperpaths(H, 1)
+        self.assertEqual(dist, {1: 0.0, 2: 1.0, 3: 2.0, 4: 4.0, 5: 5.0})
+        self.assertEqual(prev[4], Edge([2, 3, 4], head=4))
+        self.assertEqual(shortest_hyperpaths(H, 1, cost='max')[0][5], 4.0)
+        exp = set([Edge([4, 5], head=5), Edge([2, 3, 4], head=4), Edge([1, 2], head=2), Edge([1, 3], head=3)])
+        self.assertEqual(shortest_hyperpath(H, 1, 5), (exp, 5.0))
+        self.assertEqual(shortest_hyperpath(H, 1, 6), (set(), float('inf')))
+        self.assertEqual(shortest_hyperpaths(self.D, 1)[0], dijkstra(self.D, 1)[0])
+        self.assertRaises(ValueError, shortest_hyperpaths, self.U, 1)
+        self.assertRaises(ValueError, shortest_hyperpaths, H, 1, cost='min')
+
+    def test_shortest_path_subgraph(self):
+        S = shortest_path_subgraph(self.D)
+        self.assertEqual(S.edges, set([Edge([1, 2], head=2), Edge([2, 3], head=3), Edge([3, 4], head=4), Edge([4, 5], head=5), Edge([5, 2], head=2)]))
+        self.assertEqual(len(self.D.edges), 7)
+        for method in ['floyd_warshall', 'johnson']:
+            self.assertEqual(shortest_path_subgraph(self.D, method=method).edges, S.edges)
+        self.assertEqual(shortest_path_subgraph(self.D, workers=2).edges, S.edges)
+        S = shortest_path_subgraph(self.U)
+        self.assertEqual(S.edges, set([Edge([1, 2]), Edge([2, 3]), Edge([3, 4]), Edge([4, 5]), Edge([5, 2])]))
+        self.assertEqual(shortest_path_subgraph(self.U, method='floyd_warshall').edges, S.edges)
+        self.D.weights[Edge([5, 2], head=2)] = -3
+        self.D.add_edge(Edge([1, 4], head=4), weight=-1)
+        S = shortest_path_subgraph(self.D)
+        self.assertEqual(S.edges, shortest_path_subgraph(self.D, method='johnson').edges)
+        self.assertFalse(Edge([1, 2], head=2) in S.edges)
+        F = self.D.freeze()
+        for method in ['dijkstra', 'floyd_warshall', 'johnson']:
+            self.assertEqual(shortest_path_subgraph(F, method=method).edges, S.edges)
+        self.assertRaises(ValueError, shortest_path_subgraph, self.D, method='bfs')
+
+    def test_shortest_path_subgraph_negative(self):
+        G = Graph(vertices=range(1, 7), directed=True)
+        for u, v, weight in [(1, 4, -0.3), (2, 3, 0.1), (2, 4, 0.3), (2, 5, -0.1), (2, 6, 0.2), (4, 5, 0.2), (4, 6, -0.3), (5, 6, 0.2)]:
+            G.add_edge(Edge([u, v], head=v), weight=weight)
+        S = shortest_path_subgraph(G)
+        self.assertEqual(len(S.edges), 7)
+        for method in ['floyd_warshall', 'johnson']:
+            self.assertEqual(shortest_path_subgraph(G, method=method).edges, S.edges)
+
     def test_floyd_warshall(self):
         self.assertEqual(floyd_warshall(self.U)[1][5], 3.25)
         self.assertEqual(floyd_warshall(self.D)[1][5], 4.76)
+        for G in [self.U, self.D]:
+            exp = floyd_warshall(G)
+            for act in [floyd_warshall(G, block=2, predecessors=True),
+                        floyd_warshall(G, dtype=numpy.float32)]:
+                for u in G.vertices:
+                    for v in G.vertices:
+                        self.assertAlmostEqual(act[u][v], exp[u][v], places=5)
+        act = floyd_warshall(self.D, block=2, predecessors=True)
+        self.assertEqual(act.path(1, 5), [1, 2, 3, 4, 5])
+        self.assertEqual(act.path(5, 1), [])
+        self.assertRaises(ValueError, floyd_warshall(self.D).path, 1, 5)
+
+    def test_johnson(self):
+        for G in [self.U, self.D]:
+            exp = floyd_warshall(G)
+            for act in [johnson(G), johnson(G, workers=2, predecessors=True)]:
+                for u in G.vertices:
+                    for v in G.vertices:
+                        self.assertAlmostEqual(act[u][v], exp[u][v])
+        self.D.weights[Edge([5, 2], head=2)] = -3
+        self.D.add_edge(Edge([1, 4], head=4), weight=-1)
+        act = johnson(self.D, predecessors=True)
+        self.assertAlmostEqual(act[1][2], -2.6)
+        self.assertEqual(act.path(1, 2), [1, 4, 5, 2])
+        self.D.weights[Edge([2, 3], head=3)] = -1
+        self.assertRaises(RuntimeError, johnson, self.D)
 
     def test_minimum_spanning_tree(self):
         MST = minimum_spanning_tree(self.U)
         self.assertEqual(MST.edges, set([Edge([3, 4]), Edge([2, 3]), Edge([4, 5]), Edge([1, 2])]))
+        for method in ['prim', 'boruvka']:
+            self.assertEqual(minimum_spanning_tree(self.U, method=method).edges, MST.edges)
+        self.U.add_vertex(6)
+        self.U.add_vertex(7)
+        self.U.add_edge(Edge([6, 7]), weight=0.5)
+        for method in ['kruskal', 'prim', 'boruvka']:
+            MSF = minimum_spanning_forest(self.U, method=method)
+            self.assertEqual(MSF.edges, MST.edges | set([Edge([6, 7])]))
+            self.assertEqual(MSF.weights[Edge([6, 7])], 0.5)
+            self.assertEqual(minimum_spanning_tree(self.U, method=method).edges, MSF.edges)
+        self.assertRaises(ValueError, minimum_spanning_forest, self.U, method='reverse')
 
 
 class TestSearch(unittest.TestCase):
@@ -277,9 +839,100 @@ class TestSearch(unittest.TestCase):
         self.assertEqual(set(B[4:8]), set([5, 6, 7, 8]))
         self.assertEqual(set(B[8:12]), set([9, 10, 11, 12]))
 
+    def test_breadth_first_levels(self):
+        L = [set(level) for level in breadth_first_levels(self.T, [1])]
+        self.assertEqual(L, [set([1]), set([2, 3, 4]), set([5, 6, 7, 8]), set([9, 10, 11, 12])])
+        L = [set(level) for level in breadth_first_levels(self.T, [9, 11], max_depth=2)]
+        self.assertEqual(L, [set([9, 11]), set([5, 7]), set([2, 10, 4, 12])])
+
+    def test_breadth_first_tree(self):
+        dist, parent = breadth_first_tree(self.T, [1])
+        self.assertEqual(dist[12], 3)
+        self.assertEqual(parent[12], Edge([7, 12]))
+        self.assertEqual(parent[1], None)
+        dist, parent = breadth_first_tree(self.T, [1], targets=[3, 4])
+        self.assertEqual(set(dist), set([1, 2, 3, 4]))
+        self.assertEqual(set(parent), set(dist))
+        dist, parent = breadth_first_tree(self.T, [2, 7], max_depth=1)
+        self.assertEqual(dist, {2: 0, 7: 0, 1: 1, 5: 1, 6: 1, 4: 1, 11: 1, 12: 1})
+        D = Graph(vertices=[1, 2, 3], directed=True)
+        D.add_edge(Edge([1, 2], head=2))
+        D.add_edge(Edge([3, 2], head=3))
+        self.assertEqual(breadth_first_tree(D, [1])[0], {1: 0, 2: 1, 3: 2})
+        self.assertEqual(breadth_first_tree(D, [3])[0], {3: 0})
+        for G in [self.T, D]:
+            F = G.freeze()
+            for v in G.vertices:
+                self.assertEqual(breadth_first_tree(F, [v]), breadth_first_tree(G, [v]))
+            self.assertEqual(F._edge_list, None)
+        self.assertEqual(breadth_first_tree(self.T.freeze(), [13]), ({13: 0}, {13: None}))
+
+    def test_bit_parallel(self):
+        levels = {}
+        for group, depth, frontier in bit_parallel_search(self.T, range(1, 13), batch=5):
+            for j, v in enumerate(group):
+                bit = numpy.uint64(1) << numpy.uint64(j)
+                for i in numpy.flatnonzero(frontier[:, 0] & bit):
+                    levels.setdefault(v, {})[i + 1] = depth
+        for v in self.T.vertices:
+            self.assertEqual(levels[v], breadth_first_tree(self.T, [v])[0])
+        ecc = eccentricity(self.T)
+        self.assertEqual(ecc[1], 3)
+        self.assertEqual(ecc[12], 6)
+        self.assertEqual(eccentricity(self.T, [1, 12], batch=1), {1: 3, 12: 6})
+        self.assertEqual(diameter(self.T), 6)
+        self.assertEqual(diameter(self.T, exact=False, start=1), 6)
+        self.assertAlmostEqual(closeness(self.T, [1])[1], 11.0 / 23)
+        exp = [0] * 7
+        for v in self.T.vertices:
+            for d in breadth_first_tree(self.T, [v])[0].values():
+                exp[d] += 1
+        self.assertEqual(hop_histogram(self.T), exp)
+        self.T.add_vertex(13)
+        self.assertEqual(eccentricity(self.T)[1], float('inf'))
+        self.assertEqual(diameter(self.T), float('inf'))
+
     def test_depth_first(self):
         D = [v for v in depth_first_search(self.T, 1)]
         self.assertEqual(D[0], 1)
+        self.assertEqual(set(D), set(self.T.vertices))
+        self.assertEqual(list(depth_first_search(self.T, 4, marked=set([1, 7]))), [4, 8])
+        chain = Graph(vertices=range(5000), directed=True)
+        chain.add_edges([Edge([i, i + 1], head=i + 1) for i in range(4999)])
+        self.assertEqual(list(depth_first_search(chain, 0)), range(5000))
+        F = chain.freeze()
+        self.assertEqual(list(depth_first_search(F, 0)), range(5000))
+        self.assertEqual(F._edge_list, None)
+
+    def test_depth_first_events(self):
+        E = list(depth_first_events(self.T, 7))
+        self.assertEqual(E[0], ('pre', 7, None))
+        self.assertEqual(E[-1], ('post', 7, None))
+        self.assertEqual(len(E), 24)
+        for event, v, edge in E:
+            if v != 7:
+                self.assertTrue(v in edge)
+
+    def test_depth_first_tree(self):
+        discovery, finish, parent = depth_first_tree(self.T, [1])
+        self.assertEqual(discovery[1], 0)
+        self.assertEqual(finish[1], 23)
+        for v in self.T.vertices:
+            if parent[v] is not None:
+                u, = parent[v] - set([v])
+                self.assertTrue(discovery[u] < discovery[v] < finish[v] < finish[u])
+        F = self.T.freeze()
+        discovery, finish, parent = depth_first_tree(F, [1])
+        self.assertEqual(finish[1], 23)
+        for v in self.T.vertices:
+            if parent[v] is not None:
+                u, = parent[v] - set([v])
+                self.assertTrue(discovery[u] < discovery[v] < finish[v] < finish[u])
+        self.assertEqual(F._edge_list, None)
+        self.T.add_vertex(13)
+        discovery, finish, parent = depth_first_tree(self.T)
+        self.assertEqual(len(discovery), 13)
+        self.assertEqual(sum(1 for edge in parent.values() if edge is None), 2)
         # TODO: not really sure how to test this due to set ordering
 
 